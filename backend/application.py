@@ -0,0 +1,62 @@
+"""The FastAPI app factory.
+
+create_app() builds a fresh app: middleware, lifecycle hooks and the
+routers it is asked for. Router modules are imported only when an app
+includes them, and the database engines are created at startup (or on
+first use), never at import.
+
+    uvicorn --factory backend:create_app     # or backend:app, built on first access
+"""
+from importlib import import_module
+
+from fastapi import FastAPI
+
+from config.settings import Settings, configure
+from . import tasks  # noqa: F401  (registers the job handlers before the queue recovers jobs)
+from .auth.permissions import permission_matrix
+from .auth.security import start_hashing_pool, shutdown_hashing_pool
+from .database import dispose_engines, init_engines
+from .database.audit import audit_log
+from .database.query_budget import QueryBudgetMiddleware
+from .jobs import job_queue
+from .metrics import MetricsMiddleware, TimedORJSONResponse
+
+# Modules in backend/routes, as <name>_routes, each exporting a router
+ROUTERS = ("employee", "hr", "external", "leave", "project", "role", "system", "export", "search", "audit", "metrics", "auth")
+
+def create_app(app_settings: Settings = None, routers: tuple = ROUTERS) -> FastAPI:
+    """Builds the API, optionally with only some of ROUTERS.
+
+    app_settings become the process-wide settings. The engines, middleware
+    and request handlers follow them; the caches, audit buffer and job
+    queue keep the sizes read when their modules were imported.
+    """
+    if app_settings is not None:
+        configure(app_settings)
+
+    app = FastAPI(default_response_class=TimedORJSONResponse)
+    app.add_middleware(QueryBudgetMiddleware)
+    # Outermost, so its timings include the budget check
+    app.add_middleware(MetricsMiddleware)
+
+    @app.on_event("startup")
+    async def _startup():
+        init_engines()
+        await start_hashing_pool()
+        await job_queue.start()
+        await audit_log.start()
+        await permission_matrix.start()
+
+    @app.on_event("shutdown")
+    async def _shutdown():
+        await permission_matrix.stop()
+        await job_queue.stop()
+        await audit_log.stop()
+        shutdown_hashing_pool()
+        await dispose_engines()
+
+    for name in routers:
+        if name not in ROUTERS:
+            raise ValueError(f"Unknown router {name!r}; expected one of {', '.join(ROUTERS)}")
+        app.include_router(import_module(f"{__package__}.routes.{name}_routes").router)
+    return app
@@ -0,0 +1,103 @@
+"""Authentication dependencies shared by the routers.
+
+Kept out of the backend package so that a router importing them does not
+import the package's app factory and every other router along with it.
+"""
+from datetime import datetime, timedelta
+from typing import Any
+
+from fastapi import Depends, HTTPException, Request, status
+from fastapi.security import OAuth2PasswordBearer
+from jose import JWTError, jwt
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from backend.auth.permissions import permission_matrix
+from backend.auth.principal_cache import principal_cache, snapshot_user, restore_user
+from backend.database import get_read_db, is_sticky
+from backend.database.identity import resolve_identity, role_for
+
+# === JWT Configuration ===
+SECRET_KEY = "your-secret-key"
+ALGORITHM = "HS256"
+ACCESS_TOKEN_EXPIRE_MINUTES = 30
+oauth2_scheme = OAuth2PasswordBearer(tokenUrl="login")
+
+# === User Context and Permissions ===
+
+class CurrentUserContext:
+    def __init__(self, user: Any, role: str, mask: int):
+        self.user = user
+        self.role = role
+        # Granted permissions as bits, see backend/auth/permissions.py
+        self.mask = mask
+
+    def can(self, permission: str) -> bool:
+        return bool(self.mask & permission_matrix.bit(permission))
+
+    @property
+    def hr_employee_id(self):
+        """personId for HR staff. hrEmployeeId columns reference hr_employees, so
+        others deciding through a role grant are only named in the audit log."""
+        return self.user.personId if self.role == "hr" else None
+
+def check_permission(current: CurrentUserContext, permission: str):
+    if not current.can(permission):
+        raise HTTPException(status_code=403, detail="Permission denied")
+
+# === JWT Creation ===
+
+def create_access_token(data: dict, expires_delta: timedelta = None):
+    to_encode = data.copy()
+    issued_at = datetime.utcnow()
+    expire = issued_at + (expires_delta or timedelta(minutes=15))
+    to_encode.update({"exp": expire, "iat": issued_at})
+    return jwt.encode(to_encode, SECRET_KEY, algorithm=ALGORITHM)
+
+# === Authenticated User Dependency ===
+
+async def get_current_user(request: Request, token: str = Depends(oauth2_scheme), db: AsyncSession = Depends(get_read_db)) -> CurrentUserContext:
+    credentials_exception = HTTPException(
+        status_code=status.HTTP_401_UNAUTHORIZED,
+        detail="Could not validate credentials",
+        headers={"WWW-Authenticate": "Bearer"},
+    )
+
+    try:
+        payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
+        username: str = payload.get("sub")
+        if username is None:
+            raise credentials_exception
+        role = payload.get("role")
+    except JWTError:
+        raise credentials_exception
+
+    # Lets the write session remember this caller, and keeps their reads on
+    # the primary for a moment after they change something.
+    request.state.principal = username
+    if is_sticky(username):
+        db.info["primary"] = True
+
+    # Fast path: a token we have already resolved. The cached column
+    # snapshot is attached to this request's session without any SQL.
+    cache_key = (username, role, payload.get("iat"))
+    cached = principal_cache.get(cache_key) if cache_key[2] is not None else None
+    if cached is not None:
+        user = restore_user(db, cached)
+        return CurrentUserContext(user=user, role=role, mask=permission_matrix.mask_for(user))
+
+    user = await resolve_identity(db, username)
+    if user and role_for(user) != role:
+        raise credentials_exception
+
+    if not user:
+        raise HTTPException(status_code=404, detail="User not found")
+
+    if cache_key[2] is not None:
+        principal_cache.put(cache_key, snapshot_user(user), payload["exp"])
+    # End the lookup's transaction so its connection goes back to the pool
+    # before the handler runs; a writing handler checks out its own from
+    # get_db. expire_on_commit=False keeps the loaded user usable.
+    await db.commit()
+    # Only before the app has started (scripts, tests without a lifespan)
+    await permission_matrix.ensure_loaded()
+    return CurrentUserContext(user=user, role=role, mask=permission_matrix.mask_for(user))
@@ -0,0 +1,94 @@
+"""Permission grants compiled into integer bitmasks.
+
+Grants live in the permissions tables: user_type_permissions gives a
+permission to every person of a type, role_permissions gives it to the
+employees holding a Role. PermissionMatrix reads them once and keeps one
+mask per user type and per role, where permission N is bit 1 << N. A
+request's mask is its type's mask OR its role's, and a check is a single
+AND, so authorizing a request never touches the database.
+
+Routes that change grants call invalidate(), which recompiles this
+worker's matrix at once. Other workers pick the change up within
+settings.PERMISSIONS_REFRESH_SECONDS.
+"""
+import asyncio
+import logging
+
+from sqlalchemy import select
+
+from config.settings import settings
+from backend.database import SessionLocal
+from backend.database.models import Permission, RolePermission, UserTypePermission
+from backend.database.query_budget import unbudgeted
+
+logger = logging.getLogger(__name__)
+
+class PermissionMatrix:
+    def __init__(self, refresh_interval: float):
+        self.refresh_interval = refresh_interval
+        self.bits = {}
+        self.type_masks = {}
+        self.role_masks = {}
+        self.loaded = False
+        self._lock = asyncio.Lock()
+        self._task = None
+
+    async def load(self):
+        """Compiles the grant tables into masks; three small SELECTs."""
+        async with self._lock, SessionLocal() as db:
+            # A reload triggered inside a request is not that route's work
+            with unbudgeted():
+                bits = {name: 1 << permission_id for name, permission_id in await db.execute(
+                    select(Permission.name, Permission.permissionId)
+                )}
+                type_masks, role_masks = {}, {}
+                for user_type, permission_id in await db.execute(
+                    select(UserTypePermission.userType, UserTypePermission.permissionId)
+                ):
+                    type_masks[user_type] = type_masks.get(user_type, 0) | 1 << permission_id
+                for role_id, permission_id in await db.execute(
+                    select(RolePermission.roleId, RolePermission.permissionId)
+                ):
+                    role_masks[role_id] = role_masks.get(role_id, 0) | 1 << permission_id
+        # Swapped together, so a check never sees half a matrix
+        self.bits, self.type_masks, self.role_masks = bits, type_masks, role_masks
+        self.loaded = True
+
+    async def ensure_loaded(self):
+        if not self.loaded:
+            await self.load()
+
+    async def invalidate(self):
+        """Recompiles after a grant changed; call once the change has committed."""
+        await self.load()
+
+    def mask_for(self, user) -> int:
+        return self.type_masks.get(user.type, 0) | self.role_masks.get(getattr(user, "roleId", None), 0)
+
+    def bit(self, name: str) -> int:
+        """The permission's bit, or 0 (never granted) for a name not in the permissions table."""
+        return self.bits.get(name, 0)
+
+    def names(self, mask: int) -> list:
+        return sorted(name for name, bit in self.bits.items() if mask & bit)
+
+    async def start(self):
+        await self.load()
+        if self.refresh_interval > 0:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+
+    async def _run(self):
+        while True:
+            await asyncio.sleep(self.refresh_interval)
+            try:
+                await self.load()
+            except Exception:
+                logger.exception("Reloading permissions failed; keeping the previous grants")
+
+permission_matrix = PermissionMatrix(settings.PERMISSIONS_REFRESH_SECONDS)
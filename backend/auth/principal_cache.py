@@ -0,0 +1,84 @@
+import time
+from collections import OrderedDict
+
+from sqlalchemy import inspect
+from sqlalchemy.orm import make_transient_to_detached
+
+from config.settings import settings
+
+class PrincipalCache:
+    """Size-bounded LRU of authenticated principals keyed by (sub, role, iat).
+
+    Entries live until the earlier of their TTL and the token's own expiry,
+    so a cached principal can never outlive the token that produced it.
+    """
+
+    def __init__(self, maxsize: int, ttl: float):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._entries = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+
+    def get(self, key):
+        entry = self._entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+
+        expires_at, value = entry
+        if expires_at <= time.time():
+            del self._entries[key]
+            self.misses += 1
+            return None
+
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return value
+
+    def put(self, key, value, token_expires_at: float):
+        if self.maxsize <= 0:
+            return
+        self._entries[key] = (min(time.time() + self.ttl, token_expires_at), value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    def invalidate(self, sub: str):
+        """Drops every cached token for this subject (email)."""
+        for key in [key for key in self._entries if key[0] == sub]:
+            del self._entries[key]
+            self.invalidations += 1
+
+    def clear(self):
+        self._entries.clear()
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.misses
+        return {
+            "size": len(self._entries),
+            "maxsize": self.maxsize,
+            "ttl_seconds": self.ttl,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": round(self.hits / lookups, 4) if lookups else 0.0,
+            "evictions": self.evictions,
+            "invalidations": self.invalidations,
+        }
+
+def snapshot_user(user) -> tuple:
+    """Column values of a loaded user, detached from any session."""
+    return type(user), {attr.key: getattr(user, attr.key) for attr in inspect(user).mapper.column_attrs}
+
+def restore_user(db, snapshot: tuple):
+    """Rebuilds a cached user as a persistent instance of this session without SQL."""
+    cls, values = snapshot
+    user = cls(**values)
+    make_transient_to_detached(user)
+    db.add(user)
+    return user
+
+principal_cache = PrincipalCache(settings.PRINCIPAL_CACHE_SIZE, settings.PRINCIPAL_CACHE_TTL)
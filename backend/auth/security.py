@@ -1,5 +1,15 @@
+import asyncio
+import multiprocessing
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from fastapi import HTTPException, status
 from passlib.context import CryptContext
 
+from config.settings import settings
+from backend.metrics import timed
+
 pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
 
 def hash_password(password: str) -> str:
@@ -9,3 +19,104 @@ def hash_password(password: str) -> str:
 def verify_password(plain_password: str, hashed_password: str) -> bool:
     """Verifies a plain password against the stored hash."""
     return pwd_context.verify(plain_password, hashed_password)
+
+# === Hashing Worker Pool ===
+# bcrypt is deliberately slow (~250 ms per call), so it runs in a process
+# pool instead of on the event loop. Calls beyond HASH_QUEUE_LIMIT are
+# rejected with 429 rather than piling up behind a login storm. The pool is
+# started with the app; workers are spawned, not forked, so they never
+# inherit the server's event loop, sockets or database connections.
+
+_executor = None
+_in_flight = 0
+_stats = {"completed": 0, "failed": 0, "rejected": 0, "latency_sum": 0.0, "latency_max": 0.0}
+
+def _workers() -> int:
+    return settings.HASH_WORKERS or os.cpu_count() or 1
+
+def _get_executor() -> ProcessPoolExecutor:
+    global _executor
+    if _executor is None:
+        _executor = ProcessPoolExecutor(max_workers=_workers(), mp_context=multiprocessing.get_context("spawn"))
+    return _executor
+
+async def start_hashing_pool():
+    """Creates the pool and spawns every worker, so the first login does not pay for it."""
+    loop = asyncio.get_running_loop()
+    executor = _get_executor()
+    await asyncio.gather(*(loop.run_in_executor(executor, os.getpid) for _ in range(_workers())))
+
+async def _run_in_pool(fn, *args):
+    global _in_flight
+    if _in_flight >= settings.HASH_QUEUE_LIMIT:
+        _stats["rejected"] += 1
+        raise HTTPException(
+            status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+            detail="Too many authentication requests in progress, please retry",
+            headers={"Retry-After": "1"},
+        )
+
+    _in_flight += 1
+    started = time.perf_counter()
+    try:
+        result = await asyncio.get_running_loop().run_in_executor(_get_executor(), fn, *args)
+    except BaseException:
+        # e.g. BrokenProcessPool, or the request being cancelled; kept out of the latency figures
+        _stats["failed"] += 1
+        raise
+    finally:
+        _in_flight -= 1
+    elapsed = time.perf_counter() - started
+    _stats["completed"] += 1
+    _stats["latency_sum"] += elapsed
+    _stats["latency_max"] = max(_stats["latency_max"], elapsed)
+    return result
+
+async def hash_password_async(password: str) -> str:
+    """Hashes a password in the worker pool without blocking the event loop."""
+    with timed("hashing"):
+        return await _run_in_pool(hash_password, password)
+
+async def verify_password_async(plain_password: str, hashed_password: str) -> bool:
+    """Verifies a password in the worker pool without blocking the event loop."""
+    with timed("hashing"):
+        return await _run_in_pool(verify_password, plain_password, hashed_password)
+
+def _hash_many(passwords: list) -> list:
+    return [hash_password(password) for password in passwords]
+
+async def hash_passwords_async(passwords: list) -> list:
+    """Hashes many passwords at once, split evenly across the worker processes.
+
+    Each chunk takes a single slot of the queue limit, so a bulk import uses at
+    most one slot per worker instead of one per password.
+    """
+    if not passwords:
+        return []
+    size = -(-len(passwords) // _workers())
+    chunks = [passwords[i:i + size] for i in range(0, len(passwords), size)]
+    with timed("hashing"):
+        results = await asyncio.gather(*(_run_in_pool(_hash_many, chunk) for chunk in chunks))
+    return [hashed for chunk in results for hashed in chunk]
+
+def hashing_stats() -> dict:
+    """Snapshot of the hashing pool: queue depth, throughput and latency."""
+    workers = _workers()
+    completed = _stats["completed"]
+    return {
+        "workers": workers,
+        "queue_limit": settings.HASH_QUEUE_LIMIT,
+        "in_flight": _in_flight,
+        "queue_depth": max(0, _in_flight - workers),
+        "completed": completed,
+        "failed": _stats["failed"],
+        "rejected": _stats["rejected"],
+        "latency_avg_ms": round(_stats["latency_sum"] / completed * 1000, 2) if completed else 0.0,
+        "latency_max_ms": round(_stats["latency_max"] * 1000, 2),
+    }
+
+def shutdown_hashing_pool():
+    global _executor
+    if _executor is not None:
+        _executor.shutdown(wait=False, cancel_futures=True)
+        _executor = None
@@ -0,0 +1,220 @@
+"""Append-only change history for the tables in models.py.
+
+Every ORM flush on a write session records one entry per inserted,
+updated or deleted row: the changed columns as [before, after] plus the
+caller's email. Statements that bypass the ORM (bulk imports, batch
+decisions, Core deletes) call record() with what they already know.
+
+Entries ride along in session.info until the transaction commits, are
+dropped on rollback, and are then handed to audit_log, which writes them
+in batches - a multi-row INSERT, or COPY on asyncpg - off the request
+path. Auditing a write therefore costs a few dictionary operations, not
+a round trip. The price is that a crash loses the unflushed buffer (at
+most settings.AUDIT_FLUSH_MS worth).
+"""
+import asyncio
+import json
+import logging
+from datetime import date, datetime
+
+from sqlalchemy import event, inspect, insert
+
+from config.settings import settings
+from . import PrimarySession, SessionLocal, get_engine
+from .models import AuditEntry, DashboardCounter, Job
+
+logger = logging.getLogger(__name__)
+
+# Derived or infrastructure tables, not business history
+_NOT_AUDITED = (AuditEntry, DashboardCounter, Job)
+# Logged as changed, never with their values
+REDACTED = {"password"}
+_REDACTED_VALUE = "***"
+
+def _plain(key: str, value):
+    if value is None:
+        return None
+    if key in REDACTED:
+        return _REDACTED_VALUE
+    if isinstance(value, (date, datetime)):
+        return value.isoformat()
+    return value
+
+def entity_key(obj) -> tuple:
+    """(entityType, entityId) for a mapped instance: its table and primary key."""
+    mapper = inspect(obj).mapper
+    # Not state.identity: new rows only get their identity key after after_flush
+    return mapper.local_table.name, ":".join(str(value) for value in mapper.primary_key_from_instance(obj))
+
+def snapshot(obj) -> dict:
+    """The instance's loaded column values as audit changes for a delete."""
+    state = inspect(obj)
+    return {
+        attr.key: [state.dict[attr.key], None]
+        for attr in state.mapper.column_attrs
+        if state.dict.get(attr.key) is not None
+    }
+
+def record(session, entity_type: str, entity_id, action: str, changes: dict):
+    """Adds an entry to the session's transaction; changes maps column -> [before, after]."""
+    if not settings.AUDIT_ENABLED:
+        return
+    session = getattr(session, "sync_session", session)
+    session.info.setdefault("audit", []).append({
+        "entityType": entity_type,
+        "entityId": str(entity_id),
+        "action": action,
+        "changes": {key: [_plain(key, before), _plain(key, after)] for key, (before, after) in changes.items()},
+    })
+
+# === Capture ===
+
+def _diff(state) -> dict:
+    changes = {}
+    for attr in state.mapper.column_attrs:
+        history = state.attrs[attr.key].history
+        if history.added or history.deleted:
+            before = history.deleted[0] if history.deleted else None
+            after = history.added[0] if history.added else None
+            if before != after:
+                changes[attr.key] = [before, after]
+    return changes
+
+@event.listens_for(PrimarySession, "after_flush")
+def _capture(session, flush_context):
+    # After the flush primary keys are assigned, while attribute history
+    # still holds the pre-flush values
+    if not settings.AUDIT_ENABLED:
+        return
+    for action, objects in (("insert", session.new), ("update", session.dirty), ("delete", session.deleted)):
+        for obj in objects:
+            if isinstance(obj, _NOT_AUDITED):
+                continue
+            state = inspect(obj)
+            if action == "insert":
+                changes = {attr.key: [None, state.dict.get(attr.key)] for attr in state.mapper.column_attrs
+                           if state.dict.get(attr.key) is not None}
+            elif action == "update":
+                changes = _diff(state)
+                if not changes:
+                    continue
+            else:
+                changes = snapshot(obj)
+            entity_type, entity_id = entity_key(obj)
+            record(session, entity_type, entity_id, action, changes)
+
+@event.listens_for(PrimarySession, "after_commit")
+def _hand_over(session):
+    entries = session.info.pop("audit", None)
+    if not entries:
+        return
+    state = session.info.get("request_state")
+    actor = session.info.get("audit_actor") or getattr(state, "principal", None)
+    now = datetime.utcnow()
+    for entry in entries:
+        entry["actor"] = actor
+        entry["createdAt"] = now
+    audit_log.add(entries)
+
+@event.listens_for(PrimarySession, "after_soft_rollback")
+def _discard(session, previous_transaction):
+    session.info.pop("audit", None)
+
+@event.listens_for(AuditEntry, "before_update")
+@event.listens_for(AuditEntry, "before_delete")
+def _append_only(mapper, connection, target):
+    raise RuntimeError("audit_log is append-only")
+
+# === Batched Writer ===
+
+_COLUMNS = ["entityType", "entityId", "action", "changes", "actor", "createdAt"]
+
+class AuditLog:
+    """Buffers committed entries and writes them in batches."""
+
+    def __init__(self, batch_size: int, flush_interval: float, buffer_limit: int):
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.buffer_limit = buffer_limit
+        self._buffer = []
+        self._lock = asyncio.Lock()
+        self._task = None
+        self._flushing = None
+        self.written = 0
+        self.flushes = 0
+        self.dropped = 0
+        self.errors = 0
+
+    def add(self, entries: list):
+        self._buffer.extend(entries)
+        overflow = len(self._buffer) - self.buffer_limit
+        if overflow > 0:
+            del self._buffer[:overflow]
+            self.dropped += overflow
+        # A full batch does not wait for the timer
+        if len(self._buffer) >= self.batch_size and self._task is not None and self._flushing is None:
+            self._flushing = asyncio.get_running_loop().create_task(self.flush())
+            self._flushing.add_done_callback(self._flushed)
+
+    def _flushed(self, task):
+        self._flushing = None
+
+    async def start(self):
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+        await self.flush()
+
+    async def _run(self):
+        while True:
+            await asyncio.sleep(self.flush_interval)
+            await self.flush()
+
+    async def flush(self):
+        """Writes everything buffered so far; readers call it before querying audit_log."""
+        async with self._lock:
+            while self._buffer:
+                batch = self._buffer[:self.batch_size]
+                del self._buffer[:len(batch)]
+                try:
+                    await _write(batch)
+                except Exception:
+                    self._buffer[:0] = batch
+                    self.errors += 1
+                    logger.exception("Writing %d audit entries failed; kept for the next flush", len(batch))
+                    return
+                self.written += len(batch)
+                self.flushes += 1
+
+    def stats(self) -> dict:
+        return {
+            "buffered": len(self._buffer),
+            "written": self.written,
+            "flushes": self.flushes,
+            "dropped": self.dropped,
+            "errors": self.errors,
+        }
+
+async def _write(batch: list):
+    engine = get_engine()
+    if engine.dialect.driver == "asyncpg":
+        async with engine.connect() as conn:
+            raw = await conn.get_raw_connection()
+            await raw.driver_connection.copy_records_to_table(
+                AuditEntry.__tablename__,
+                columns=_COLUMNS,
+                records=[
+                    tuple(json.dumps(entry[name]) if name == "changes" else entry[name] for name in _COLUMNS)
+                    for entry in batch
+                ],
+            )
+        return
+    async with SessionLocal() as db:
+        await db.execute(insert(AuditEntry), batch)
+        await db.commit()
+
+audit_log = AuditLog(settings.AUDIT_BATCH_SIZE, settings.AUDIT_FLUSH_MS / 1000, settings.AUDIT_BUFFER_LIMIT)
@@ -0,0 +1,30 @@
+"""Command line entry point for the dashboard counters.
+
+Kept apart from dashboard_store, which the routes import, so running it with
+-m does not re-execute a module that is already loaded.
+
+    python -m backend.database.dashboard_admin rebuild|check
+"""
+import asyncio
+import sys
+
+from . import SessionLocal, dispose_engines
+from .dashboard_store import check, rebuild
+
+async def main(command: str) -> int:
+    async with SessionLocal() as db:
+        if command == "rebuild":
+            print(f"Rebuilt {await rebuild(db)} dashboard counters")
+            drift = {}
+        else:
+            drift = await check(db)
+            for name, (stored, expected) in sorted(drift.items()):
+                print(f"{name}: stored {stored}, expected {expected}")
+            print("Dashboard counters consistent" if not drift else f"{len(drift)} counters out of sync")
+    await dispose_engines()
+    return 1 if drift else 0
+
+if __name__ == "__main__":
+    if len(sys.argv) != 2 or sys.argv[1] not in ("rebuild", "check"):
+        sys.exit("usage: python -m backend.database.dashboard_admin rebuild|check")
+    sys.exit(asyncio.run(main(sys.argv[1])))
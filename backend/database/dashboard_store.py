@@ -0,0 +1,183 @@
+"""Incrementally maintained dashboard counters.
+
+Handlers that change leave, external-request or project-assignment state
+call bump() in the same transaction, so the dashboards read a handful of
+rows instead of aggregating the underlying tables on every page load.
+
+    python -m backend.database.dashboard_admin rebuild   # recompute from scratch
+    python -m backend.database.dashboard_admin check     # report drift, exit 1 if any
+"""
+from collections import Counter
+from datetime import date, timedelta
+
+from sqlalchemy import delete, func, insert, or_, select
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from .models import DashboardCounter, Employee, EmployeeProject, ExternalRequest, LeaveRequest
+
+# === Counter Names ===
+
+LEAVE_PENDING = "leave_pending"
+# Longest leave request ever stored, in days. Only ever raised, so it is a
+# safe upper bound for the leave calendar's range scans.
+LEAVE_MAX_LENGTH = "leave_max_length"
+
+def external_pending_hr(hr_employee_id) -> str:
+    # 0 collects requests for projects with no HR owner
+    return f"external_pending:hr:{hr_employee_id or 0}"
+
+def external_pending_user(user_id: int) -> str:
+    return f"external_pending:user:{user_id}"
+
+def project_headcount(project_id: int) -> str:
+    return f"project_headcount:{project_id}"
+
+def absences_starting(start: date) -> str:
+    return f"absences_starting:{start.isoformat()}"
+
+# === Transitions ===
+
+def leave_transition(old_status, new_status, start: date) -> Counter:
+    """Counter deltas for a leave request moving from old_status to new_status (None = created)."""
+    changes = Counter()
+    if old_status == "pending":
+        changes[LEAVE_PENDING] -= 1
+    if old_status == "approved":
+        changes[absences_starting(start)] -= 1
+    if new_status == "pending":
+        changes[LEAVE_PENDING] += 1
+    if new_status == "approved":
+        changes[absences_starting(start)] += 1
+    return changes
+
+def external_transition(old_status, new_status, user_id: int, hr_employee_id) -> Counter:
+    """Counter deltas for an external request moving from old_status to new_status (None = created)."""
+    changes = Counter()
+    if old_status == "pending":
+        changes[external_pending_hr(hr_employee_id)] -= 1
+        changes[external_pending_user(user_id)] -= 1
+    if new_status == "pending":
+        changes[external_pending_hr(hr_employee_id)] += 1
+        changes[external_pending_user(user_id)] += 1
+    return changes
+
+# === Reads and Writes ===
+
+async def bump(db: AsyncSession, changes: dict):
+    """Adds each delta to its counter with a single upsert in the caller's transaction."""
+    rows = [{"name": name, "value": delta} for name, delta in changes.items() if delta]
+    if not rows:
+        return
+
+    dialect = db.get_bind().dialect.name
+    upsert = pg_insert if dialect == "postgresql" else sqlite_insert
+    stmt = upsert(DashboardCounter).values(rows)
+    stmt = stmt.on_conflict_do_update(
+        index_elements=[DashboardCounter.name],
+        set_={"value": DashboardCounter.value + stmt.excluded.value},
+    )
+    await db.execute(stmt)
+
+async def raise_to(db: AsyncSession, name: str, value: int):
+    """Stores value in the counter unless it already holds something larger."""
+    dialect = db.get_bind().dialect.name
+    upsert = pg_insert if dialect == "postgresql" else sqlite_insert
+    larger = func.greatest if dialect == "postgresql" else func.max
+    stmt = upsert(DashboardCounter).values(name=name, value=value)
+    stmt = stmt.on_conflict_do_update(
+        index_elements=[DashboardCounter.name],
+        set_={"value": larger(DashboardCounter.value, stmt.excluded.value)},
+    )
+    await db.execute(stmt)
+
+async def read(db: AsyncSession, names=(), absences_from: date = None, absences_days: int = 0) -> dict:
+    """Reads the named counters, plus absence starts in a date window, in one query."""
+    conditions = [DashboardCounter.name.in_(list(names))]
+    if absences_from is not None and absences_days > 0:
+        conditions.append(DashboardCounter.name.between(
+            absences_starting(absences_from),
+            absences_starting(absences_from + timedelta(days=absences_days - 1)),
+        ))
+    rows = (await db.execute(select(DashboardCounter.name, DashboardCounter.value).where(or_(*conditions)))).all()
+
+    values = {name: 0 for name in names}
+    values.update(dict(rows))
+    values["upcoming_absences"] = sum(value for name, value in rows if name.startswith("absences_starting:"))
+    return values
+
+# === Rebuild and Consistency Check ===
+
+async def expected_counters(db: AsyncSession) -> Counter:
+    """Recomputes every counter from the source tables."""
+    expected = Counter()
+
+    pending_leaves = await db.scalar(select(func.count()).where(LeaveRequest.status == "pending"))
+    expected[LEAVE_PENDING] = pending_leaves or 0
+
+    rows = await db.execute(
+        select(LeaveRequest.startDate, func.count())
+        .where(LeaveRequest.status == "approved")
+        .group_by(LeaveRequest.startDate)
+    )
+    for start, count in rows:
+        expected[absences_starting(start)] = count
+
+    rows = await db.execute(
+        select(ExternalRequest.hrEmployeeId, func.count())
+        .where(ExternalRequest.status == "pending")
+        .group_by(ExternalRequest.hrEmployeeId)
+    )
+    for hr_employee_id, count in rows:
+        expected[external_pending_hr(hr_employee_id)] += count
+
+    rows = await db.execute(
+        select(ExternalRequest.userId, func.count())
+        .where(ExternalRequest.status == "pending")
+        .group_by(ExternalRequest.userId)
+    )
+    for user_id, count in rows:
+        expected[external_pending_user(user_id)] = count
+
+    # Archived employees keep their assignments but are not counted
+    employees = Employee.__table__
+    rows = await db.execute(
+        select(EmployeeProject.projectId, func.count())
+        .join(employees, employees.c.personId == EmployeeProject.employeeId)
+        .where(employees.c.archivedAt.is_(None))
+        .group_by(EmployeeProject.projectId)
+    )
+    for project_id, count in rows:
+        expected[project_headcount(project_id)] = count
+
+    if db.get_bind().dialect.name == "postgresql":
+        length = LeaveRequest.endDate - LeaveRequest.startDate + 1
+    else:
+        length = func.julianday(LeaveRequest.endDate) - func.julianday(LeaveRequest.startDate) + 1
+    expected[LEAVE_MAX_LENGTH] = int(await db.scalar(select(func.max(length))) or 0)
+
+    return +expected
+
+async def rebuild(db: AsyncSession) -> int:
+    """Replaces all counters with freshly computed values; returns how many were written."""
+    expected = await expected_counters(db)
+    await db.execute(delete(DashboardCounter))
+    if expected:
+        await db.execute(insert(DashboardCounter), [{"name": name, "value": value} for name, value in expected.items()])
+    await db.commit()
+    return len(expected)
+
+async def check(db: AsyncSession) -> dict:
+    """Counters whose stored value differs from the source tables: name -> (stored, expected)."""
+    expected = await expected_counters(db)
+    stored = dict((await db.execute(select(DashboardCounter.name, DashboardCounter.value))).all())
+    drift = {
+        name: (stored.get(name, 0), expected.get(name, 0))
+        for name in set(stored) | set(expected)
+        if stored.get(name, 0) != expected.get(name, 0)
+    }
+    # An upper bound is all the calendar needs; deleted leaves may leave it high
+    if stored.get(LEAVE_MAX_LENGTH, 0) >= expected.get(LEAVE_MAX_LENGTH, 0):
+        drift.pop(LEAVE_MAX_LENGTH, None)
+    return drift
@@ -0,0 +1,28 @@
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import with_polymorphic
+
+from .models import Person, Employee, HREmployee, ExternalUser
+
+# Person joined to every concrete subtype, so a single SELECT returns an
+# Employee / HREmployee / ExternalUser instance with all its columns loaded.
+AnyPerson = with_polymorphic(Person, [Employee, HREmployee, ExternalUser])
+
+# Discriminator value on persons.type -> role name used in JWTs
+ROLE_BY_TYPE = {
+    "employee": "employee",
+    "hr_employee": "hr",
+    "external_user": "external",
+}
+
+async def resolve_identity(db: AsyncSession, email: str):
+    """Loads the person with this email as its concrete subtype in one query.
+
+    Archived employees are not found, so they can neither log in nor use
+    a token issued before they were archived.
+    """
+    return await db.scalar(select(AnyPerson).where(AnyPerson.email == email, AnyPerson.Employee.archivedAt.is_(None)))
+
+def role_for(user) -> str | None:
+    """Role name for a resolved person, or None if it has no login role."""
+    return ROLE_BY_TYPE.get(user.type)
@@ -0,0 +1,121 @@
+"""Interval queries over leave requests: overlaps, absences and balances.
+
+On Postgres every overlap test is written as daterange && daterange so it
+uses the GiST index from migration 0005. Other databases get the same
+answer from a B-tree range scan on startDate, bounded below by the longest
+leave actually stored (the leave_max_length dashboard counter), or by
+settings.LEAVE_MAX_DAYS until that counter has been built.
+"""
+from collections import defaultdict
+from datetime import date, timedelta
+
+from sqlalchemy import and_, literal_column, func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from config.settings import settings
+from .pagination import PageParams, paginate
+from . import dashboard_store
+from .models import DashboardCounter, Employee, EmployeeProject, LeaveRequest
+
+# Statuses that hold a slot in the calendar
+ACTIVE_STATUSES = ("pending", "approved")
+
+async def overlaps(db: AsyncSession, start: date, end: date):
+    """Predicate: the leave request shares at least one day with [start, end]."""
+    if db.get_bind().dialect.name == "postgresql":
+        # Inline bounds so the expression matches the index definition
+        bounds = literal_column("'[]'")
+        return func.daterange(LeaveRequest.startDate, LeaveRequest.endDate, bounds).op("&&")(
+            func.daterange(start, end, bounds)
+        )
+    longest = await db.scalar(
+        select(DashboardCounter.value).where(DashboardCounter.name == dashboard_store.LEAVE_MAX_LENGTH)
+    )
+    return and_(
+        LeaveRequest.startDate.between(start - timedelta(days=(longest or settings.LEAVE_MAX_DAYS) - 1), end),
+        LeaveRequest.endDate >= start,
+    )
+
+def working_days(start: date, end: date) -> int:
+    """Monday to Friday days in [start, end]."""
+    if end < start:
+        return 0
+    weeks, extra = divmod((end - start).days + 1, 7)
+    return weeks * 5 + sum(1 for offset in range(extra) if (start + timedelta(days=weeks * 7 + offset)).weekday() < 5)
+
+async def find_overlaps(db: AsyncSession, employee_id: int, start: date, end: date) -> list:
+    """The employee's pending or approved requests sharing a day with [start, end]."""
+    rows = await db.execute(
+        select(LeaveRequest.requestId, LeaveRequest.startDate, LeaveRequest.endDate, LeaveRequest.status)
+        .where(
+            LeaveRequest.employeeId == employee_id,
+            LeaveRequest.status.in_(ACTIVE_STATUSES),
+            LeaveRequest.startDate <= end,
+            LeaveRequest.endDate >= start,
+        )
+        .order_by(LeaveRequest.startDate)
+    )
+    return rows.all()
+
+async def absences(
+    db: AsyncSession,
+    start: date,
+    end: date,
+    project_id: int = None,
+    role_id: int = None,
+    include_pending: bool = False,
+    page: PageParams = None,
+) -> dict:
+    """One page of who is off between start and end, optionally limited to a project or role."""
+    stmt = (
+        select(
+            LeaveRequest.requestId, LeaveRequest.employeeId, Employee.firstName, Employee.lastName,
+            LeaveRequest.startDate, LeaveRequest.endDate, LeaveRequest.requestType, LeaveRequest.status,
+        )
+        .join(Employee, Employee.personId == LeaveRequest.employeeId)
+        .where(
+            await overlaps(db, start, end),
+            LeaveRequest.status.in_(ACTIVE_STATUSES if include_pending else ("approved",)),
+            Employee.archivedAt.is_(None),
+        )
+    )
+    if project_id is not None:
+        stmt = stmt.where(LeaveRequest.employeeId.in_(
+            select(EmployeeProject.employeeId).where(EmployeeProject.projectId == project_id)
+        ))
+    if role_id is not None:
+        stmt = stmt.where(Employee.roleId == role_id)
+    return await paginate(db, stmt, LeaveRequest.requestId, page or PageParams(limit=50, after=None))
+
+async def balance(db: AsyncSession, employee_id: int, year: int) -> dict:
+    """Working days taken and requested per leave type in a calendar year."""
+    first, last = date(year, 1, 1), date(year, 12, 31)
+    rows = await db.execute(
+        select(LeaveRequest.startDate, LeaveRequest.endDate, LeaveRequest.requestType, LeaveRequest.status)
+        .where(
+            LeaveRequest.employeeId == employee_id,
+            LeaveRequest.status.in_(ACTIVE_STATUSES),
+            LeaveRequest.startDate <= last,
+            LeaveRequest.endDate >= first,
+        )
+    )
+
+    taken = defaultdict(int)
+    requested = defaultdict(int)
+    for start, end, request_type, status in rows:
+        days = working_days(max(start, first), min(end, last))
+        (taken if status == "approved" else requested)[request_type] += days
+
+    allowance = settings.LEAVE_ANNUAL_ALLOWANCE
+    annual_taken = taken.get("annual", 0)
+    annual_pending = requested.get("annual", 0)
+    return {
+        "employeeId": employee_id,
+        "year": year,
+        "annual_allowance": allowance,
+        "annual_taken": annual_taken,
+        "annual_pending": annual_pending,
+        "annual_remaining": allowance - annual_taken - annual_pending,
+        "taken_by_type": dict(taken),
+        "pending_by_type": dict(requested),
+    }
@@ -0,0 +1,104 @@
+"""baseline schema
+
+The tables as they existed before migrations were introduced. Databases
+that were created by hand should be stamped rather than upgraded:
+
+    alembic stamp 0001
+
+Revision ID: 0001
+Revises:
+Create Date: 2026-10-17 09:00:00
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "0001"
+down_revision: Union[str, None] = None
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "persons",
+        sa.Column("personId", sa.Integer(), primary_key=True, autoincrement=True),
+        sa.Column("firstName", sa.String(50), nullable=False),
+        sa.Column("lastName", sa.String(50), nullable=False),
+        sa.Column("email", sa.String(255), nullable=False, unique=True),
+        sa.Column("password", sa.String(), nullable=False),
+    )
+    op.create_table(
+        "roles",
+        sa.Column("roleId", sa.Integer(), primary_key=True, autoincrement=True),
+        sa.Column("roleName", sa.String(50), nullable=False),
+    )
+    op.create_table(
+        "employees",
+        sa.Column("personId", sa.Integer(), sa.ForeignKey("persons.personId"), primary_key=True),
+        sa.Column("roleId", sa.Integer(), sa.ForeignKey("roles.roleId"), nullable=False),
+        sa.Column("hireDate", sa.Date(), nullable=False),
+        sa.Column("qualifications", sa.String(500), nullable=False),
+    )
+    op.create_table(
+        "hr_employees",
+        sa.Column("personId", sa.Integer(), sa.ForeignKey("persons.personId"), primary_key=True),
+        sa.Column("department", sa.String(100), nullable=False),
+    )
+    op.create_table(
+        "external_users",
+        sa.Column("personId", sa.Integer(), sa.ForeignKey("persons.personId"), primary_key=True),
+        sa.Column("username", sa.String(50), nullable=False),
+    )
+    op.create_table(
+        "leave_requests",
+        sa.Column("requestId", sa.Integer(), primary_key=True, autoincrement=True),
+        sa.Column("employeeId", sa.Integer(), sa.ForeignKey("employees.personId"), nullable=False),
+        sa.Column("hrEmployeeId", sa.Integer(), sa.ForeignKey("hr_employees.personId"), nullable=True),
+        sa.Column("startDate", sa.Date(), nullable=False),
+        sa.Column("endDate", sa.Date(), nullable=False),
+        sa.Column("requestType", sa.String(50), nullable=False),
+        sa.Column("status", sa.String(20), nullable=False),
+        sa.Column("reason", sa.String(500), nullable=False),
+    )
+    op.create_table(
+        "projects",
+        sa.Column("projectId", sa.Integer(), primary_key=True, autoincrement=True),
+        sa.Column("projectName", sa.String(100), nullable=False),
+        sa.Column("description", sa.String(500), nullable=False),
+        sa.Column("hrEmployeeId", sa.Integer(), sa.ForeignKey("hr_employees.personId"), nullable=True),
+    )
+    op.create_table(
+        "external_requests",
+        sa.Column("requestId", sa.Integer(), primary_key=True, autoincrement=True),
+        sa.Column("userId", sa.Integer(), sa.ForeignKey("external_users.personId"), nullable=False),
+        sa.Column("projectId", sa.Integer(), sa.ForeignKey("projects.projectId"), nullable=False),
+        sa.Column("hrEmployeeId", sa.Integer(), sa.ForeignKey("hr_employees.personId"), nullable=True),
+        sa.Column("description", sa.String(500), nullable=False),
+        sa.Column("status", sa.String(20), nullable=False),
+        sa.Column("response", sa.String(500), nullable=True),
+    )
+    op.create_table(
+        "employee_projects",
+        sa.Column("employeeId", sa.Integer(), sa.ForeignKey("employees.personId"), primary_key=True),
+        sa.Column("projectId", sa.Integer(), sa.ForeignKey("projects.projectId"), primary_key=True),
+    )
+
+
+def downgrade() -> None:
+    for table in (
+        "employee_projects",
+        "external_requests",
+        "projects",
+        "leave_requests",
+        "external_users",
+        "hr_employees",
+        "employees",
+        "roles",
+        "persons",
+    ):
+        op.drop_table(table)
@@ -0,0 +1,42 @@
+"""persons.type discriminator
+
+Adds the polymorphic discriminator used by the single-query identity
+lookup and backfills it from the subtype tables.
+
+Revision ID: 0002
+Revises: 0001
+Create Date: 2026-10-17 09:05:00
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "0002"
+down_revision: Union[str, None] = "0001"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column("persons", sa.Column("type", sa.String(20), nullable=True))
+    for table, identity in (
+        ("employees", "employee"),
+        ("hr_employees", "hr_employee"),
+        ("external_users", "external_user"),
+    ):
+        op.execute(
+            f'UPDATE persons SET type = \'{identity}\' '
+            f'WHERE "personId" IN (SELECT "personId" FROM {table})'
+        )
+    op.execute("UPDATE persons SET type = 'person' WHERE type IS NULL")
+    with op.batch_alter_table("persons") as batch:
+        batch.alter_column("type", existing_type=sa.String(20), nullable=False)
+
+
+def downgrade() -> None:
+    with op.batch_alter_table("persons") as batch:
+        batch.drop_column("type")
@@ -0,0 +1,46 @@
+"""indexes for hot lookup columns
+
+Revision ID: 0003
+Revises: 0002
+Create Date: 2026-10-17 09:10:00
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "0003"
+down_revision: Union[str, None] = "0002"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+INDEXES = [
+    ("ix_employees_roleId", "employees", ["roleId"]),
+    ("ix_leave_requests_employeeId_startDate", "leave_requests", ["employeeId", "startDate"]),
+    ("ix_leave_requests_status_requestId", "leave_requests", ["status", "requestId"]),
+    ("ix_projects_hrEmployeeId", "projects", ["hrEmployeeId"]),
+    ("ix_external_requests_userId", "external_requests", ["userId"]),
+    ("ix_external_requests_hrEmployeeId_status", "external_requests", ["hrEmployeeId", "status"]),
+    ("ix_external_requests_status", "external_requests", ["status"]),
+    ("ix_employee_projects_projectId", "employee_projects", ["projectId"]),
+]
+
+
+def upgrade() -> None:
+    # On Postgres build the indexes without blocking writes to the tables;
+    # CREATE INDEX CONCURRENTLY cannot run inside a transaction.
+    if op.get_context().dialect.name == "postgresql":
+        with op.get_context().autocommit_block():
+            for name, table, columns in INDEXES:
+                op.create_index(name, table, columns, postgresql_concurrently=True, if_not_exists=True)
+    else:
+        for name, table, columns in INDEXES:
+            op.create_index(name, table, columns)
+
+
+def downgrade() -> None:
+    for name, table, _ in reversed(INDEXES):
+        op.drop_index(name, table_name=table)
@@ -0,0 +1,35 @@
+"""dashboard counters
+
+Incrementally maintained dashboard summary values. Populate them after
+upgrading with:
+
+    python -m backend.database.dashboard_admin rebuild
+
+Revision ID: 0004
+Revises: 0003
+Create Date: 2026-10-17 11:00:00
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "0004"
+down_revision: Union[str, None] = "0003"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "dashboard_counters",
+        sa.Column("name", sa.String(100), primary_key=True),
+        sa.Column("value", sa.Integer(), nullable=False),
+    )
+
+
+def downgrade() -> None:
+    op.drop_table("dashboard_counters")
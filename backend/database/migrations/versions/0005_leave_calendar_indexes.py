@@ -0,0 +1,43 @@
+"""leave calendar interval indexes
+
+Revision ID: 0005
+Revises: 0004
+Create Date: 2026-10-17 12:00:00
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "0005"
+down_revision: Union[str, None] = "0004"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Expression index answering daterange overlap (&&) queries; Postgres only,
+# so it is not declared on the model.
+PERIOD_INDEX = (
+    'CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_leave_requests_period '
+    'ON leave_requests USING gist (daterange("startDate", "endDate", \'[]\'))'
+)
+
+
+def upgrade() -> None:
+    if op.get_context().dialect.name == "postgresql":
+        with op.get_context().autocommit_block():
+            op.create_index(
+                "ix_leave_requests_startDate_endDate", "leave_requests", ["startDate", "endDate"],
+                postgresql_concurrently=True, if_not_exists=True,
+            )
+            op.execute(PERIOD_INDEX)
+    else:
+        op.create_index("ix_leave_requests_startDate_endDate", "leave_requests", ["startDate", "endDate"])
+
+
+def downgrade() -> None:
+    if op.get_context().dialect.name == "postgresql":
+        op.execute("DROP INDEX IF EXISTS ix_leave_requests_period")
+    op.drop_index("ix_leave_requests_startDate_endDate", table_name="leave_requests")
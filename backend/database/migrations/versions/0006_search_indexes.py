@@ -0,0 +1,46 @@
+"""search indexes
+
+Revision ID: 0006
+Revises: 0005
+Create Date: 2026-10-17 14:00:00
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "0006"
+down_revision: Union[str, None] = "0005"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# GIN indexes over the tsvector expressions in backend/database/search.py;
+# the expressions must match those exactly. Postgres only: other databases
+# search with the in-process index instead.
+SEARCH_INDEXES = {
+    "ix_persons_search": (
+        "persons",
+        """to_tsvector('simple', "firstName" || ' ' || "lastName" || ' ' || translate(email, '@.', '  '))""",
+    ),
+    "ix_employees_qualifications_search": ("employees", "to_tsvector('simple', qualifications)"),
+    "ix_projects_search": ("projects", """to_tsvector('simple', "projectName" || ' ' || description)"""),
+    "ix_external_requests_search": ("external_requests", "to_tsvector('simple', description)"),
+}
+
+
+def upgrade() -> None:
+    if op.get_context().dialect.name != "postgresql":
+        return
+    with op.get_context().autocommit_block():
+        for name, (table, expression) in SEARCH_INDEXES.items():
+            op.execute(f"CREATE INDEX CONCURRENTLY IF NOT EXISTS {name} ON {table} USING gin ({expression})")
+
+
+def downgrade() -> None:
+    if op.get_context().dialect.name != "postgresql":
+        return
+    for name in SEARCH_INDEXES:
+        op.execute(f"DROP INDEX IF EXISTS {name}")
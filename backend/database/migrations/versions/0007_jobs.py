@@ -0,0 +1,41 @@
+"""durable background jobs
+
+Only used when JOB_DURABLE is on; otherwise jobs live in memory.
+
+Revision ID: 0007
+Revises: 0006
+Create Date: 2026-10-17 15:00:00
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "0007"
+down_revision: Union[str, None] = "0006"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "jobs",
+        sa.Column("jobId", sa.String(32), primary_key=True),
+        sa.Column("name", sa.String(100), nullable=False),
+        sa.Column("payload", sa.JSON(), nullable=False),
+        sa.Column("status", sa.String(20), nullable=False),
+        sa.Column("attempts", sa.Integer(), nullable=False),
+        sa.Column("lastError", sa.String(1000), nullable=True),
+        sa.Column("result", sa.JSON(), nullable=True),
+        sa.Column("createdAt", sa.DateTime(), nullable=False),
+        sa.Column("updatedAt", sa.DateTime(), nullable=False),
+    )
+    op.create_index("ix_jobs_status_updatedAt", "jobs", ["status", "updatedAt"])
+
+
+def downgrade() -> None:
+    op.drop_index("ix_jobs_status_updatedAt", table_name="jobs")
+    op.drop_table("jobs")
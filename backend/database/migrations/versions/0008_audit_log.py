@@ -0,0 +1,37 @@
+"""append-only audit log
+
+Revision ID: 0008
+Revises: 0007
+Create Date: 2026-10-17 18:00:00
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "0008"
+down_revision: Union[str, None] = "0007"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "audit_log",
+        sa.Column("auditId", sa.Integer(), primary_key=True, autoincrement=True),
+        sa.Column("entityType", sa.String(50), nullable=False),
+        sa.Column("entityId", sa.String(50), nullable=False),
+        sa.Column("action", sa.String(10), nullable=False),
+        sa.Column("changes", sa.JSON(), nullable=False),
+        sa.Column("actor", sa.String(255), nullable=True),
+        sa.Column("createdAt", sa.DateTime(), nullable=False),
+    )
+    op.create_index("ix_audit_log_entity", "audit_log", ["entityType", "entityId", "auditId"])
+
+
+def downgrade() -> None:
+    op.drop_index("ix_audit_log_entity", table_name="audit_log")
+    op.drop_table("audit_log")
@@ -0,0 +1,86 @@
+"""permission tables, seeded with the grants get_current_user used to hard-code
+
+Revision ID: 0009
+Revises: 0008
+Create Date: 2026-10-17 20:00:00
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "0009"
+down_revision: Union[str, None] = "0008"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# permissionId -> (name, description, user types granted it)
+PERMISSIONS = {
+    1: ("view_personal_info", "See one's own employee record", ["employee"]),
+    2: ("send_leave_request", "Request leave and see one's own balance", ["employee"]),
+    3: ("view_all_leave_requests", "List leave requests and the absence calendar", ["employee", "hr_employee"]),
+    4: ("view_all_projects", "Find projects in search", ["employee", "hr_employee"]),
+    5: ("view_all_employees", "List and search employees and roles", ["hr_employee"]),
+    6: ("create_employee", "Create and import employees, create roles", ["hr_employee"]),
+    7: ("edit_employee", "Edit employees and roles", ["hr_employee"]),
+    8: ("delete_employee", "Delete employees and roles", ["hr_employee"]),
+    9: ("approve_deny_leave_requests", "Decide leave requests and see anyone's balance", ["hr_employee"]),
+    10: ("view_all_external_requests", "List and search external requests", ["hr_employee"]),
+    11: ("respond_to_external_requests", "Answer external requests", ["hr_employee"]),
+    12: ("create_project", "Create projects", ["hr_employee"]),
+    13: ("edit_project", "Edit projects", ["hr_employee"]),
+    14: ("delete_project", "Delete projects", ["hr_employee"]),
+    15: ("view_audit_log", "Read the change history of any row", ["hr_employee"]),
+    16: ("view_own_projects", "See projects as an external user", ["external_user"]),
+    17: ("send_request", "Send and list one's own external requests", ["external_user"]),
+    18: ("view_projects", "Browse the project catalogue", ["external_user", "hr_employee"]),
+    19: ("view_employee_dashboard", "Open the employee dashboard", ["employee"]),
+    20: ("view_assigned_projects", "List the projects one is assigned to", ["employee"]),
+    21: ("view_hr_dashboard", "Open the HR dashboard", ["hr_employee"]),
+    22: ("view_external_dashboard", "Open the external user dashboard", ["external_user"]),
+    23: ("export_data", "Download full table exports", ["hr_employee"]),
+    24: ("view_system_stats", "Read pool, cache, job and audit statistics", ["hr_employee"]),
+    25: ("run_system_jobs", "Queue maintenance jobs such as a dashboard rebuild", ["hr_employee"]),
+    26: ("manage_permissions", "Grant and revoke role permissions", ["hr_employee"]),
+}
+
+
+def upgrade() -> None:
+    permissions = op.create_table(
+        "permissions",
+        sa.Column("permissionId", sa.Integer(), primary_key=True, autoincrement=True),
+        sa.Column("name", sa.String(100), nullable=False, unique=True),
+        sa.Column("description", sa.String(255), nullable=True),
+    )
+    user_type_permissions = op.create_table(
+        "user_type_permissions",
+        sa.Column("userType", sa.String(20), primary_key=True),
+        sa.Column("permissionId", sa.Integer(), sa.ForeignKey("permissions.permissionId", ondelete="CASCADE"), primary_key=True),
+    )
+    op.create_table(
+        "role_permissions",
+        sa.Column("roleId", sa.Integer(), sa.ForeignKey("roles.roleId", ondelete="CASCADE"), primary_key=True),
+        sa.Column("permissionId", sa.Integer(), sa.ForeignKey("permissions.permissionId", ondelete="CASCADE"), primary_key=True),
+    )
+
+    op.bulk_insert(permissions, [
+        {"permissionId": permission_id, "name": name, "description": description}
+        for permission_id, (name, description, _) in PERMISSIONS.items()
+    ])
+    op.bulk_insert(user_type_permissions, [
+        {"userType": user_type, "permissionId": permission_id}
+        for permission_id, (_, _, user_types) in PERMISSIONS.items()
+        for user_type in user_types
+    ])
+    if op.get_bind().dialect.name == "postgresql":
+        # Explicit ids do not advance the serial
+        op.execute("""SELECT setval(pg_get_serial_sequence('permissions', 'permissionId'), (SELECT max("permissionId") FROM permissions))""")
+
+
+def downgrade() -> None:
+    op.drop_table("role_permissions")
+    op.drop_table("user_type_permissions")
+    op.drop_table("permissions")
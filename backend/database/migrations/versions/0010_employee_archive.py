@@ -0,0 +1,29 @@
+"""employees.archivedAt for soft-deleting leavers
+
+Revision ID: 0010
+Revises: 0009
+Create Date: 2026-10-17 22:00:00
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "0010"
+down_revision: Union[str, None] = "0009"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column("employees", sa.Column("archivedAt", sa.DateTime(), nullable=True))
+    op.create_index("ix_employees_archivedAt", "employees", ["archivedAt"])
+
+
+def downgrade() -> None:
+    op.drop_index("ix_employees_archivedAt", table_name="employees")
+    with op.batch_alter_table("employees") as batch:
+        batch.drop_column("archivedAt")
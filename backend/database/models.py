@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, Date, ForeignKey
+from sqlalchemy import Column, Integer, String, Date, DateTime, ForeignKey, Index, JSON
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import relationship, Mapped
 from sqlalchemy.orm import mapped_column
@@ -7,11 +7,13 @@ from . import Base
 
 class Person(Base):
     __tablename__ = "persons"
+    __mapper_args__ = {"polymorphic_on": "type", "polymorphic_identity": "person"}
     personId: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
     firstName: Mapped[str] = mapped_column(String(50), nullable=False)
     lastName: Mapped[str] = mapped_column(String(50), nullable=False)
     email: Mapped[str] = mapped_column(String(255), nullable=False, unique=True)
     password: Mapped[str] = mapped_column(String, nullable=False)
+    type: Mapped[str] = mapped_column(String(20), nullable=False)
 
     employee: Mapped["Employee"] = relationship(back_populates="person", uselist=False)
     hr_employee: Mapped["HREmployee"] = relationship(back_populates="person", uselist=False)
@@ -19,11 +21,14 @@ class Person(Base):
 
 class Employee(Person):
     __tablename__ = "employees"
+    __table_args__ = (Index("ix_employees_roleId", "roleId"), Index("ix_employees_archivedAt", "archivedAt"))
     __mapper_args__ = {"polymorphic_identity": "employee"}
     personId: Mapped[int] = mapped_column(Integer, ForeignKey("persons.personId"), primary_key=True)
     roleId: Mapped[int] = mapped_column(Integer, ForeignKey("roles.roleId"), nullable=False)
     hireDate: Mapped[Date] = mapped_column(Date, nullable=False)
     qualifications: Mapped[str] = mapped_column(String(500), nullable=False)
+    # Set when the employee leaves; archived employees are hidden, not deleted (see employee_offboarding.py)
+    archivedAt: Mapped[DateTime] = mapped_column(DateTime, nullable=True)
     leave_requests: Mapped[list["LeaveRequest"]] = relationship(back_populates="employee")
     projects: Mapped[list["EmployeeProject"]] = relationship(back_populates="employee")
     role: Mapped["Role"] = relationship(back_populates="employees")
@@ -53,8 +58,34 @@ class Role(Base):
     roleName: Mapped[str] = mapped_column(String(50), nullable=False)
     employees: Mapped[list["Employee"]] = relationship(back_populates="role")
 
+class Permission(Base):
+    """A named capability; 1 << permissionId is its bit in compiled masks (see auth/permissions.py)."""
+    __tablename__ = "permissions"
+    permissionId: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
+    name: Mapped[str] = mapped_column(String(100), nullable=False, unique=True)
+    description: Mapped[str] = mapped_column(String(255), nullable=True)
+
+class UserTypePermission(Base):
+    """A permission every person of one type (persons.type) has."""
+    __tablename__ = "user_type_permissions"
+    userType: Mapped[str] = mapped_column(String(20), primary_key=True)
+    permissionId: Mapped[int] = mapped_column(Integer, ForeignKey("permissions.permissionId", ondelete="CASCADE"), primary_key=True)
+
+class RolePermission(Base):
+    """A permission employees with this role have on top of their type's."""
+    __tablename__ = "role_permissions"
+    roleId: Mapped[int] = mapped_column(Integer, ForeignKey("roles.roleId", ondelete="CASCADE"), primary_key=True)
+    permissionId: Mapped[int] = mapped_column(Integer, ForeignKey("permissions.permissionId", ondelete="CASCADE"), primary_key=True)
+
 class LeaveRequest(Base):
     __tablename__ = "leave_requests"
+    __table_args__ = (
+        Index("ix_leave_requests_employeeId_startDate", "employeeId", "startDate"),
+        Index("ix_leave_requests_status_requestId", "status", "requestId"),
+        # Calendar range scans; Postgres also gets a GiST index on
+        # daterange("startDate", "endDate") (see leave_calendar.py, migration 0005)
+        Index("ix_leave_requests_startDate_endDate", "startDate", "endDate"),
+    )
     requestId: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
     employeeId: Mapped[int] = mapped_column(Integer, ForeignKey("employees.personId"), nullable=False)
     hrEmployeeId: Mapped[int] = mapped_column(Integer, ForeignKey("hr_employees.personId"), nullable=True)
@@ -68,6 +99,7 @@ class LeaveRequest(Base):
 
 class Project(Base):
     __tablename__ = "projects"
+    __table_args__ = (Index("ix_projects_hrEmployeeId", "hrEmployeeId"),)
     projectId: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
     projectName: Mapped[str] = mapped_column(String(100), nullable=False)
     description: Mapped[str] = mapped_column(String(500), nullable=False)
@@ -78,6 +110,11 @@ class Project(Base):
 
 class ExternalRequest(Base):
     __tablename__ = "external_requests"
+    __table_args__ = (
+        Index("ix_external_requests_userId", "userId"),
+        Index("ix_external_requests_hrEmployeeId_status", "hrEmployeeId", "status"),
+        Index("ix_external_requests_status", "status"),
+    )
     requestId: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
     userId: Mapped[int] = mapped_column(Integer, ForeignKey("external_users.personId"), nullable=False)
     projectId: Mapped[int] = mapped_column(Integer, ForeignKey("projects.projectId"), nullable=False)
@@ -91,7 +128,41 @@ class ExternalRequest(Base):
 
 class EmployeeProject(Base):
     __tablename__ = "employee_projects"
+    __table_args__ = (Index("ix_employee_projects_projectId", "projectId"),)
     employeeId: Mapped[int] = mapped_column(Integer, ForeignKey("employees.personId"), primary_key=True)
     projectId: Mapped[int] = mapped_column(Integer, ForeignKey("projects.projectId"), primary_key=True)
     employee: Mapped["Employee"] = relationship(back_populates="projects")
     project: Mapped["Project"] = relationship(back_populates="employees")
+
+class DashboardCounter(Base):
+    __tablename__ = "dashboard_counters"
+    name: Mapped[str] = mapped_column(String(100), primary_key=True)
+    value: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+
+class Job(Base):
+    """A background job, stored only when settings.JOB_DURABLE is on."""
+    __tablename__ = "jobs"
+    __table_args__ = (Index("ix_jobs_status_updatedAt", "status", "updatedAt"),)
+    jobId: Mapped[str] = mapped_column(String(32), primary_key=True)
+    name: Mapped[str] = mapped_column(String(100), nullable=False)
+    payload: Mapped[dict] = mapped_column(JSON, nullable=False)
+    status: Mapped[str] = mapped_column(String(20), nullable=False, default="queued")
+    attempts: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    lastError: Mapped[str] = mapped_column(String(1000), nullable=True)
+    result: Mapped[dict] = mapped_column(JSON, nullable=True)
+    createdAt: Mapped[DateTime] = mapped_column(DateTime, nullable=False)
+    updatedAt: Mapped[DateTime] = mapped_column(DateTime, nullable=False)
+
+class AuditEntry(Base):
+    """One change to an audited row; rows are only ever inserted (see audit.py)."""
+    __tablename__ = "audit_log"
+    __table_args__ = (Index("ix_audit_log_entity", "entityType", "entityId", "auditId"),)
+    auditId: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
+    entityType: Mapped[str] = mapped_column(String(50), nullable=False)
+    entityId: Mapped[str] = mapped_column(String(50), nullable=False)
+    action: Mapped[str] = mapped_column(String(10), nullable=False)
+    # column -> [before, after]
+    changes: Mapped[dict] = mapped_column(JSON, nullable=False)
+    # Email of the caller, kept as text so history outlives the account
+    actor: Mapped[str] = mapped_column(String(255), nullable=True)
+    createdAt: Mapped[DateTime] = mapped_column(DateTime, nullable=False)
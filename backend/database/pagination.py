@@ -0,0 +1,39 @@
+from typing import Optional
+
+from fastapi import Query
+from sqlalchemy.ext.asyncio import AsyncSession
+
+class PageParams:
+    """Keyset pagination parameters shared by every list endpoint."""
+
+    def __init__(
+        self,
+        limit: int = Query(50, ge=1, le=500, description="Maximum number of items to return"),
+        after: Optional[int] = Query(None, description="Cursor from a previous page's next_cursor"),
+    ):
+        self.limit = limit
+        self.after = after
+
+def columns_for(entity, schema) -> list:
+    """The entity's columns named by a response schema, for column-projected selects."""
+    return [getattr(entity, name) for name in schema.model_fields]
+
+async def paginate(db: AsyncSession, stmt, key_column, page: PageParams) -> dict:
+    """Runs stmt as one keyset page ordered by key_column (a unique, indexed column).
+
+    Fetches one extra row to know whether another page exists, so the
+    client gets next_cursor=None on the last page without a COUNT query.
+    stmt may select an entity (items are ORM objects) or a column
+    projection (items are rows with one attribute per column).
+    """
+    if page.after is not None:
+        stmt = stmt.where(key_column > page.after)
+    stmt = stmt.order_by(key_column).limit(page.limit + 1)
+
+    result = await db.execute(stmt)
+    selected = stmt.column_descriptions
+    is_entity = len(selected) == 1 and selected[0]["expr"] is selected[0]["entity"]
+    rows = (result.scalars() if is_entity else result).all()
+    items = rows[:page.limit]
+    next_cursor = getattr(items[-1], key_column.key) if len(rows) > page.limit else None
+    return {"items": items, "next_cursor": next_cursor}
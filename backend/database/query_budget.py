@@ -0,0 +1,98 @@
+import logging
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from sqlalchemy import event
+
+from config.settings import settings
+from . import on_engine_created
+
+logger = logging.getLogger(__name__)
+
+# Statements executed by the current request; None outside a request
+_query_count: ContextVar = ContextVar("query_count", default=None)
+
+def _count_query(conn, cursor, statement, parameters, context, executemany):
+    counter = _query_count.get()
+    if counter is not None:
+        counter[0] += 1
+
+@on_engine_created
+def _count_queries_on(name, target):
+    event.listen(target.sync_engine, "before_cursor_execute", _count_query)
+
+class QueryBudgetExceeded(RuntimeError):
+    pass
+
+def query_budget(max_queries):
+    """Declares how many SQL statements an endpoint may execute per request.
+
+    None exempts the endpoint (e.g. bulk operations that scale with input).
+
+    Put it below the router decorator:
+
+        @router.get("/dashboard")
+        @query_budget(2)
+        async def dashboard(...): ...
+    """
+    def decorator(endpoint):
+        endpoint.__query_budget__ = max_queries
+        return endpoint
+    return decorator
+
+@contextmanager
+def unbudgeted():
+    """Statements run inside are not charged to the current request, e.g.
+    rebuilding a process-wide cache that a request happens to trigger."""
+    token = _query_count.set(None)
+    try:
+        yield
+    finally:
+        _query_count.reset(token)
+
+def current_query_count() -> int:
+    counter = _query_count.get()
+    return counter[0] if counter is not None else 0
+
+class QueryBudgetMiddleware:
+    """Counts the SQL statements each request runs and flags routes over budget.
+
+    QUERY_BUDGET_MODE is "off", "warn" (log it) or "raise" (fail the
+    request; python -m benchmarks.query_budgets calls every route this way
+    to catch N+1 regressions). Routes without a @query_budget use
+    QUERY_BUDGET_DEFAULT.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or settings.QUERY_BUDGET_MODE == "off":
+            await self.app(scope, receive, send)
+            return
+
+        counter = [0]
+        token = _query_count.set(counter)
+
+        async def send_wrapper(message):
+            if message["type"] == "http.response.start":
+                self._check(scope, counter[0])
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            _query_count.reset(token)
+
+    def _check(self, scope, count: int):
+        route = scope.get("route")
+        if route is None:
+            return
+        budget = getattr(route.endpoint, "__query_budget__", settings.QUERY_BUDGET_DEFAULT)
+        if budget is None or count <= budget:
+            return
+
+        message = f"{scope['method']} {route.path} ran {count} queries (budget {budget})"
+        if settings.QUERY_BUDGET_MODE == "raise":
+            raise QueryBudgetExceeded(message)
+        logger.warning(message)
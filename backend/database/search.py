@@ -0,0 +1,226 @@
+"""Prefix search over people, projects and external requests.
+
+Every word of the query must match the start of some word in the
+entity's text (first/last name, email and qualifications for people;
+name and description for projects; description for requests), so
+"jo sm" finds "John Smith" while typing.
+
+On Postgres each text is a to_tsvector('simple', ...) expression with a
+GIN index from migration 0006 and words become 'word:*' prefix queries.
+Other databases (SQLite in tests) use an in-process inverted index that
+is rebuilt on the next search after any write to the indexed tables.
+"""
+import asyncio
+import re
+from bisect import bisect_left
+from collections import defaultdict
+from itertools import accumulate
+
+from sqlalchemy import and_, event, func, literal, literal_column, or_, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from . import PrimarySession
+from .models import Employee, ExternalRequest, Person, Project
+from .query_budget import unbudgeted
+
+SCOPES = ("people", "projects", "requests")
+
+# Words of a query beyond this many are ignored
+MAX_TERMS = 8
+
+def words_of(text: str) -> list:
+    """Lowercased words, split the way the 'simple' text search config does."""
+    return re.findall(r"\w+", (text or "").lower())
+
+def terms(query: str) -> list:
+    return words_of(query)[:MAX_TERMS]
+
+# === Postgres: tsvector expressions ===
+# These must stay identical to the index definitions in migration 0006.
+
+# Constants are inlined rather than bound so the expressions match the
+# indexes under prepared (generic) plans too
+SPACE = literal_column("' '")
+
+def _tsvector(text):
+    return func.to_tsvector(literal_column("'simple'"), text)
+
+employees = Employee.__table__
+
+def person_vector():
+    # Split emails into words so "doe" finds john.doe@company.com
+    email_words = func.translate(Person.email, literal_column("'@.'"), literal_column("'  '"))
+    return _tsvector(Person.firstName + SPACE + Person.lastName + SPACE + email_words)
+
+def qualifications_vector():
+    return _tsvector(employees.c.qualifications)
+
+def project_vector():
+    return _tsvector(Project.projectName + SPACE + Project.description)
+
+def request_vector():
+    return _tsvector(ExternalRequest.description)
+
+def _prefix(term: str):
+    # terms() only yields \w characters, so nothing here can be a tsquery operator
+    return func.to_tsquery(literal_column("'simple'"), literal(term + ":*"))
+
+def _matches_all(words: list, *vectors):
+    return and_(*(or_(*(vector.op("@@")(_prefix(word)) for vector in vectors)) for word in words))
+
+# === Fallback: in-process inverted index ===
+
+class InvertedIndex:
+    """Per scope: word -> ids postings, a sorted word list for prefix ranges
+    and each document's own words for checking candidates."""
+
+    def __init__(self):
+        self.generation = -1
+        self._postings = {}
+        self._words = {}
+        self._sizes = {}
+        self._docs = {}
+        self._lock = asyncio.Lock()
+
+    def _add(self, scope: str, key: int, *texts):
+        words = {word for text in texts for word in words_of(text)}
+        self._docs[scope][key] = tuple(words)
+        for word in words:
+            self._postings[scope][word].append(key)
+
+    async def rebuild(self, db: AsyncSession, generation: int):
+        self._postings = {scope: defaultdict(list) for scope in SCOPES}
+        self._docs = {scope: {} for scope in SCOPES}
+        people = await db.execute(
+            select(Person.personId, Person.firstName, Person.lastName, Person.email, employees.c.qualifications)
+            .outerjoin(employees, employees.c.personId == Person.personId)
+            # Left out here rather than after the lookup, where they would take up
+            # part of the limit. Archiving and restoring update employees, so the
+            # index is rebuilt either way.
+            .where(employees.c.archivedAt.is_(None))
+            .order_by(Person.personId)
+        )
+        for person_id, first, last, email, qualifications in people:
+            self._add("people", person_id, first, last, email, qualifications)
+        for project_id, name, description in await db.execute(
+            select(Project.projectId, Project.projectName, Project.description).order_by(Project.projectId)
+        ):
+            self._add("projects", project_id, name, description)
+        for request_id, description in await db.execute(
+            select(ExternalRequest.requestId, ExternalRequest.description).order_by(ExternalRequest.requestId)
+        ):
+            self._add("requests", request_id, description)
+
+        self._words = {scope: sorted(postings) for scope, postings in self._postings.items()}
+        # Running totals of posting sizes, so any prefix's match count is two bisects away
+        self._sizes = {
+            scope: list(accumulate((len(self._postings[scope][word]) for word in words), initial=0))
+            for scope, words in self._words.items()
+        }
+        self.generation = generation
+
+    async def ensure_current(self, db: AsyncSession):
+        if self.generation == _generation:
+            return
+        async with self._lock:
+            if self.generation != _generation:
+                with unbudgeted():
+                    await self.rebuild(db, _generation)
+
+    def _range(self, scope: str, word: str) -> tuple:
+        words = self._words[scope]
+        return bisect_left(words, word), bisect_left(words, word + "\U0010ffff")
+
+    def search(self, scope: str, words: list, limit: int) -> list:
+        """Smallest matching ids first, matching every word by prefix.
+
+        Starts from the most selective word. When even that one matches a
+        large share of the documents, scanning documents in id order finds
+        `limit` hits sooner than materialising its postings.
+        """
+        docs = self._docs[scope]
+        sizes = self._sizes[scope]
+        ranges = {word: self._range(scope, word) for word in words}
+        rarest = min(words, key=lambda word: sizes[ranges[word][1]] - sizes[ranges[word][0]])
+        lo, hi = ranges[rarest]
+        matches = sizes[hi] - sizes[lo]
+        if not matches:
+            return []
+
+        def matches_all(key):
+            own = docs[key]
+            return all(any(word.startswith(term) for word in own) for term in words)
+
+        # Expected documents scanned before `limit` hits is limit * len(docs) / matches
+        if matches * matches > limit * len(docs):
+            hits = []
+            for key in docs:
+                if matches_all(key):
+                    hits.append(key)
+                    if len(hits) == limit:
+                        break
+            return hits
+
+        postings = self._postings[scope]
+        words_list = self._words[scope]
+        candidates = {key for i in range(lo, hi) for key in postings[words_list[i]]}
+        return sorted(key for key in candidates if matches_all(key))[:limit]
+
+inverted_index = InvertedIndex()
+
+# Bumped by every flush or statement that writes an indexed table; the
+# fallback index rebuilds when its generation falls behind.
+_generation = 0
+_INDEXED = (Person, Employee, Project, ExternalRequest)
+_INDEXED_TABLES = {"persons", "employees", "projects", "external_requests"}
+
+def _changed():
+    global _generation
+    _generation += 1
+
+@event.listens_for(PrimarySession, "after_flush")
+def _on_flush(session, flush_context):
+    if any(isinstance(obj, _INDEXED) for obj in (*session.new, *session.dirty, *session.deleted)):
+        _changed()
+
+@event.listens_for(PrimarySession, "do_orm_execute")
+def _on_statement(orm_execute_state):
+    # Core and bulk statements run through the session, e.g. the CSV import
+    if orm_execute_state.is_insert or orm_execute_state.is_update or orm_execute_state.is_delete:
+        table = getattr(orm_execute_state.statement, "table", None)
+        if getattr(table, "name", None) in _INDEXED_TABLES:
+            _changed()
+
+# === Queries ===
+
+async def _fallback_ids(db: AsyncSession, scope: str, words: list, limit: int) -> list:
+    await inverted_index.ensure_current(db)
+    return inverted_index.search(scope, words, limit)
+
+async def search_people(db: AsyncSession, words: list, limit: int) -> list:
+    stmt = (
+        select(Person.personId, Person.firstName, Person.lastName, Person.email, Person.type)
+        .outerjoin(employees, employees.c.personId == Person.personId)
+        .where(employees.c.archivedAt.is_(None))
+    )
+    if db.get_bind().dialect.name == "postgresql":
+        stmt = stmt.where(_matches_all(words, person_vector(), qualifications_vector()))
+    else:
+        stmt = stmt.where(Person.personId.in_(await _fallback_ids(db, "people", words, limit)))
+    return (await db.execute(stmt.order_by(Person.personId).limit(limit))).all()
+
+async def search_projects(db: AsyncSession, words: list, limit: int, columns: list) -> list:
+    stmt = select(*columns)
+    if db.get_bind().dialect.name == "postgresql":
+        stmt = stmt.where(_matches_all(words, project_vector()))
+    else:
+        stmt = stmt.where(Project.projectId.in_(await _fallback_ids(db, "projects", words, limit)))
+    return (await db.execute(stmt.order_by(Project.projectId).limit(limit))).all()
+
+async def search_requests(db: AsyncSession, words: list, limit: int, columns: list) -> list:
+    stmt = select(*columns)
+    if db.get_bind().dialect.name == "postgresql":
+        stmt = stmt.where(_matches_all(words, request_vector()))
+    else:
+        stmt = stmt.where(ExternalRequest.requestId.in_(await _fallback_ids(db, "requests", words, limit)))
+    return (await db.execute(stmt.order_by(ExternalRequest.requestId).limit(limit))).all()
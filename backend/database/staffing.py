@@ -0,0 +1,87 @@
+"""Set-based changes to project assignments (employee_projects).
+
+A staffing call fixes one side of the pair, a project or an employee,
+and lists ids on the other side to assign and unassign. However many ids
+it lists, it costs the same few statements:
+- one SELECT reads the fixed side's current pairs
+- one multi-row INSERT and one DELETE ... IN apply the difference
+- one upsert moves the project headcount counters
+
+Headcounts leave out archived employees, whose pairs are still read,
+listed and removed like any other.
+"""
+from collections import Counter
+
+from sqlalchemy import delete, insert, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from . import audit, dashboard_store
+from .models import Employee, EmployeeProject, Project
+
+PROJECT = "project"
+EMPLOYEE = "employee"
+
+# side -> (its column in employee_projects, the other side's column, the other side's key)
+_SIDES = {
+    PROJECT: (EmployeeProject.projectId, EmployeeProject.employeeId, Employee.__table__.c.personId),
+    EMPLOYEE: (EmployeeProject.employeeId, EmployeeProject.projectId, Project.projectId),
+}
+
+def _pair(side: str, fixed_id: int, other_id: int) -> tuple:
+    """(employeeId, projectId) for an id on each side."""
+    return (other_id, fixed_id) if side == PROJECT else (fixed_id, other_id)
+
+async def unknown_ids(db: AsyncSession, side: str, ids: set) -> list:
+    """Ids in the other side's table that do not exist (or are archived employees), in one query."""
+    if not ids:
+        return []
+    key = _SIDES[side][2]
+    stmt = select(key).where(key.in_(ids))
+    if side == PROJECT:
+        stmt = stmt.where(Employee.__table__.c.archivedAt.is_(None))
+    found = set((await db.scalars(stmt)).all())
+    return sorted(ids - found)
+
+async def restaff(db: AsyncSession, side: str, fixed_id: int, assign: set, unassign: set, replace: bool = False) -> tuple:
+    """Applies the change in the caller's transaction; returns the (assigned, unassigned) other-side ids.
+
+    With replace, everything currently assigned and not in assign is
+    unassigned. Pairs already in the requested state are left alone.
+    """
+    fixed, other, _ = _SIDES[side]
+    employees = Employee.__table__
+    # other-side id -> whether the pair's employee is archived
+    stmt = (
+        select(other, employees.c.archivedAt.is_not(None))
+        .select_from(EmployeeProject)
+        .join(employees, employees.c.personId == EmployeeProject.employeeId)
+        .where(fixed == fixed_id)
+    )
+    if not replace:
+        if not assign and not unassign:
+            return [], []
+        stmt = stmt.where(other.in_(assign | unassign))
+    current = dict((await db.execute(stmt)).all())
+
+    assigned = sorted(assign - current.keys())
+    unassigned = sorted(current.keys() - assign if replace else current.keys() & unassign)
+    if assigned:
+        await db.execute(insert(EmployeeProject), [
+            dict(zip(("employeeId", "projectId"), _pair(side, fixed_id, other_id))) for other_id in assigned
+        ])
+    if unassigned:
+        await db.execute(delete(EmployeeProject).where(fixed == fixed_id, other.in_(unassigned)))
+
+    changes = Counter()
+    # Only live employees can be assigned; see unknown_ids() and the staffing routes
+    for action, ids, delta in (("insert", assigned, 1), ("delete", unassigned, -1)):
+        for other_id in ids:
+            employee_id, project_id = _pair(side, fixed_id, other_id)
+            if not current.get(other_id):
+                changes[dashboard_store.project_headcount(project_id)] += delta
+            values = {"employeeId": employee_id, "projectId": project_id}
+            audit.record(db, "employee_projects", f"{employee_id}:{project_id}", action, {
+                key: [None, value] if action == "insert" else [value, None] for key, value in values.items()
+            })
+    await dashboard_store.bump(db, changes)
+    return assigned, unassigned
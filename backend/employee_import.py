@@ -0,0 +1,110 @@
+"""Bulk employee import shared by the import endpoint and its background job."""
+from pydantic import ValidationError
+from sqlalchemy import insert, select
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from backend.auth.security import hash_passwords_async
+from backend.database import audit
+from backend.database.models import Employee, Person, Role
+from backend.models import Employee as EmployeeSchema
+
+# Rows per INSERT statement
+IMPORT_BATCH_SIZE = 1000
+
+async def import_records(db: AsyncSession, records: list) -> dict:
+    """Validates and inserts employee records, committing all valid rows at once.
+
+    Invalid rows are reported per row and skipped. Raises IntegrityError,
+    with nothing imported, if a concurrent change conflicts with the batch.
+    """
+    errors = []
+    valid = []
+    seen_emails = set()
+
+    # Validate every row with the API schema, rejecting in-file duplicates
+    for index, record in enumerate(records):
+        try:
+            row = EmployeeSchema.model_validate(record)
+        except ValidationError as exc:
+            email = record.get("email") if isinstance(record, dict) else None
+            errors.append({"row": index, "email": email, "errors": [f"{'.'.join(map(str, e['loc']))}: {e['msg']}" for e in exc.errors()]})
+            continue
+        if row.email in seen_emails:
+            errors.append({"row": index, "email": row.email, "errors": ["Duplicate email in import"]})
+            continue
+        seen_emails.add(row.email)
+        valid.append((index, row))
+
+    # One set-based query each for existing emails and unknown roles
+    if valid:
+        existing = set((await db.scalars(select(Person.email).where(Person.email.in_(seen_emails)))).all())
+        role_ids = {row.roleId for _, row in valid}
+        known_roles = set((await db.scalars(select(Role.roleId).where(Role.roleId.in_(role_ids)))).all())
+
+        checked = []
+        for index, row in valid:
+            if row.email in existing:
+                errors.append({"row": index, "email": row.email, "errors": ["Email already exists"]})
+            elif row.roleId not in known_roles:
+                errors.append({"row": index, "email": row.email, "errors": [f"Unknown roleId {row.roleId}"]})
+            else:
+                checked.append((index, row))
+        valid = checked
+
+    created = []
+    if valid:
+        hashes = await hash_passwords_async([row.password for _, row in valid])
+        rows = [row for _, row in valid]
+
+        for start in range(0, len(rows), IMPORT_BATCH_SIZE):
+            batch = rows[start:start + IMPORT_BATCH_SIZE]
+            batch_hashes = hashes[start:start + IMPORT_BATCH_SIZE]
+            inserted = await db.execute(
+                insert(Person.__table__).returning(Person.__table__.c.personId, Person.__table__.c.email),
+                [
+                    {
+                        "firstName": row.firstName,
+                        "lastName": row.lastName,
+                        "email": row.email,
+                        "password": hashed,
+                        "type": "employee",
+                    }
+                    for row, hashed in zip(batch, batch_hashes)
+                ],
+            )
+            ids = {email: person_id for person_id, email in inserted.all()}
+            await db.execute(
+                insert(Employee.__table__),
+                [
+                    {
+                        "personId": ids[row.email],
+                        "roleId": row.roleId,
+                        "hireDate": row.hireDate,
+                        "qualifications": row.qualifications,
+                    }
+                    for row in batch
+                ],
+            )
+            created.extend({"personId": ids[row.email], "email": row.email} for row in batch)
+            for row in batch:
+                audit.record(db, "employees", ids[row.email], "insert", {
+                    "personId": [None, ids[row.email]],
+                    "firstName": [None, row.firstName],
+                    "lastName": [None, row.lastName],
+                    "email": [None, row.email],
+                    "password": [None, True],
+                    "type": [None, "employee"],
+                    "roleId": [None, row.roleId],
+                    "hireDate": [None, row.hireDate],
+                    "qualifications": [None, row.qualifications],
+                })
+
+        try:
+            await db.commit()
+        except IntegrityError:
+            await db.rollback()
+            raise
+
+    errors.sort(key=lambda error: error["row"])
+    return {"created": len(created), "failed": len(errors), "employees": created, "errors": errors}
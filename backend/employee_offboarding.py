@@ -0,0 +1,168 @@
+"""Archiving and purging employees, shared by the endpoints and the bulk purge job.
+
+Archiving sets employees.archivedAt. The employee can no longer log in
+and drops out of employee lists, search, exports, the leave calendar
+and project rosters, but every row stays and restore() brings them back.
+Their assignments stay too, but stop counting towards the project
+headcount counters until they are restored.
+
+Purging deletes employees for good together with their leave requests
+and project assignments. Each table is cleared for a whole batch with
+one DELETE ... WHERE IN ... RETURNING, so the statements per transaction
+do not grow with the batch. The returned rows feed the dashboard
+counters and the audit log without loading anything first.
+"""
+from collections import Counter
+from datetime import datetime
+
+from sqlalchemy import delete, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from backend.auth.principal_cache import principal_cache
+from backend.database import SessionLocal, audit, dashboard_store
+from backend.database.models import Employee, EmployeeProject, LeaveRequest, Person
+from backend.response_cache import response_cache
+
+# Employees purged per transaction by purge_archived()
+PURGE_BATCH_SIZE = 500
+
+employees = Employee.__table__
+persons = Person.__table__
+leave_requests = LeaveRequest.__table__
+employee_projects = EmployeeProject.__table__
+
+def _deleted(row) -> dict:
+    return {key: [value, None] for key, value in row._mapping.items() if value is not None}
+
+async def _move_headcounts(db: AsyncSession, employee_ids: list, delta: int):
+    """Adds delta to the headcount of each project the employees are assigned to."""
+    changes = Counter()
+    for project_id in await db.scalars(
+        select(employee_projects.c.projectId).where(employee_projects.c.employeeId.in_(employee_ids))
+    ):
+        changes[dashboard_store.project_headcount(project_id)] += delta
+    await dashboard_store.bump(db, changes)
+
+async def archive(db: AsyncSession, employee_ids: list, when: datetime = None) -> list:
+    """Archives those of the employees not archived yet; returns their ids.
+
+    The caller invalidates the "assignments" response cache tag after
+    committing, as rosters and headcounts no longer include them.
+    """
+    when = when or datetime.utcnow()
+    archived = (await db.scalars(
+        update(employees)
+        .where(employees.c.personId.in_(employee_ids), employees.c.archivedAt.is_(None))
+        .values(archivedAt=when)
+        .returning(employees.c.personId)
+    )).all()
+    if not archived:
+        return []
+    await _move_headcounts(db, archived, -1)
+    for employee_id in archived:
+        audit.record(db, "employees", employee_id, "update", {"archivedAt": [None, when]})
+    return archived
+
+async def restore(db: AsyncSession, employee_ids: list) -> list:
+    """Clears archivedAt on those of the employees that have it; returns their ids.
+
+    As with archive(), the caller invalidates the "assignments" tag.
+    """
+    # Read under lock first: UPDATE ... RETURNING would only return the cleared value
+    archived = dict((await db.execute(
+        select(employees.c.personId, employees.c.archivedAt)
+        .where(employees.c.personId.in_(employee_ids), employees.c.archivedAt.is_not(None))
+        .with_for_update()
+    )).all())
+    if not archived:
+        return []
+    await db.execute(update(employees).where(employees.c.personId.in_(list(archived))).values(archivedAt=None))
+    await _move_headcounts(db, list(archived), 1)
+    for employee_id, archived_at in archived.items():
+        audit.record(db, "employees", employee_id, "update", {"archivedAt": [archived_at, None]})
+    return list(archived)
+
+async def purge(db: AsyncSession, employee_ids: list) -> dict:
+    """Deletes the employees, their leave requests and their assignments in the caller's transaction.
+
+    Five statements whatever the number of ids. Returns row counts and
+    the purged emails, whose cached principals the caller drops after
+    committing. Archived employees' assignments already left the
+    headcounts when they were archived.
+    """
+    changes = Counter()
+
+    leaves = (await db.execute(
+        delete(leave_requests).where(leave_requests.c.employeeId.in_(employee_ids)).returning(*leave_requests.c)
+    )).all()
+    for row in leaves:
+        changes.update(dashboard_store.leave_transition(row.status, None, row.startDate))
+        audit.record(db, "leave_requests", row.requestId, "delete", _deleted(row))
+
+    assignments = (await db.execute(
+        delete(employee_projects).where(employee_projects.c.employeeId.in_(employee_ids)).returning(*employee_projects.c)
+    )).all()
+    for row in assignments:
+        audit.record(db, "employee_projects", f"{row.employeeId}:{row.projectId}", "delete", _deleted(row))
+
+    removed = {
+        row.personId: row
+        for row in await db.execute(
+            delete(employees).where(employees.c.personId.in_(employee_ids)).returning(*employees.c)
+        )
+    }
+    for row in assignments:
+        if removed[row.employeeId].archivedAt is None:
+            changes[dashboard_store.project_headcount(row.projectId)] -= 1
+    # Only the employees' own person rows, whatever other ids were passed
+    people = (await db.execute(
+        delete(persons).where(persons.c.personId.in_(list(removed))).returning(*persons.c)
+    )).all() if removed else []
+    for row in people:
+        audit.record(db, "employees", row.personId, "delete", {**_deleted(row), **_deleted(removed[row.personId])})
+
+    await dashboard_store.bump(db, changes)
+    return {
+        "employees": len(removed),
+        "leave_requests": len(leaves),
+        "assignments": len(assignments),
+        "emails": [row.email for row in people],
+    }
+
+async def purge_archived(employee_ids: list = None, archived_before: datetime = None, actor: str = None) -> dict:
+    """Purges archived employees, PURGE_BATCH_SIZE per transaction; returns the totals.
+
+    Limited to employee_ids and/or those archived before archived_before.
+    Each batch is re-read under lock, so an employee restored meanwhile
+    is skipped rather than purged.
+    """
+    totals = Counter()
+    last = 0
+    async with SessionLocal(info={"audit_actor": actor}) as db:
+        while True:
+            stmt = (
+                select(employees.c.personId)
+                .where(employees.c.archivedAt.is_not(None), employees.c.personId > last)
+                .order_by(employees.c.personId)
+                .limit(PURGE_BATCH_SIZE)
+                .with_for_update()
+            )
+            if employee_ids is not None:
+                stmt = stmt.where(employees.c.personId.in_(employee_ids))
+            if archived_before is not None:
+                stmt = stmt.where(employees.c.archivedAt < archived_before)
+            batch = (await db.scalars(stmt)).all()
+            if not batch:
+                break
+
+            result = await purge(db, batch)
+            await db.commit()
+            for email in result.pop("emails"):
+                principal_cache.invalidate(email)
+            totals.update(result)
+            totals["batches"] += 1
+            last = batch[-1]
+
+    if totals["assignments"]:
+        await response_cache.invalidate("assignments")
+    return {name: totals[name] for name in ("employees", "leave_requests", "assignments", "batches")}
@@ -0,0 +1,269 @@
+"""In-process background jobs for side effects that need not delay a response.
+
+Handlers register under a name and are queued from a request with the
+session whose commit makes them valid:
+
+    @task("notify")
+    async def notify(messages): ...
+
+    enqueue(db, "notify", messages=[...])   # runs once db commits
+
+Jobs of a rolled-back transaction are dropped. With settings.JOB_DURABLE a
+row in the jobs table is written in the same transaction, claimed with a
+conditional UPDATE before each attempt and re-queued on startup, so jobs
+survive restarts and run once across several worker processes.
+"""
+import asyncio
+import logging
+import uuid
+from collections import OrderedDict
+from datetime import datetime, timedelta
+
+from sqlalchemy import event, select, update
+
+from config.settings import settings
+from .database import PrimarySession, SessionLocal
+from .database.models import Job
+
+logger = logging.getLogger(__name__)
+
+# name -> (coroutine function, may be stored in the jobs table)
+_tasks = {}
+
+def task(name: str, durable: bool = True):
+    """Registers a coroutine function as the handler for jobs called name.
+
+    durable=False keeps these jobs out of the jobs table even when
+    JOB_DURABLE is on, for payloads that must never be stored (passwords).
+    """
+    def decorator(fn):
+        _tasks[name] = (fn, durable)
+        return fn
+    return decorator
+
+# === Queue ===
+
+class JobQueue:
+    """asyncio.Queue drained by a fixed number of worker tasks, with retries."""
+
+    def __init__(self, workers: int, max_attempts: int, retry_delay: float, history_size: int):
+        self.workers = workers
+        self.max_attempts = max_attempts
+        self.retry_delay = retry_delay
+        self.history_size = history_size
+        self._queue = None
+        self._workers = []
+        # Jobs submitted before start(), e.g. by a script that never starts the app
+        self._backlog = []
+        self._jobs = OrderedDict()
+        self.running = 0
+        self.completed = 0
+        self.failed = 0
+        self.retried = 0
+
+    def _track(self, job_id: str, name: str, attempts: int = 0) -> dict:
+        state = {
+            "job_id": job_id,
+            "name": name,
+            "status": "queued",
+            "attempts": attempts,
+            "error": None,
+            "result": None,
+            "created_at": datetime.utcnow(),
+            "finished_at": None,
+        }
+        self._jobs[job_id] = state
+        while len(self._jobs) > self.history_size:
+            self._jobs.popitem(last=False)
+        return state
+
+    def submit(self, job_id: str, name: str, payload: dict, durable: bool, attempts: int = 0):
+        self._track(job_id, name, attempts)
+        item = (job_id, name, payload, durable)
+        if self._queue is None:
+            self._backlog.append(item)
+        else:
+            self._queue.put_nowait(item)
+
+    async def start(self):
+        self._queue = asyncio.Queue()
+        if settings.JOB_DURABLE:
+            await self._recover()
+        for item in self._backlog:
+            self._queue.put_nowait(item)
+        self._backlog.clear()
+        self._workers = [asyncio.create_task(self._work()) for _ in range(self.workers)]
+
+    async def stop(self):
+        for worker in self._workers:
+            worker.cancel()
+        await asyncio.gather(*self._workers, return_exceptions=True)
+        self._workers = []
+        self._queue = None
+
+    async def join(self):
+        """Waits until every queued job has finished (retries included)."""
+        while self._queue is not None and (self._queue.unfinished_tasks or self.running or self._retrying()):
+            await asyncio.sleep(0.01)
+
+    def _retrying(self) -> bool:
+        return any(state["status"] == "retrying" for state in self._jobs.values())
+
+    async def _work(self):
+        while True:
+            item = await self._queue.get()
+            try:
+                await self._run(*item)
+            except Exception:
+                logger.exception("Job bookkeeping failed for %s", item[0])
+            finally:
+                self._queue.task_done()
+
+    async def _run(self, job_id: str, name: str, payload: dict, durable: bool):
+        state = self._jobs.get(job_id) or self._track(job_id, name)
+        if durable and not await _claim(job_id):
+            # Another process took it, or it already finished
+            self._jobs.pop(job_id, None)
+            return
+
+        state["status"] = "running"
+        state["attempts"] += 1
+        self.running += 1
+        try:
+            result = await _tasks[name][0](**payload)
+        except Exception as exc:
+            state["error"] = f"{type(exc).__name__}: {exc}"
+            if state["attempts"] < self.max_attempts:
+                state["status"] = "retrying"
+                self.retried += 1
+                delay = self.retry_delay * 2 ** (state["attempts"] - 1)
+                logger.warning("Job %s (%s) failed, retrying in %.1fs: %s", job_id, name, delay, state["error"])
+                asyncio.get_running_loop().call_later(delay, self._requeue, (job_id, name, payload, durable))
+                if durable:
+                    await _finish(job_id, "queued", error=state["error"])
+            else:
+                state["status"] = "failed"
+                state["finished_at"] = datetime.utcnow()
+                self.failed += 1
+                logger.error("Job %s (%s) failed after %d attempts: %s", job_id, name, state["attempts"], state["error"])
+                if durable:
+                    await _finish(job_id, "failed", error=state["error"])
+        else:
+            state["status"] = "done"
+            state["result"] = result
+            state["finished_at"] = datetime.utcnow()
+            self.completed += 1
+            if durable:
+                await _finish(job_id, "done", result=result)
+        finally:
+            self.running -= 1
+
+    def _requeue(self, item: tuple):
+        state = self._jobs.get(item[0])
+        if state is not None:
+            state["status"] = "queued"
+        if self._queue is not None:
+            self._queue.put_nowait(item)
+
+    async def _recover(self):
+        """Queues durable jobs left over by a previous run of the app."""
+        stale = datetime.utcnow() - timedelta(seconds=settings.JOB_STALE_SECONDS)
+        async with SessionLocal() as db:
+            await db.execute(
+                update(Job).where(Job.status == "running", Job.updatedAt < stale).values(status="queued")
+            )
+            rows = (await db.execute(
+                select(Job.jobId, Job.name, Job.payload, Job.attempts).where(Job.status == "queued").order_by(Job.createdAt)
+            )).all()
+            await db.commit()
+        for job_id, name, payload, attempts in rows:
+            if name in _tasks:
+                self.submit(job_id, name, payload, True, attempts)
+            else:
+                logger.error("Durable job %s has no handler registered as %r", job_id, name)
+
+    def get(self, job_id: str):
+        return self._jobs.get(job_id)
+
+    def stats(self) -> dict:
+        return {
+            "workers": len(self._workers),
+            "durable": settings.JOB_DURABLE,
+            "queued": self._queue.qsize() if self._queue is not None else len(self._backlog),
+            "running": self.running,
+            "completed": self.completed,
+            "failed": self.failed,
+            "retried": self.retried,
+        }
+
+job_queue = JobQueue(
+    settings.JOB_WORKERS, settings.JOB_MAX_ATTEMPTS, settings.JOB_RETRY_DELAY_MS / 1000, settings.JOB_HISTORY_SIZE
+)
+
+# === Durable Job Rows ===
+
+async def _claim(job_id: str) -> bool:
+    async with SessionLocal() as db:
+        claimed = await db.execute(
+            update(Job)
+            .where(Job.jobId == job_id, Job.status == "queued")
+            .values(status="running", attempts=Job.attempts + 1, updatedAt=datetime.utcnow())
+        )
+        await db.commit()
+        return claimed.rowcount == 1
+
+async def _finish(job_id: str, status: str, error: str = None, result=None):
+    async with SessionLocal() as db:
+        await db.execute(
+            update(Job)
+            .where(Job.jobId == job_id)
+            .values(status=status, lastError=error and error[:1000], result=result, updatedAt=datetime.utcnow())
+        )
+        await db.commit()
+
+async def load_job(job_id: str):
+    """A durable job's row as a status dict, for jobs no longer in memory."""
+    async with SessionLocal() as db:
+        job = await db.get(Job, job_id)
+    if job is None:
+        return None
+    return {
+        "job_id": job.jobId,
+        "name": job.name,
+        "status": job.status,
+        "attempts": job.attempts,
+        "error": job.lastError,
+        "result": job.result,
+        "created_at": job.createdAt,
+        "finished_at": job.updatedAt if job.status in ("done", "failed") else None,
+    }
+
+# === Enqueueing ===
+
+def enqueue(db, name: str, **payload) -> str:
+    """Queues a job to run once db's transaction commits; returns its id.
+
+    With db=None the job is queued at once and never stored.
+    """
+    if name not in _tasks:
+        raise KeyError(f"No task registered as {name!r}")
+    job_id = uuid.uuid4().hex
+    if db is None:
+        job_queue.submit(job_id, name, payload, durable=False)
+        return job_id
+
+    durable = settings.JOB_DURABLE and _tasks[name][1]
+    if durable:
+        now = datetime.utcnow()
+        db.add(Job(jobId=job_id, name=name, payload=payload, status="queued", attempts=0, createdAt=now, updatedAt=now))
+    db.info.setdefault("pending_jobs", []).append((job_id, name, payload, durable))
+    return job_id
+
+@event.listens_for(PrimarySession, "after_commit")
+def _dispatch_jobs(session):
+    for job_id, name, payload, durable in session.info.pop("pending_jobs", []):
+        job_queue.submit(job_id, name, payload, durable)
+
+@event.listens_for(PrimarySession, "after_soft_rollback")
+def _drop_jobs(session, previous_transaction):
+    session.info.pop("pending_jobs", None)
@@ -0,0 +1,223 @@
+"""Request-level timing, exposed in the Prometheus text format on /metrics.
+
+MetricsMiddleware gives every HTTP request a RequestStats in a context
+variable. Engine events add each SQL statement's count and duration to
+it. timed("hashing") around the bcrypt pool calls adds to it, and so does
+the response class's orjson rendering. When the response is sent, the
+totals go into per-route histograms and counters. With
+settings.SLOW_REQUEST_MS set, requests over the threshold are logged with
+the statements they ran.
+
+Routes are labelled by their path template (/hr/employees/{employee_id}),
+so the number of series is bounded by the number of routes.
+"""
+import logging
+import time
+from collections import defaultdict
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from fastapi.responses import ORJSONResponse
+from sqlalchemy import event
+
+from config.settings import settings
+from .database import on_engine_created
+
+slow_requests = logging.getLogger("backend.slow_requests")
+
+# Upper bounds in seconds, as in the Prometheus client libraries
+BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+# === Metric Types ===
+
+def _labels(names: tuple, values: tuple, extra: str = "") -> str:
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+def _escape(value) -> str:
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+class Counter:
+    def __init__(self, name: str, help: str, labels: tuple = ()):
+        self.name = name
+        self.help = help
+        self.labels = labels
+        self._values = defaultdict(float)
+
+    def inc(self, *labels, amount: float = 1.0):
+        self._values[labels] += amount
+
+    def render(self) -> list:
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} counter"]
+        lines.extend(f"{self.name}{_labels(self.labels, key)} {value}" for key, value in self._values.items())
+        return lines
+
+class Histogram:
+    def __init__(self, name: str, help: str, labels: tuple = (), buckets: tuple = BUCKETS):
+        self.name = name
+        self.help = help
+        self.labels = labels
+        self.buckets = buckets
+        # labels -> [count per bucket..., +Inf count, sum]
+        self._values = {}
+
+    def observe(self, value: float, *labels):
+        series = self._values.get(labels)
+        if series is None:
+            series = self._values[labels] = [0] * (len(self.buckets) + 1) + [0.0]
+        for index, bound in enumerate(self.buckets):
+            if value <= bound:
+                series[index] += 1
+        series[-2] += 1
+        series[-1] += value
+
+    def render(self) -> list:
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} histogram"]
+        for key, series in self._values.items():
+            for bound, count in zip((*self.buckets, "+Inf"), series):
+                le = 'le="%s"' % bound
+                lines.append(f"{self.name}_bucket{_labels(self.labels, key, le)} {count}")
+            lines.append(f"{self.name}_sum{_labels(self.labels, key)} {series[-1]}")
+            lines.append(f"{self.name}_count{_labels(self.labels, key)} {series[-2]}")
+        return lines
+
+def snapshot(name: str, help: str, values: dict, labels: tuple = (), kind: str = "gauge") -> list:
+    """Renders values read at scrape time from another module's stats; values maps label tuples to numbers."""
+    lines = [f"# HELP {name} {help}", f"# TYPE {name} {kind}"]
+    lines.extend(f"{name}{_labels(labels, key)} {value}" for key, value in values.items() if value is not None)
+    return lines
+
+# === Request Metrics ===
+
+REQUESTS = Counter("hris_http_requests_total", "HTTP requests by route and status.", ("method", "route", "status"))
+LATENCY = Histogram("hris_http_request_duration_seconds", "Time from request to last response byte.", ("method", "route"))
+DB_TIME = Histogram("hris_db_time_seconds", "Time per request spent executing SQL.", ("method", "route"))
+DB_QUERIES = Histogram(
+    "hris_db_queries_per_request", "SQL statements executed per request.", ("method", "route"),
+    buckets=(0, 1, 2, 3, 5, 10, 20, 50, 100),
+)
+HASHING_TIME = Counter("hris_hashing_seconds_total", "Time requests spent waiting on bcrypt.", ("method", "route"))
+RENDER_TIME = Counter("hris_serialization_seconds_total", "Time spent rendering JSON responses.", ("method", "route"))
+SLOW_REQUESTS = Counter("hris_slow_requests_total", "Requests over SLOW_REQUEST_MS.", ("method", "route"))
+STATEMENTS = Counter("hris_db_statements_total", "SQL statements on each engine, inside requests or not.", ("engine",))
+
+REQUEST_METRICS = (REQUESTS, LATENCY, DB_TIME, DB_QUERIES, HASHING_TIME, RENDER_TIME, SLOW_REQUESTS, STATEMENTS)
+
+class RequestStats:
+    __slots__ = ("queries", "db_seconds", "times", "statements")
+
+    def __init__(self, keep_statements: bool):
+        self.queries = 0
+        self.db_seconds = 0.0
+        self.times = defaultdict(float)
+        # (milliseconds, SQL) when the slow-request log is on
+        self.statements = [] if keep_statements else None
+
+_current: ContextVar = ContextVar("request_stats", default=None)
+
+def add_time(kind: str, seconds: float):
+    stats = _current.get()
+    if stats is not None:
+        stats.times[kind] += seconds
+
+@contextmanager
+def timed(kind: str):
+    """Charges the wall time of the block to the current request under kind."""
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        add_time(kind, time.perf_counter() - started)
+
+class TimedORJSONResponse(ORJSONResponse):
+    """ORJSONResponse that reports its rendering time as serialization."""
+
+    def render(self, content) -> bytes:
+        with timed("serialization"):
+            return super().render(content)
+
+# === SQL Timing ===
+
+@on_engine_created
+def _track_statements(name: str, target):
+    @event.listens_for(target.sync_engine, "before_cursor_execute")
+    def _before(conn, cursor, statement, parameters, context, executemany):
+        if context is not None:
+            context._metrics_started = time.perf_counter()
+
+    @event.listens_for(target.sync_engine, "after_cursor_execute")
+    def _after(conn, cursor, statement, parameters, context, executemany):
+        STATEMENTS.inc(name)
+        stats = _current.get()
+        started = getattr(context, "_metrics_started", None)
+        if stats is None or started is None:
+            return
+        elapsed = time.perf_counter() - started
+        stats.queries += 1
+        stats.db_seconds += elapsed
+        if stats.statements is not None and len(stats.statements) < settings.SLOW_REQUEST_MAX_STATEMENTS:
+            stats.statements.append((elapsed * 1000, statement))
+
+# === Middleware ===
+
+class MetricsMiddleware:
+    """Times each HTTP request and records it under its route template."""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or not settings.METRICS_ENABLED:
+            await self.app(scope, receive, send)
+            return
+
+        stats = RequestStats(keep_statements=settings.SLOW_REQUEST_MS > 0)
+        token = _current.set(stats)
+        status = [500]
+
+        async def send_wrapper(message):
+            if message["type"] == "http.response.start":
+                status[0] = message["status"]
+            await send(message)
+
+        started = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            _current.reset(token)
+            self._record(scope, status[0], time.perf_counter() - started, stats)
+
+    def _record(self, scope, status: int, elapsed: float, stats: RequestStats):
+        route = scope.get("route")
+        # Unmatched paths share one label so scanners cannot add series
+        path = getattr(route, "path", "unmatched")
+        method = scope["method"]
+
+        REQUESTS.inc(method, path, status)
+        LATENCY.observe(elapsed, method, path)
+        DB_TIME.observe(stats.db_seconds, method, path)
+        DB_QUERIES.observe(stats.queries, method, path)
+        if stats.times["hashing"]:
+            HASHING_TIME.inc(method, path, amount=stats.times["hashing"])
+        if stats.times["serialization"]:
+            RENDER_TIME.inc(method, path, amount=stats.times["serialization"])
+
+        if settings.SLOW_REQUEST_MS and elapsed * 1000 >= settings.SLOW_REQUEST_MS:
+            SLOW_REQUESTS.inc(method, path)
+            lines = [
+                f"{method} {scope['path']} -> {status} in {elapsed * 1000:.1f} ms: "
+                f"{stats.queries} queries, {stats.db_seconds * 1000:.1f} ms in the database, "
+                f"{stats.times['hashing'] * 1000:.1f} ms hashing, {stats.times['serialization'] * 1000:.1f} ms rendering"
+            ]
+            lines.extend(f"  {ms:8.2f} ms  {' '.join(sql.split())}" for ms, sql in stats.statements)
+            if stats.queries > len(stats.statements):
+                lines.append(f"  ... {stats.queries - len(stats.statements)} more")
+            slow_requests.warning("\n".join(lines))
+
+def render(extra: list = ()) -> str:
+    """All request metrics plus any snapshot() lines, as Prometheus text."""
+    lines = [line for metric in REQUEST_METRICS for line in metric.render()]
+    lines.extend(extra)
+    return "\n".join(lines) + "\n"
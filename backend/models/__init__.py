@@ -1,6 +1,6 @@
 from pydantic import BaseModel, Field
-from datetime import date
-from typing import Optional
+from datetime import date, datetime
+from typing import Any, Dict, Generic, List, Literal, Optional, TypeVar
 
 class Person(BaseModel):
     personId: Optional[int] = Field(None, description="Unique identifier for the person")
@@ -54,4 +54,368 @@ class ExternalRequest(BaseModel):
 
 class EmployeeProject(BaseModel):
     employeeId: int = Field(..., gt=0, description="Reference to the employee")
-    projectId: int = Field(..., gt=0, description="Reference to the project")
\ No newline at end of file
+    projectId: int = Field(..., gt=0, description="Reference to the project")
+
+# === Batch Decisions ===
+
+# Items accepted per batch call; bounds the size of the IN (...) lists
+BATCH_DECISION_LIMIT = 1000
+
+class LeaveDecision(BaseModel):
+    requestId: int = Field(..., gt=0, description="Leave request to decide")
+    status: Literal["approved", "denied"] = Field(..., description="Decision for the request")
+
+class LeaveDecisionBatch(BaseModel):
+    decisions: List[LeaveDecision] = Field(..., min_length=1, max_length=BATCH_DECISION_LIMIT)
+
+class ExternalResponseItem(BaseModel):
+    requestId: int = Field(..., gt=0, description="External request to answer")
+    response: str = Field(..., min_length=1, max_length=500, description="HR response to the request")
+
+class ExternalResponseBatch(BaseModel):
+    responses: List[ExternalResponseItem] = Field(..., min_length=1, max_length=BATCH_DECISION_LIMIT)
+
+# === Staffing ===
+
+# Ids per staffing call; keeps the IN lists and the multi-row INSERT within
+# the drivers' bound-parameter limits
+STAFFING_LIMIT = 5000
+
+class StaffingChange(BaseModel):
+    assign: List[int] = Field(default_factory=list, max_length=STAFFING_LIMIT, description="Ids to assign")
+    unassign: List[int] = Field(default_factory=list, max_length=STAFFING_LIMIT, description="Ids to unassign")
+    replace: bool = Field(False, description="Also unassign everything not listed in assign")
+
+# === Offboarding ===
+
+# Ids accepted per purge job
+PURGE_LIMIT = 10000
+
+class EmployeePurge(BaseModel):
+    employeeIds: Optional[List[int]] = Field(None, max_length=PURGE_LIMIT, description="Archived employees to purge")
+    archivedBefore: Optional[datetime] = Field(None, description="Purge employees archived before this time")
+
+# === Permission Grants ===
+
+class RolePermissionGrant(BaseModel):
+    permissions: List[str] = Field(..., max_length=200, description="Every permission the role should grant; replaces the current set")
+
+# === Response Schemas ===
+# Read-side views of the ORM rows. Routes declare these as response models so
+# only the listed columns are queried and serialized; none expose a password.
+
+T = TypeVar("T")
+
+class Page(BaseModel, Generic[T]):
+    items: List[T] = Field(..., description="Items on this page")
+    next_cursor: Optional[int] = Field(None, description="Pass as 'after' to fetch the next page")
+
+class EmployeeOut(BaseModel):
+    personId: int
+    firstName: str
+    lastName: str
+    email: str
+    roleId: int
+    hireDate: date
+    qualifications: str
+    archivedAt: Optional[datetime] = None
+
+    class Config:
+        from_attributes = True
+
+class RoleOut(BaseModel):
+    roleId: int
+    roleName: str
+
+    class Config:
+        from_attributes = True
+
+class ProjectOut(BaseModel):
+    projectId: int
+    projectName: str
+    description: str
+    hrEmployeeId: Optional[int] = None
+
+    class Config:
+        from_attributes = True
+
+class LeaveRequestOut(BaseModel):
+    requestId: int
+    employeeId: int
+    hrEmployeeId: Optional[int] = None
+    startDate: date
+    endDate: date
+    requestType: str
+    status: str
+    reason: Optional[str] = None
+
+    class Config:
+        from_attributes = True
+
+class ExternalRequestOut(BaseModel):
+    requestId: int
+    userId: int
+    projectId: int
+    hrEmployeeId: Optional[int] = None
+    description: str
+    status: str
+    response: Optional[str] = None
+
+    class Config:
+        from_attributes = True
+
+class AbsenceOut(BaseModel):
+    requestId: int
+    employeeId: int
+    firstName: str
+    lastName: str
+    startDate: date
+    endDate: date
+    requestType: str
+    status: str
+
+    class Config:
+        from_attributes = True
+
+class LeaveBalance(BaseModel):
+    employeeId: int
+    year: int
+    annual_allowance: int = Field(..., description="Annual leave working days per year")
+    annual_taken: int = Field(..., description="Approved annual leave working days")
+    annual_pending: int = Field(..., description="Annual leave working days awaiting a decision")
+    annual_remaining: int
+    taken_by_type: Dict[str, int]
+    pending_by_type: Dict[str, int]
+
+class RoleMessage(BaseModel):
+    message: str
+    role: RoleOut
+
+class ProjectMessage(BaseModel):
+    message: str
+    project: ProjectOut
+
+class LeaveRequestMessage(BaseModel):
+    message: str
+    request: LeaveRequestOut
+
+class ExternalRequestMessage(BaseModel):
+    message: str
+    request: ExternalRequestOut
+
+class PersonalInfo(BaseModel):
+    firstName: str
+    lastName: str
+    email: str
+    hireDate: date
+    qualifications: str
+    role: Optional[str] = None
+
+class DashboardUser(BaseModel):
+    name: str
+    email: str
+
+class EmployeeDashboard(BaseModel):
+    user: DashboardUser
+    assigned_projects: List[ProjectOut]
+
+class HRDashboardSummary(BaseModel):
+    pending_leave_requests: int
+    pending_external_requests: int
+    unassigned_external_requests: int
+    upcoming_absences: int
+    project_headcounts: Dict[int, int]
+
+class HRDashboard(BaseModel):
+    user: DashboardUser
+    summary: HRDashboardSummary
+    assigned_projects: Page[ProjectOut]
+    incoming_requests: Page[ExternalRequestOut]
+
+class ExternalDashboardSummary(BaseModel):
+    pending_requests: int
+
+class ExternalDashboard(BaseModel):
+    user: DashboardUser
+    summary: ExternalDashboardSummary
+    projects: Page[ProjectOut]
+    my_requests: Page[ExternalRequestOut]
+
+class RequestStatusMessage(BaseModel):
+    message: str
+    request_id: int
+
+class RoleDeleted(BaseModel):
+    message: str
+    role_id: int
+
+class StaffingResult(BaseModel):
+    assigned: List[int] = Field(..., description="Ids newly assigned")
+    unassigned: List[int] = Field(..., description="Ids no longer assigned")
+
+class ProjectMember(BaseModel):
+    personId: int
+    firstName: str
+    lastName: str
+    email: str
+    roleId: int
+    roleName: str
+
+    class Config:
+        from_attributes = True
+
+class ProjectRoster(BaseModel):
+    project_id: int
+    members: List[ProjectMember]
+
+class PermissionOut(BaseModel):
+    permissionId: int
+    name: str
+    description: Optional[str] = None
+
+    class Config:
+        from_attributes = True
+
+class RolePermissions(BaseModel):
+    role_id: int
+    permissions: List[str] = Field(..., description="Granted on top of the employee type's own permissions")
+
+class ProjectDeleted(BaseModel):
+    message: str
+    project_id: int
+
+class ImportedEmployee(BaseModel):
+    personId: int
+    email: str
+
+class ImportRowError(BaseModel):
+    row: int = Field(..., description="Zero-based position of the record in the upload")
+    email: Optional[str] = None
+    errors: List[str]
+
+class ImportResult(BaseModel):
+    created: int
+    failed: int
+    employees: List[ImportedEmployee]
+    errors: List[ImportRowError]
+
+class Registered(BaseModel):
+    message: str
+    user_id: int
+
+class Token(BaseModel):
+    access_token: str
+    token_type: str
+
+class BatchOutcome(BaseModel):
+    requestId: int
+    outcome: str = Field(..., description="The new status, or 'not_found' / 'not_pending' if the request was left unchanged")
+
+class BatchResult(BaseModel):
+    updated: int
+    results: List[BatchOutcome]
+
+class PersonHit(BaseModel):
+    personId: int
+    firstName: str
+    lastName: str
+    email: str
+    type: str = Field(..., description="employee, hr_employee or external_user")
+
+    class Config:
+        from_attributes = True
+
+class SearchResults(BaseModel):
+    people: List[PersonHit] = []
+    projects: List[ProjectOut] = []
+    requests: List[ExternalRequestOut] = []
+
+# === System Metrics ===
+
+class HashingStats(BaseModel):
+    workers: int
+    queue_limit: int
+    in_flight: int
+    queue_depth: int
+    completed: int
+    failed: int
+    rejected: int
+    latency_avg_ms: float
+    latency_max_ms: float
+
+class PrincipalCacheStats(BaseModel):
+    size: int
+    maxsize: int
+    ttl_seconds: float
+    hits: int
+    misses: int
+    hit_ratio: float
+    evictions: int
+    invalidations: int
+
+class EnginePoolStats(BaseModel):
+    pool: str
+    size: Optional[int] = None
+    checked_out: Optional[int] = None
+    idle: Optional[int] = None
+    overflow: Optional[int] = None
+    max_overflow: Optional[int] = None
+    connects: int
+    checkouts: int
+    invalidations: int
+
+class ResponseCacheStats(BaseModel):
+    backend: str
+    size: Optional[int] = None
+    ttl_seconds: float
+    hits: int
+    misses: int
+    hit_ratio: float
+    not_modified: int
+    invalidations: int
+
+class JobQueueStats(BaseModel):
+    workers: int
+    durable: bool
+    queued: int
+    running: int
+    completed: int
+    failed: int
+    retried: int
+
+class AuditLogStats(BaseModel):
+    buffered: int
+    written: int
+    flushes: int
+    dropped: int
+    errors: int
+
+# === Background Jobs ===
+
+class JobQueued(BaseModel):
+    job_id: str
+    status: str
+
+class JobStatus(BaseModel):
+    job_id: str
+    name: str
+    status: str
+    attempts: int
+    error: Optional[str] = None
+    result: Optional[Any] = None
+    created_at: datetime
+    finished_at: Optional[datetime] = None
+
+# === Audit Log ===
+
+class AuditEntryOut(BaseModel):
+    auditId: int
+    entityType: str
+    entityId: str
+    action: str
+    changes: Dict[str, List[Any]]
+    actor: Optional[str] = None
+    createdAt: datetime
+
+    class Config:
+        from_attributes = True
@@ -0,0 +1,178 @@
+import hashlib
+import time
+from collections import OrderedDict
+from typing import Awaitable, Callable, Iterable, Optional
+
+import orjson
+from fastapi import Request, Response
+from pydantic import BaseModel
+
+from config.settings import settings
+
+# === Backends ===
+
+class LocalCacheBackend:
+    """In-process LRU with per-entry TTL; also the fake used when testing.
+
+    Tag versions are kept outside the LRU so an eviction can never roll a
+    tag back to an older version and resurrect stale entries.
+    """
+
+    def __init__(self, maxsize: int):
+        self.maxsize = maxsize
+        self._entries = OrderedDict()
+        self._versions = {}
+
+    async def get(self, key: str) -> Optional[bytes]:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        expires_at, value = entry
+        if expires_at <= time.time():
+            del self._entries[key]
+            return None
+        self._entries.move_to_end(key)
+        return value
+
+    async def set(self, key: str, value: bytes, ttl: float):
+        if self.maxsize <= 0:
+            return
+        self._entries[key] = (time.time() + ttl, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+
+    async def versions(self, tags: list) -> list:
+        return [self._versions.get(tag, 0) for tag in tags]
+
+    async def bump(self, tag: str):
+        self._versions[tag] = self._versions.get(tag, 0) + 1
+
+    async def clear(self):
+        self._entries.clear()
+        self._versions.clear()
+
+    def size(self) -> int:
+        return len(self._entries)
+
+class RedisCacheBackend:
+    """Shared backend so an invalidation on one worker is seen by all of them."""
+
+    def __init__(self, url: str, prefix: str = "hris:"):
+        try:
+            import redis.asyncio as redis
+        except ImportError as exc:
+            raise RuntimeError("RESPONSE_CACHE_URL needs the 'redis' package installed") from exc
+        self._client = redis.from_url(url)
+        self._prefix = prefix
+
+    async def get(self, key: str) -> Optional[bytes]:
+        return await self._client.get(self._prefix + key)
+
+    async def set(self, key: str, value: bytes, ttl: float):
+        await self._client.set(self._prefix + key, value, ex=max(1, int(ttl)))
+
+    async def versions(self, tags: list) -> list:
+        values = await self._client.mget([f"{self._prefix}tag:{tag}" for tag in tags])
+        return [int(value or 0) for value in values]
+
+    async def bump(self, tag: str):
+        await self._client.incr(f"{self._prefix}tag:{tag}")
+
+    async def clear(self):
+        keys = [key async for key in self._client.scan_iter(f"{self._prefix}*")]
+        if keys:
+            await self._client.delete(*keys)
+
+    def size(self) -> Optional[int]:
+        return None
+
+def make_backend(url: str):
+    if url.startswith(("redis://", "rediss://", "unix://")):
+        return RedisCacheBackend(url)
+    return LocalCacheBackend(settings.RESPONSE_CACHE_SIZE)
+
+# === Response Cache ===
+
+def _etag(body: bytes) -> str:
+    return '"' + hashlib.sha1(body).hexdigest() + '"'
+
+def _matches(if_none_match: Optional[str], etag: str) -> bool:
+    if not if_none_match:
+        return False
+    candidates = [value.strip() for value in if_none_match.split(",")]
+    return "*" in candidates or etag in (value.removeprefix("W/") for value in candidates)
+
+class ResponseCache:
+    """Caches encoded JSON for read endpoints whose data rarely changes.
+
+    Every entry is stored under the current versions of its tags; mutating
+    handlers bump a tag, which orphans the old entries until they expire.
+    """
+
+    def __init__(self, backend, ttl: float):
+        self.backend = backend
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self.not_modified = 0
+        self.invalidations = 0
+
+    async def _load(self, key: str, tags: Iterable[str], load: Callable[[], Awaitable[BaseModel]]) -> tuple:
+        tags = sorted(tags)
+        versions = await self.backend.versions(tags)
+        full_key = key + "|" + ",".join(f"{tag}:{version}" for tag, version in zip(tags, versions))
+
+        cached = await self.backend.get(full_key)
+        if cached is not None:
+            self.hits += 1
+            etag, body = cached.split(b"\n", 1)
+            return etag.decode(), body
+
+        self.misses += 1
+        body = (await load()).model_dump_json().encode()
+        etag = _etag(body)
+        await self.backend.set(full_key, etag.encode() + b"\n" + body, self.ttl)
+        return etag, body
+
+    async def respond(self, request: Request, tags: Iterable[str], load: Callable[[], Awaitable[BaseModel]]) -> Response:
+        """Serves the endpoint's JSON from cache, or a 304 when the client's ETag still matches.
+
+        load() runs only on a miss and returns the endpoint's response model.
+        """
+        key = request.url.path + "?" + "&".join(sorted(f"{k}={v}" for k, v in request.query_params.multi_items()))
+        etag, body = await self._load(key, tags, load)
+
+        headers = {"ETag": etag, "Cache-Control": "private, no-cache"}
+        if _matches(request.headers.get("if-none-match"), etag):
+            self.not_modified += 1
+            return Response(status_code=304, headers=headers)
+        return Response(content=body, media_type="application/json", headers=headers)
+
+    async def get_json(self, key: str, tags: Iterable[str], load: Callable[[], Awaitable[BaseModel]]):
+        """Cached data for embedding in a larger, uncached response."""
+        _, body = await self._load(key, tags, load)
+        return orjson.loads(body)
+
+    async def invalidate(self, *tags: str):
+        for tag in tags:
+            await self.backend.bump(tag)
+            self.invalidations += 1
+
+    async def clear(self):
+        await self.backend.clear()
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.misses
+        return {
+            "backend": type(self.backend).__name__,
+            "size": self.backend.size(),
+            "ttl_seconds": self.ttl,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": round(self.hits / lookups, 4) if lookups else 0.0,
+            "not_modified": self.not_modified,
+            "invalidations": self.invalidations,
+        }
+
+response_cache = ResponseCache(make_backend(settings.RESPONSE_CACHE_URL), settings.RESPONSE_CACHE_TTL)
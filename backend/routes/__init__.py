@@ -1,10 +1,5 @@
-from .employee_routes import router as employees
-from .hr_routes import router as hr
-from .external_routes import router as external
-from .leave_routes import router as leave
-from .project_routes import router as project
-from .role_routes import router as role
-
+# Each module exports a router; backend/application.py imports the ones an
+# app includes, so importing one router does not import the others.
 __all__ = [
     "employee_routes",
     "hr_routes",
@@ -12,4 +7,10 @@ __all__ = [
     "leave_routes",
     "project_routes",
     "role_routes",
-]
\ No newline at end of file
+    "system_routes",
+    "export_routes",
+    "search_routes",
+    "audit_routes",
+    "metrics_routes",
+    "auth_routes",
+]
@@ -0,0 +1,40 @@
+from fastapi import APIRouter, Depends, Path
+from typing import Optional
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from backend.auth.dependencies import get_current_user, check_permission, CurrentUserContext
+from ..database import get_read_db
+from ..database.audit import audit_log
+from ..database.pagination import PageParams, columns_for, paginate
+from backend.database.models import AuditEntry
+from backend.database.query_budget import query_budget, unbudgeted
+from backend.models import AuditEntryOut, Page
+
+router = APIRouter(prefix="/audit", tags=["Audit"])
+
+# HR: Change history of one row, oldest first
+@router.get("/{entity_type}/{entity_id}", response_model=Page[AuditEntryOut])
+@query_budget(2)
+async def get_entity_history(
+    entity_type: str = Path(..., description="Table name, e.g. employees, leave_requests, projects, roles"),
+    entity_id: str = Path(..., description="Primary key; employeeId:projectId for employee_projects"),
+    action: Optional[str] = None,
+    page: PageParams = Depends(),
+    current: CurrentUserContext = Depends(get_current_user),
+    db: AsyncSession = Depends(get_read_db)
+):
+    check_permission(current, "view_audit_log")
+
+    # Entries committed a moment ago may still be buffered in this process,
+    # and once written they are on the primary before any replica. Writing
+    # the buffer is process-wide work, not this request's queries.
+    with unbudgeted():
+        await audit_log.flush()
+    db.info["primary"] = True
+
+    stmt = select(*columns_for(AuditEntry, AuditEntryOut)).where(
+        AuditEntry.entityType == entity_type, AuditEntry.entityId == entity_id
+    )
+    if action is not None:
+        stmt = stmt.where(AuditEntry.action == action)
+    return await paginate(db, stmt, AuditEntry.auditId, page)
@@ -0,0 +1,64 @@
+from fastapi import APIRouter, Depends, HTTPException
+from fastapi.security import OAuth2PasswordRequestForm
+from datetime import timedelta
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from backend.auth.dependencies import ACCESS_TOKEN_EXPIRE_MINUTES, create_access_token
+from backend.auth.security import hash_password_async, verify_password_async
+from ..database import get_db, mark_write
+from backend.database.identity import resolve_identity, role_for
+from backend.database.models import ExternalUser, HREmployee, Person
+from backend.database.query_budget import query_budget
+from backend.jobs import enqueue
+from backend.models import Registered, Token
+from backend.tasks import welcome
+
+router = APIRouter()
+
+# === Register Endpoint ===
+
+@router.post("/register", response_model=Registered, tags=["User Management"])
+@query_budget(4)  # including the welcome job's row under JOB_DURABLE
+async def register(firstName: str, lastName: str, email: str, password: str, db: AsyncSession = Depends(get_db)):
+    existing_user = await db.scalar(select(Person).where(Person.email == email))
+    if existing_user:
+        raise HTTPException(status_code=400, detail="Email already registered")
+
+    hashed_pwd = await hash_password_async(password)
+
+    if email.endswith("@company.ba"):
+        user = HREmployee(firstName=firstName, lastName=lastName, email=email, password=hashed_pwd, department="HR" if "hr" in email.lower() else "Default")
+    else:
+        user = ExternalUser(
+            firstName=firstName,
+            lastName=lastName,
+            email=email,
+            password=hashed_pwd,
+            username=email.split("@")[0]
+        )
+
+    db.add(user)
+    await db.flush()
+    enqueue(db, "notify", messages=[welcome(user)])
+    await db.commit()
+    mark_write(email)
+    return {"message": "User registered successfully", "user_id": user.personId}
+
+# === Login Endpoint ===
+
+@router.post("/login", response_model=Token, tags=["Authentication"])
+@query_budget(1)
+async def login(form_data: OAuth2PasswordRequestForm = Depends(), db: AsyncSession = Depends(get_db)):
+    email = form_data.username
+    password = form_data.password
+
+    user = await resolve_identity(db, email)
+    role = role_for(user) if user else None
+
+    if not role or not await verify_password_async(password, user.password):
+        raise HTTPException(status_code=400, detail="Incorrect email or password")
+
+    access_token_expires = timedelta(minutes=ACCESS_TOKEN_EXPIRE_MINUTES)
+    access_token = create_access_token(data={"sub": email, "role": role}, expires_delta=access_token_expires)
+
+    return {"access_token": access_token, "token_type": "bearer"}
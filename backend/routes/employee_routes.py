@@ -1,20 +1,28 @@
-from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy.orm import Session
-from backend import get_current_user, check_permission, CurrentUserContext
-from backend.database import get_db
-from backend.database.models import ExternalRequest, Project, Employee
+from fastapi import APIRouter, Depends
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from backend.auth.dependencies import get_current_user, check_permission, CurrentUserContext
+from backend.database import get_read_db
+from backend.database.models import EmployeeProject, Project, Role
+from backend.database.pagination import columns_for
+from backend.database.query_budget import query_budget
+from backend.models import EmployeeDashboard, PersonalInfo, ProjectOut
 
 router = APIRouter(prefix="/employee", tags=["Employee"])
 
-@router.get("/dashboard")
+@router.get("/dashboard", response_model=EmployeeDashboard)
+@query_budget(2)
 async def employee_dashboard(
     current: CurrentUserContext = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_read_db)
 ):
-    if current.role != "employee":
-        raise HTTPException(status_code=403, detail="Not authorized")
+    check_permission(current, "view_employee_dashboard")
 
-    assigned_projects = [ep.project for ep in current.user.projects]
+    assigned_projects = (await db.execute(
+        select(*columns_for(Project, ProjectOut))
+        .join(EmployeeProject, EmployeeProject.projectId == Project.projectId)
+        .where(EmployeeProject.employeeId == current.user.personId)
+    )).all()
 
     return {
         "user": {
@@ -24,17 +32,20 @@ async def employee_dashboard(
         "assigned_projects": assigned_projects
     }
 
-@router.get("/me")
+@router.get("/me", response_model=PersonalInfo)
+@query_budget(2)
 async def view_personal_info(
-    current: CurrentUserContext = Depends(get_current_user)
+    current: CurrentUserContext = Depends(get_current_user),
+    db: AsyncSession = Depends(get_read_db)
 ):
     check_permission(current, "view_personal_info")
 
+    role_name = await db.scalar(select(Role.roleName).where(Role.roleId == current.user.roleId))
     return {
         "firstName": current.user.firstName,
         "lastName": current.user.lastName,
         "email": current.user.email,
         "hireDate": current.user.hireDate,
         "qualifications": current.user.qualifications,
-        "role": current.user.role.roleName if current.user.role else None
+        "role": role_name
     }
@@ -0,0 +1,101 @@
+import csv
+import io
+import json
+
+from fastapi import APIRouter, Depends, Query
+from fastapi.responses import StreamingResponse
+from sqlalchemy import select
+from backend.auth.dependencies import get_current_user, check_permission, CurrentUserContext
+from backend.database import ReadSessionLocal
+from backend.database.models import Employee, LeaveRequest, ExternalRequest, Project
+from backend.database.query_budget import query_budget
+
+router = APIRouter(prefix="/export", tags=["Export"])
+
+# Rows fetched per server-side cursor round trip
+EXPORT_BATCH_SIZE = 1000
+
+MEDIA_TYPES = {"ndjson": "application/x-ndjson", "csv": "text/csv"}
+
+def require_export(current: CurrentUserContext = Depends(get_current_user)) -> CurrentUserContext:
+    check_permission(current, "export_data")
+    return current
+
+async def _iter_rows(stmt, fmt: str):
+    # The generator owns its session: the request's dependencies may be torn
+    # down before the response body has finished streaming.
+    async with ReadSessionLocal() as db:
+        result = await db.stream(stmt.execution_options(yield_per=EXPORT_BATCH_SIZE))
+        columns = list(result.keys())
+
+        if fmt == "csv":
+            buffer = io.StringIO()
+            writer = csv.writer(buffer)
+            writer.writerow(columns)
+            yield buffer.getvalue()
+
+        async for batch in result.partitions():
+            if fmt == "csv":
+                buffer.seek(0)
+                buffer.truncate()
+                writer.writerows(batch)
+                yield buffer.getvalue()
+            else:
+                yield "".join(json.dumps(dict(zip(columns, row)), default=str) + "\n" for row in batch)
+
+def _export(stmt, name: str, fmt: str) -> StreamingResponse:
+    # Column projections only: plain rows never enter the identity map, so
+    # memory stays flat regardless of table size.
+    return StreamingResponse(
+        _iter_rows(stmt, fmt),
+        media_type=MEDIA_TYPES[fmt],
+        headers={"Content-Disposition": f'attachment; filename="{name}.{fmt}"'},
+    )
+
+FormatQuery = Query("ndjson", pattern="^(ndjson|csv)$", description="ndjson or csv")
+
+# The budgets cover the principal lookup. An export's one streamed SELECT
+# runs once the response has started, after the budget check.
+
+@router.get("/employees")
+@query_budget(1)
+async def export_employees(
+    format: str = FormatQuery,
+    includeArchived: bool = False,
+    current: CurrentUserContext = Depends(require_export),
+):
+    stmt = select(
+        Employee.personId, Employee.firstName, Employee.lastName, Employee.email,
+        Employee.roleId, Employee.hireDate, Employee.qualifications, Employee.archivedAt,
+    ).order_by(Employee.personId)
+    if not includeArchived:
+        stmt = stmt.where(Employee.archivedAt.is_(None))
+    return _export(stmt, "employees", format)
+
+@router.get("/leave-requests")
+@query_budget(1)
+async def export_leave_requests(format: str = FormatQuery, current: CurrentUserContext = Depends(require_export)):
+    stmt = select(
+        LeaveRequest.requestId, LeaveRequest.employeeId, LeaveRequest.hrEmployeeId,
+        LeaveRequest.startDate, LeaveRequest.endDate, LeaveRequest.requestType,
+        LeaveRequest.status, LeaveRequest.reason,
+    ).order_by(LeaveRequest.requestId)
+    return _export(stmt, "leave_requests", format)
+
+@router.get("/external-requests")
+@query_budget(1)
+async def export_external_requests(format: str = FormatQuery, current: CurrentUserContext = Depends(require_export)):
+    stmt = select(
+        ExternalRequest.requestId, ExternalRequest.userId, ExternalRequest.projectId,
+        ExternalRequest.hrEmployeeId, ExternalRequest.description,
+        ExternalRequest.status, ExternalRequest.response,
+    ).order_by(ExternalRequest.requestId)
+    return _export(stmt, "external_requests", format)
+
+@router.get("/projects")
+@query_budget(1)
+async def export_projects(format: str = FormatQuery, current: CurrentUserContext = Depends(require_export)):
+    stmt = select(
+        Project.projectId, Project.projectName, Project.description, Project.hrEmployeeId,
+    ).order_by(Project.projectId)
+    return _export(stmt, "projects", format)
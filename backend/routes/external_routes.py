@@ -1,61 +1,103 @@
-from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy.orm import Session
-from backend import get_current_user, check_permission, CurrentUserContext
-from ..database import get_db
+from fastapi import APIRouter, Depends, HTTPException, Query
+from typing import Optional
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from backend.auth.dependencies import get_current_user, check_permission, CurrentUserContext
+from ..database import get_db, get_read_db
+from ..database.pagination import PageParams, columns_for, paginate
+from backend.database import dashboard_store
 from backend.database.models import ExternalRequest, Project
+from backend.database.query_budget import query_budget
+from backend.models import ExternalDashboard, ExternalRequestMessage, ExternalRequestOut, Page, ProjectOut
+from backend.response_cache import response_cache
 
 router = APIRouter(prefix="/external", tags=["External User"])
 
 # External User Dashboard
-@router.get("/dashboard")
+@router.get("/dashboard", response_model=ExternalDashboard)
+@query_budget(4)
 async def external_user_dashboard(
+    page: PageParams = Depends(),
+    requestsAfter: Optional[int] = Query(None, description="Cursor for the requests list, from its next_cursor"),
     current: CurrentUserContext = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_read_db)
 ):
-    if current.role != "external":
-        raise HTTPException(status_code=403, detail="Not authorized")
+    check_permission(current, "view_external_dashboard")
 
-    projects = db.query(Project).all()
-    requests = db.query(ExternalRequest).filter(ExternalRequest.userId == current.user.personId).all()
+    async def load_projects():
+        return Page[ProjectOut].model_validate(
+            await paginate(db, select(*columns_for(Project, ProjectOut)), Project.projectId, page)
+        )
+
+    projects = await response_cache.get_json(
+        f"external-dashboard-projects?limit={page.limit}&after={page.after}", ["projects"], load_projects
+    )
+    requests = await paginate(
+        db,
+        select(*columns_for(ExternalRequest, ExternalRequestOut)).where(ExternalRequest.userId == current.user.personId),
+        ExternalRequest.requestId,
+        PageParams(limit=page.limit, after=requestsAfter),
+    )
+    pending = dashboard_store.external_pending_user(current.user.personId)
+    counters = await dashboard_store.read(db, [pending])
 
     return {
         "user": {
             "name": f"{current.user.firstName} {current.user.lastName}",
             "email": current.user.email,
         },
+        "summary": {"pending_requests": counters[pending]},
         "projects": projects,
         "my_requests": requests
     }
 
 # External User: View own requests
-@router.get("/requests/me")
+@router.get("/requests/me", response_model=Page[ExternalRequestOut])
+@query_budget(2)
 async def get_external_user_requests(
+    status: Optional[str] = None,
+    projectId: Optional[int] = None,
+    page: PageParams = Depends(),
     current: CurrentUserContext = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_read_db)
 ):
     check_permission(current, "send_request")
-    return db.query(ExternalRequest).filter(ExternalRequest.userId == current.user.personId).all()
+
+    stmt = select(*columns_for(ExternalRequest, ExternalRequestOut)).where(ExternalRequest.userId == current.user.personId)
+    if status is not None:
+        stmt = stmt.where(ExternalRequest.status == status)
+    if projectId is not None:
+        stmt = stmt.where(ExternalRequest.projectId == projectId)
+    return await paginate(db, stmt, ExternalRequest.requestId, page)
 
 # External User: Create a new request
-@router.post("/requests")
+@router.post("/requests", response_model=ExternalRequestMessage)
+@query_budget(5)
 async def create_external_user_request(
     projectId: int,
     description: str,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
     current: CurrentUserContext = Depends(get_current_user)
 ):
     check_permission(current, "send_request")
 
+    project = await db.get(Project, projectId)
+    if not project:
+        raise HTTPException(status_code=404, detail="Project not found")
+
+    # Route the request to the project's HR owner
     new_request = ExternalRequest(
         userId=current.user.personId,
         projectId=projectId,
+        hrEmployeeId=project.hrEmployeeId,
         description=description,
         status="pending"
     )
 
     db.add(new_request)
-    db.commit()
-    db.refresh(new_request)
+    await dashboard_store.bump(db, dashboard_store.external_transition(None, "pending", current.user.personId, project.hrEmployeeId))
+    await db.commit()
+    await db.refresh(new_request)
 
     return {
         "message": "External request submitted successfully.",
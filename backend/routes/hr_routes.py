@@ -1,74 +1,229 @@
-from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy.orm import Session
+import csv
+import io
+from collections import Counter
+
+from fastapi import APIRouter, Depends, HTTPException, Query, Request
+from sqlalchemy.ext.asyncio import AsyncSession
 from datetime import date
+from typing import Optional
 from fastapi import Response, status
 from sqlalchemy.exc import IntegrityError
 
-from backend import get_current_user, check_permission, CurrentUserContext, hash_password
-from backend.database import get_db
-from backend.database.models import Project, ExternalRequest, Employee, Role
-from sqlalchemy import text
+from backend.auth.dependencies import get_current_user, check_permission, CurrentUserContext
+from backend.auth.principal_cache import principal_cache
+from backend.auth.security import hash_password_async
+from backend.database import audit, dashboard_store, get_db, get_read_db
+from backend.database.pagination import PageParams, columns_for, paginate
+from backend.database.query_budget import query_budget
+from backend import employee_offboarding
+from backend.employee_import import import_records
+from backend.jobs import enqueue
+from backend.tasks import external_response_notice, welcome
+from backend.database.models import Project, ExternalRequest, Employee, EmployeeProject, Person
+from backend.models import BatchResult, EmployeeOut, EmployeePurge, ExternalRequestOut, ExternalResponseBatch, HRDashboard, ImportResult, JobQueued, Page, ProjectOut, RequestStatusMessage
+from backend.response_cache import response_cache
+from sqlalchemy import case, select, update
+from config.settings import settings
 
 router = APIRouter(prefix="/hr", tags=["HR"])
 
-@router.get("/dashboard")
+@router.get("/dashboard", response_model=HRDashboard)
+@query_budget(4)
 async def hr_dashboard(
+    page: PageParams = Depends(),
+    requestsAfter: Optional[int] = Query(None, description="Cursor for the requests list, from its next_cursor"),
     current: CurrentUserContext = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_read_db)
 ):
-    if current.role != "hr":
-        raise HTTPException(status_code=403, detail="Not authorized")
+    check_permission(current, "view_hr_dashboard")
 
-    assigned_projects = db.query(Project).filter(Project.hrEmployeeId == current.user.personId).all()
-    external_requests = db.query(ExternalRequest).filter(ExternalRequest.hrEmployeeId == current.user.personId).all()
+    assigned_projects = await paginate(
+        db,
+        select(*columns_for(Project, ProjectOut)).where(Project.hrEmployeeId == current.user.personId),
+        Project.projectId,
+        page,
+    )
+    external_requests = await paginate(
+        db,
+        select(*columns_for(ExternalRequest, ExternalRequestOut)).where(ExternalRequest.hrEmployeeId == current.user.personId),
+        ExternalRequest.requestId,
+        PageParams(limit=page.limit, after=requestsAfter),
+    )
+
+    # Summary figures come from the incrementally maintained counters
+    mine = dashboard_store.external_pending_hr(current.user.personId)
+    unassigned = dashboard_store.external_pending_hr(None)
+    headcounts = {project.projectId: dashboard_store.project_headcount(project.projectId) for project in assigned_projects["items"]}
+    counters = await dashboard_store.read(
+        db,
+        [dashboard_store.LEAVE_PENDING, mine, unassigned, *headcounts.values()],
+        absences_from=date.today(),
+        absences_days=settings.DASHBOARD_ABSENCE_DAYS,
+    )
 
     return {
         "user": {
             "name": f"{current.user.firstName} {current.user.lastName}",
             "email": current.user.email,
         },
+        "summary": {
+            "pending_leave_requests": counters[dashboard_store.LEAVE_PENDING],
+            "pending_external_requests": counters[mine],
+            "unassigned_external_requests": counters[unassigned],
+            "upcoming_absences": counters["upcoming_absences"],
+            "project_headcounts": {project_id: counters[name] for project_id, name in headcounts.items()},
+        },
         "assigned_projects": assigned_projects,
         "incoming_requests": external_requests
     }
 
-@router.get("/external-requests")
+@router.get("/external-requests", response_model=Page[ExternalRequestOut])
+@query_budget(2)
 async def get_all_external_requests(
+    status: Optional[str] = None,
+    userId: Optional[int] = None,
+    projectId: Optional[int] = None,
+    hrEmployeeId: Optional[int] = None,
+    page: PageParams = Depends(),
     current: CurrentUserContext = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_read_db)
 ):
     check_permission(current, "view_all_external_requests")
 
-    return db.query(ExternalRequest).all()
+    stmt = select(*columns_for(ExternalRequest, ExternalRequestOut))
+    if status is not None:
+        stmt = stmt.where(ExternalRequest.status == status)
+    if userId is not None:
+        stmt = stmt.where(ExternalRequest.userId == userId)
+    if projectId is not None:
+        stmt = stmt.where(ExternalRequest.projectId == projectId)
+    if hrEmployeeId is not None:
+        stmt = stmt.where(ExternalRequest.hrEmployeeId == hrEmployeeId)
+    return await paginate(db, stmt, ExternalRequest.requestId, page)
 
-@router.post("/external-requests/{request_id}/respond")
+@router.post("/external-requests/{request_id}/respond", response_model=RequestStatusMessage)
+@query_budget(5)  # including the notification job's row under JOB_DURABLE
 async def respond_to_external_request(
     request_id: int,
     response: str,
     current: CurrentUserContext = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
     check_permission(current, "respond_to_external_requests")
 
-    external_request = db.query(ExternalRequest).filter(ExternalRequest.requestId == request_id).first()
+    # Lock the row so concurrent responses apply their counter deltas one after another
+    external_request = await db.get(ExternalRequest, request_id, with_for_update=True, populate_existing=True)
     if not external_request:
         raise HTTPException(status_code=404, detail="Request not found")
 
+    await dashboard_store.bump(db, dashboard_store.external_transition(
+        external_request.status, "responded", external_request.userId, external_request.hrEmployeeId
+    ))
     external_request.response = response
     external_request.status = "responded"
-    external_request.hrEmployeeId = current.user.personId
+    # A responder outside HR leaves the request with its owner
+    external_request.hrEmployeeId = current.hr_employee_id or external_request.hrEmployeeId
+    enqueue(db, "notify", messages=[external_response_notice(request_id, external_request.userId, response)])
 
-    db.commit()
+    await db.commit()
     return {"message": "Response sent", "request_id": request_id}
 
-@router.get("/employees")
+@router.post("/external-requests/batch-respond", response_model=BatchResult)
+@query_budget(5)  # including the notification job's row under JOB_DURABLE
+async def batch_respond_to_external_requests(
+    batch: ExternalResponseBatch,
+    current: CurrentUserContext = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db)
+):
+    check_permission(current, "respond_to_external_requests")
+
+    responses = {}
+    for item in batch.responses:
+        if responses.setdefault(item.requestId, item.response) != item.response:
+            raise HTTPException(status_code=400, detail=f"Conflicting responses for external request {item.requestId}")
+
+    # Pre-images give the outcome for unknown or answered ids and the
+    # owner / requester the pending counters are keyed on
+    found = {
+        row.requestId: row
+        for row in await db.execute(
+            select(ExternalRequest.requestId, ExternalRequest.status, ExternalRequest.userId, ExternalRequest.hrEmployeeId, ExternalRequest.response)
+            .where(ExternalRequest.requestId.in_(list(responses)))
+            .with_for_update()
+        )
+    }
+    pending = {request_id: response for request_id, response in responses.items()
+               if request_id in found and found[request_id].status == "pending"}
+
+    updated = []
+    changes = Counter()
+    if pending:
+        # A single UPDATE whatever the mix of texts: each row picks its own via CASE
+        values = {"status": "responded", "response": case(pending, value=ExternalRequest.requestId)}
+        if current.hr_employee_id is not None:
+            values["hrEmployeeId"] = current.hr_employee_id
+        updated = (await db.scalars(
+            update(ExternalRequest)
+            .where(ExternalRequest.requestId.in_(list(pending)), ExternalRequest.status == "pending")
+            .values(**values)
+            .returning(ExternalRequest.requestId)
+            .execution_options(synchronize_session=False)
+        )).all()
+        for request_id in updated:
+            row = found[request_id]
+            changes.update(dashboard_store.external_transition("pending", "responded", row.userId, row.hrEmployeeId))
+            audit.record(db, "external_requests", request_id, "update", {
+                "status": ["pending", "responded"],
+                "response": [row.response, pending[request_id]],
+                "hrEmployeeId": [row.hrEmployeeId, current.hr_employee_id or row.hrEmployeeId],
+            })
+        if updated:
+            enqueue(db, "notify", messages=[
+                external_response_notice(request_id, found[request_id].userId, pending[request_id]) for request_id in updated
+            ])
+
+    await dashboard_store.bump(db, changes)
+    await db.commit()
+    done = set(updated)
+    return {
+        "updated": len(done),
+        "results": [
+            {"requestId": request_id, "outcome": "responded" if request_id in done else ("not_pending" if request_id in found else "not_found")}
+            for request_id in responses
+        ],
+    }
+
+@router.get("/employees", response_model=Page[EmployeeOut])
+@query_budget(2)
 async def get_all_employees(
+    roleId: Optional[int] = None,
+    projectId: Optional[int] = None,
+    hiredFrom: Optional[date] = None,
+    hiredTo: Optional[date] = None,
+    includeArchived: bool = False,
+    page: PageParams = Depends(),
     current: CurrentUserContext = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_read_db)
 ):
     check_permission(current, "view_all_employees")
-    return db.query(Employee).all()
 
-@router.post("/employees")
+    stmt = select(*columns_for(Employee, EmployeeOut))
+    if not includeArchived:
+        stmt = stmt.where(Employee.archivedAt.is_(None))
+    if roleId is not None:
+        stmt = stmt.where(Employee.roleId == roleId)
+    if projectId is not None:
+        stmt = stmt.where(Employee.personId.in_(
+            select(EmployeeProject.employeeId).where(EmployeeProject.projectId == projectId)
+        ))
+    if hiredFrom is not None:
+        stmt = stmt.where(Employee.hireDate >= hiredFrom)
+    if hiredTo is not None:
+        stmt = stmt.where(Employee.hireDate <= hiredTo)
+    return await paginate(db, stmt, Employee.personId, page)
+
+@router.post("/employees", response_model=EmployeeOut)
+@query_budget(5)
 async def create_employee(
     firstName: str,
     lastName: str,
@@ -77,18 +232,16 @@ async def create_employee(
     roleId: int,
     hireDate: date,
     qualifications: str,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
     current: CurrentUserContext = Depends(get_current_user)
 ):
     check_permission(current, "create_employee")
 
-    from backend.database.models import Person
-
-    existing = db.query(Person).filter(Person.email == email).first()
+    existing = await db.scalar(select(Person).where(Person.email == email))
     if existing:
         raise HTTPException(status_code=400, detail="Email already exists")
 
-    hashed_pwd = hash_password(password)
+    hashed_pwd = await hash_password_async(password)
     employee = Employee(
         firstName=firstName,
         lastName=lastName,
@@ -99,11 +252,62 @@ async def create_employee(
         qualifications=qualifications
     )
     db.add(employee)
-    db.commit()
-    db.refresh(employee)
+    await db.flush()
+    enqueue(db, "notify", messages=[welcome(employee)])
+    await db.commit()
     return employee
 
-@router.put("/employees/{employee_id}")
+async def _read_import_records(request: Request) -> list:
+    content_type = request.headers.get("content-type", "")
+    if content_type.startswith("application/json"):
+        records = await request.json()
+        if not isinstance(records, list):
+            raise HTTPException(status_code=400, detail="Expected a JSON array of employees")
+        return records
+
+    if content_type.startswith("multipart/form-data"):
+        form = await request.form()
+        upload = form.get("file")
+        if upload is None:
+            raise HTTPException(status_code=400, detail="Missing 'file' field")
+        raw = await upload.read()
+    elif content_type.startswith("text/csv"):
+        raw = await request.body()
+    else:
+        raise HTTPException(status_code=415, detail="Send application/json, text/csv or a multipart CSV file")
+
+    return list(csv.DictReader(io.StringIO(raw.decode("utf-8-sig"))))
+
+@router.post("/employees/import", response_model=ImportResult)
+@query_budget(None)  # two statements per employee_import.IMPORT_BATCH_SIZE rows
+async def import_employees(
+    request: Request,
+    db: AsyncSession = Depends(get_db),
+    current: CurrentUserContext = Depends(get_current_user)
+):
+    check_permission(current, "create_employee")
+
+    records = await _read_import_records(request)
+    try:
+        return await import_records(db, records)
+    except IntegrityError:
+        raise HTTPException(status_code=409, detail="Import conflicted with concurrent changes, nothing was imported")
+
+@router.post("/employees/import-jobs", response_model=JobQueued, status_code=202)
+@query_budget(1)
+async def queue_employee_import(
+    request: Request,
+    current: CurrentUserContext = Depends(get_current_user)
+):
+    """Like /employees/import, but returns at once; poll /system/jobs/{job_id} for the ImportResult."""
+    check_permission(current, "create_employee")
+
+    records = await _read_import_records(request)
+    # Not tied to a transaction, and never stored: the records carry passwords
+    return {"job_id": enqueue(None, "employees.import", records=records, actor=current.user.email), "status": "queued"}
+
+@router.put("/employees/{employee_id}", response_model=EmployeeOut)
+@query_budget(4)
 async def update_employee(
     employee_id: int,
     firstName: str = None,
@@ -112,14 +316,15 @@ async def update_employee(
     roleId: int = None,
     hireDate: date = None,
     qualifications: str = None,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
     current: CurrentUserContext = Depends(get_current_user)
 ):
     check_permission(current, "edit_employee")
-    employee = db.query(Employee).filter(Employee.personId == employee_id).first()
+    employee = await db.get(Employee, employee_id)
     if not employee:
         raise HTTPException(status_code=404, detail="Employee not found")
 
+    old_email = employee.email
     if firstName: employee.firstName = firstName
     if lastName: employee.lastName = lastName
     if email: employee.email = email
@@ -127,50 +332,80 @@ async def update_employee(
     if hireDate: employee.hireDate = hireDate
     if qualifications: employee.qualifications = qualifications
 
-    db.commit()
-    db.refresh(employee)
+    await db.commit()
+    # Only after the commit, so a concurrent request cannot re-cache the old row
+    principal_cache.invalidate(old_email)
+    await db.refresh(employee)
     return employee
 
+# HR: Offboard an employee; archived by default, deleted with their history when purge=true
 @router.delete("/employees/{employee_id}", status_code=204)
+@query_budget(7)
 async def delete_employee(
     employee_id: int,
-    db: Session = Depends(get_db),
+    purge: bool = Query(False, description="Delete the employee, their leave requests and assignments instead of archiving"),
+    db: AsyncSession = Depends(get_db),
     current: CurrentUserContext = Depends(get_current_user),
 ):
     check_permission(current, "delete_employee")
 
-    emp = db.get(Employee, employee_id) or db.query(Employee).filter(Employee.personId == employee_id).first()
+    emp = await db.get(Employee, employee_id)
     if not emp:
         raise HTTPException(status_code=404, detail="Employee not found")
 
     try:
-        if hasattr(emp, "roles") and emp.roles is not None:
-            emp.roles.clear()
-        if hasattr(emp, "projects") and emp.projects is not None:
-            emp.projects.clear()
-        if hasattr(emp, "teams") and emp.teams is not None:
-            emp.teams.clear()
-
-        if hasattr(emp, "addresses") and emp.addresses is not None:
-            for it in list(emp.addresses):
-                db.delete(it)
-        if hasattr(emp, "contracts") and emp.contracts is not None:
-            for it in list(emp.contracts):
-                db.delete(it)
-        if hasattr(emp, "hr_employee") and emp.hr_employee is not None:
-            db.delete(emp.hr_employee)
-
-        db.commit()  
-        fresh = db.get(Employee, employee_id) or db.query(Employee).filter(Employee.personId == employee_id).first()
-        if fresh:
-            if hasattr(fresh, "id"):
-                db.query(Employee).filter(Employee.id == fresh.id).delete(synchronize_session=False)
-            else:
-                db.query(Employee).filter(Employee.personId == fresh.personId).delete(synchronize_session=False)
-            db.commit()
-
+        if purge:
+            removed = await employee_offboarding.purge(db, [employee_id])
+        else:
+            archived = await employee_offboarding.archive(db, [employee_id])
+        await db.commit()
     except IntegrityError:
-        db.rollback()
-        raise HTTPException(status_code=409, detail="Delete blocked by FK constraints")
+        await db.rollback()
+        raise HTTPException(status_code=409, detail="The employee changed concurrently, please retry")
+    principal_cache.invalidate(emp.email)
+    if removed["assignments"] if purge else archived:
+        await response_cache.invalidate("assignments")
 
-    return Response(status_code=status.HTTP_204_NO_CONTENT)
\ No newline at end of file
+    return Response(status_code=status.HTTP_204_NO_CONTENT)
+
+# HR: Undo archiving
+@router.post("/employees/{employee_id}/restore", response_model=EmployeeOut)
+@query_budget(7)
+async def restore_employee(
+    employee_id: int,
+    db: AsyncSession = Depends(get_db),
+    current: CurrentUserContext = Depends(get_current_user),
+):
+    check_permission(current, "delete_employee")
+
+    emp = await db.get(Employee, employee_id)
+    if not emp:
+        raise HTTPException(status_code=404, detail="Employee not found")
+
+    if await employee_offboarding.restore(db, [employee_id]):
+        await db.commit()
+        await response_cache.invalidate("assignments")
+        await db.refresh(emp)
+    return emp
+
+# HR: Purge many archived employees in the background
+@router.post("/employees/purge-jobs", response_model=JobQueued, status_code=202)
+@query_budget(2)
+async def queue_employee_purge(
+    purge: EmployeePurge,
+    db: AsyncSession = Depends(get_db),
+    current: CurrentUserContext = Depends(get_current_user),
+):
+    """Deletes archived employees with their leave requests and assignments; poll /system/jobs/{job_id} for the counts."""
+    check_permission(current, "delete_employee")
+
+    if purge.employeeIds is None and purge.archivedBefore is None:
+        raise HTTPException(status_code=400, detail="Give employeeIds, archivedBefore or both")
+    job_id = enqueue(
+        db, "employees.purge",
+        employee_ids=purge.employeeIds,
+        archived_before=purge.archivedBefore and purge.archivedBefore.isoformat(),
+        actor=current.user.email,
+    )
+    await db.commit()
+    return {"job_id": job_id, "status": "queued"}
@@ -1,34 +1,71 @@
+from collections import Counter
+
 from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy.orm import Session
+from sqlalchemy import select, update
+from sqlalchemy.ext.asyncio import AsyncSession
 from datetime import date
+from typing import Optional
 
-from backend import get_current_user, check_permission, CurrentUserContext
-from ..database import get_db
-from backend.database.models import LeaveRequest
+from backend.auth.dependencies import get_current_user, check_permission, CurrentUserContext
+from ..database import get_db, get_read_db
+from ..database.pagination import PageParams, columns_for, paginate
+from backend.database import audit, dashboard_store, leave_calendar
+from backend.database.models import Employee, LeaveRequest, EmployeeProject
+from backend.database.query_budget import query_budget
+from backend.jobs import enqueue
+from backend.models import AbsenceOut, BatchResult, LeaveBalance, LeaveDecisionBatch, LeaveRequestMessage, LeaveRequestOut, Page, RequestStatusMessage
+from backend.tasks import leave_decision_notice
+from config.settings import settings
 
 router = APIRouter(prefix="/leaves", tags=["Leave Management"])
 
 # Employee: View own leave requests
-@router.get("/me")
+@router.get("/me", response_model=Page[LeaveRequestOut])
+@query_budget(2)
 async def view_my_leave_requests(
+    status: Optional[str] = None,
+    page: PageParams = Depends(),
     current: CurrentUserContext = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_read_db)
 ):
     check_permission(current, "view_all_leave_requests")
-    return db.query(LeaveRequest).filter(LeaveRequest.employeeId == current.user.personId).all()
+
+    stmt = select(*columns_for(LeaveRequest, LeaveRequestOut)).where(LeaveRequest.employeeId == current.user.personId)
+    if status is not None:
+        stmt = stmt.where(LeaveRequest.status == status)
+    return await paginate(db, stmt, LeaveRequest.requestId, page)
 
 # Employee: Submit a new leave request
-@router.post("/")
+@router.post("/", response_model=LeaveRequestMessage)
+@query_budget(7)
 async def submit_leave_request(
     startDate: date,
     endDate: date,
     requestType: str,
     reason: str = None,
     current: CurrentUserContext = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
     check_permission(current, "send_leave_request")
 
+    if endDate < startDate:
+        raise HTTPException(status_code=400, detail="endDate must not be before startDate")
+    if (endDate - startDate).days + 1 > settings.LEAVE_MAX_DAYS:
+        raise HTTPException(status_code=400, detail=f"Leave requests are limited to {settings.LEAVE_MAX_DAYS} days")
+
+    # Lock the employee row so concurrent submissions cannot both pass the overlap check
+    employees = Employee.__table__
+    await db.execute(select(employees.c.personId).where(employees.c.personId == current.user.personId).with_for_update())
+    conflicts = await leave_calendar.find_overlaps(db, current.user.personId, startDate, endDate)
+    if conflicts:
+        raise HTTPException(status_code=409, detail={
+            "message": "Leave overlaps an existing request",
+            "conflicts": [
+                {"requestId": row.requestId, "startDate": str(row.startDate), "endDate": str(row.endDate), "status": row.status}
+                for row in conflicts
+            ],
+        })
+
     leave_request = LeaveRequest(
         employeeId=current.user.personId,
         startDate=startDate,
@@ -39,39 +76,171 @@ async def submit_leave_request(
     )
 
     db.add(leave_request)
-    db.commit()
-    db.refresh(leave_request)
+    await dashboard_store.bump(db, dashboard_store.leave_transition(None, "pending", startDate))
+    await dashboard_store.raise_to(db, dashboard_store.LEAVE_MAX_LENGTH, (endDate - startDate).days + 1)
+    await db.commit()
+    await db.refresh(leave_request)
 
     return {"message": "Leave request submitted", "request": leave_request}
 
+# Who is off between two dates, optionally per project or role
+@router.get("/calendar", response_model=Page[AbsenceOut])
+@query_budget(3)
+async def leave_calendar_view(
+    fromDate: date,
+    toDate: date,
+    projectId: Optional[int] = None,
+    roleId: Optional[int] = None,
+    includePending: bool = False,
+    page: PageParams = Depends(),
+    current: CurrentUserContext = Depends(get_current_user),
+    db: AsyncSession = Depends(get_read_db)
+):
+    check_permission(current, "view_all_leave_requests")
+
+    if toDate < fromDate:
+        raise HTTPException(status_code=400, detail="toDate must not be before fromDate")
+    if (toDate - fromDate).days + 1 > 366:
+        raise HTTPException(status_code=400, detail="Calendar range is limited to 366 days")
+
+    return await leave_calendar.absences(db, fromDate, toDate, projectId, roleId, includePending, page)
+
+# Leave taken and remaining for a calendar year
+@router.get("/balance", response_model=LeaveBalance)
+@query_budget(2)
+async def leave_balance(
+    year: Optional[int] = None,
+    employeeId: Optional[int] = None,
+    current: CurrentUserContext = Depends(get_current_user),
+    db: AsyncSession = Depends(get_read_db)
+):
+    if employeeId is None or employeeId == current.user.personId:
+        check_permission(current, "send_leave_request")
+        employeeId = current.user.personId
+    else:
+        check_permission(current, "approve_deny_leave_requests")
+
+    return await leave_calendar.balance(db, employeeId, year or date.today().year)
+
 # HR: View all leave requests
-@router.get("/all")
+@router.get("/all", response_model=Page[LeaveRequestOut])
+@query_budget(2)
 async def view_all_leave_requests(
+    status: Optional[str] = None,
+    employeeId: Optional[int] = None,
+    projectId: Optional[int] = None,
+    requestType: Optional[str] = None,
+    fromDate: Optional[date] = None,
+    toDate: Optional[date] = None,
+    page: PageParams = Depends(),
     current: CurrentUserContext = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_read_db)
 ):
     check_permission(current, "view_all_leave_requests")
-    return db.query(LeaveRequest).all()
+
+    stmt = select(*columns_for(LeaveRequest, LeaveRequestOut))
+    if status is not None:
+        stmt = stmt.where(LeaveRequest.status == status)
+    if employeeId is not None:
+        stmt = stmt.where(LeaveRequest.employeeId == employeeId)
+    if projectId is not None:
+        stmt = stmt.where(LeaveRequest.employeeId.in_(
+            select(EmployeeProject.employeeId).where(EmployeeProject.projectId == projectId)
+        ))
+    if requestType is not None:
+        stmt = stmt.where(LeaveRequest.requestType == requestType)
+    # Date range: any leave overlapping [fromDate, toDate]
+    if fromDate is not None:
+        stmt = stmt.where(LeaveRequest.endDate >= fromDate)
+    if toDate is not None:
+        stmt = stmt.where(LeaveRequest.startDate <= toDate)
+    return await paginate(db, stmt, LeaveRequest.requestId, page)
 
 # HR: Approve or deny a leave request
-@router.post("/{request_id}/respond")
+@router.post("/{request_id}/respond", response_model=RequestStatusMessage)
+@query_budget(5)  # including the notification job's row under JOB_DURABLE
 async def respond_to_leave_request(
     request_id: int,
     status: str,
     current: CurrentUserContext = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
     check_permission(current, "approve_deny_leave_requests")
 
     if status not in ["approved", "denied"]:
         raise HTTPException(status_code=400, detail="Status must be 'approved' or 'denied'")
 
-    leave_request = db.query(LeaveRequest).filter(LeaveRequest.requestId == request_id).first()
+    # Lock the row so concurrent responses apply their counter deltas one after another
+    leave_request = await db.get(LeaveRequest, request_id, with_for_update=True, populate_existing=True)
     if not leave_request:
         raise HTTPException(status_code=404, detail="Leave request not found")
 
+    await dashboard_store.bump(db, dashboard_store.leave_transition(leave_request.status, status, leave_request.startDate))
     leave_request.status = status
-    leave_request.hrEmployeeId = current.user.personId
+    leave_request.hrEmployeeId = current.hr_employee_id
+    enqueue(db, "notify", messages=[leave_decision_notice(request_id, leave_request.employeeId, status)])
 
-    db.commit()
+    await db.commit()
     return {"message": f"Leave request {status}", "request_id": request_id}
+
+# HR: Approve or deny many pending leave requests in one call
+@router.post("/batch-respond", response_model=BatchResult)
+@query_budget(5)
+async def batch_respond_to_leave_requests(
+    batch: LeaveDecisionBatch,
+    current: CurrentUserContext = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db)
+):
+    check_permission(current, "approve_deny_leave_requests")
+
+    decisions = {}
+    for item in batch.decisions:
+        if decisions.setdefault(item.requestId, item.status) != item.status:
+            raise HTTPException(status_code=400, detail=f"Conflicting decisions for leave request {item.requestId}")
+
+    # One locked read gives the outcome for unknown or already decided ids
+    # and the start dates the counters are keyed on
+    found = {
+        row.requestId: row
+        for row in await db.execute(
+            select(LeaveRequest.requestId, LeaveRequest.status, LeaveRequest.startDate, LeaveRequest.employeeId, LeaveRequest.hrEmployeeId)
+            .where(LeaveRequest.requestId.in_(list(decisions)))
+            .with_for_update()
+        )
+    }
+
+    outcomes = {}
+    changes = Counter()
+    for status in ("approved", "denied"):
+        ids = [request_id for request_id, decision in decisions.items()
+               if decision == status and request_id in found and found[request_id].status == "pending"]
+        if not ids:
+            continue
+        updated = await db.scalars(
+            update(LeaveRequest)
+            .where(LeaveRequest.requestId.in_(ids), LeaveRequest.status == "pending")
+            .values(status=status, hrEmployeeId=current.hr_employee_id)
+            .returning(LeaveRequest.requestId)
+            .execution_options(synchronize_session=False)
+        )
+        for request_id in updated:
+            outcomes[request_id] = status
+            changes.update(dashboard_store.leave_transition("pending", status, found[request_id].startDate))
+            audit.record(db, "leave_requests", request_id, "update", {
+                "status": ["pending", status],
+                "hrEmployeeId": [found[request_id].hrEmployeeId, current.hr_employee_id],
+            })
+
+    await dashboard_store.bump(db, changes)
+    if outcomes:
+        enqueue(db, "notify", messages=[
+            leave_decision_notice(request_id, found[request_id].employeeId, status) for request_id, status in outcomes.items()
+        ])
+    await db.commit()
+    return {
+        "updated": len(outcomes),
+        "results": [
+            {"requestId": request_id, "outcome": outcomes.get(request_id) or ("not_pending" if request_id in found else "not_found")}
+            for request_id in decisions
+        ],
+    }
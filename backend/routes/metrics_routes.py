@@ -0,0 +1,55 @@
+from fastapi import APIRouter, HTTPException
+from fastapi.responses import PlainTextResponse
+
+from backend import metrics
+from backend.auth.principal_cache import principal_cache
+from backend.auth.security import hashing_stats
+from backend.database import pool_stats
+from backend.database.audit import audit_log
+from backend.database.query_budget import query_budget
+from backend.jobs import job_queue
+from backend.response_cache import response_cache
+from config.settings import settings
+
+router = APIRouter(tags=["System"])
+
+def _state_metrics() -> list:
+    pools = pool_stats()
+    hashing = hashing_stats()
+    jobs = job_queue.stats()
+    audit = audit_log.stats()
+    principals = principal_cache.stats()
+    responses = response_cache.stats()
+    return [
+        *metrics.snapshot("hris_db_pool_checked_out", "Connections in use per engine.",
+                          {(name,): stats["checked_out"] for name, stats in pools.items()}, ("engine",)),
+        *metrics.snapshot("hris_db_pool_idle", "Idle pooled connections per engine.",
+                          {(name,): stats["idle"] for name, stats in pools.items()}, ("engine",)),
+        *metrics.snapshot("hris_hashing_in_flight", "bcrypt calls running or queued in the worker pool.",
+                          {(): hashing["in_flight"]}),
+        *metrics.snapshot("hris_hashing_calls_total", "bcrypt calls by outcome.",
+                          {(outcome,): hashing[outcome] for outcome in ("completed", "failed", "rejected")}, ("outcome",),
+                          kind="counter"),
+        *metrics.snapshot("hris_jobs", "Background jobs queued or running.",
+                          {(state,): jobs[state] for state in ("queued", "running")}, ("state",)),
+        *metrics.snapshot("hris_jobs_finished_total", "Background job attempts by outcome.",
+                          {(outcome,): jobs[outcome] for outcome in ("completed", "failed", "retried")}, ("outcome",),
+                          kind="counter"),
+        *metrics.snapshot("hris_audit_buffered", "Audit entries not yet written.", {(): audit["buffered"]}),
+        *metrics.snapshot("hris_cache_lookups_total", "Cache hits and misses.", {
+            ("principal", "hit"): principals["hits"],
+            ("principal", "miss"): principals["misses"],
+            ("response", "hit"): responses["hits"],
+            ("response", "miss"): responses["misses"],
+        }, ("cache", "result"), kind="counter"),
+    ]
+
+# Prometheus scrape target; unauthenticated like most exporters, so keep
+# it off the public listener or set METRICS_ENABLED=false
+@router.get("/metrics", response_class=PlainTextResponse, include_in_schema=False)
+@query_budget(0)
+async def get_metrics():
+    if not settings.METRICS_ENABLED:
+        raise HTTPException(status_code=404, detail="Not Found")
+
+    return PlainTextResponse(metrics.render(_state_metrics()), media_type="text/plain; version=0.0.4")
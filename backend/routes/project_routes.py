@@ -1,19 +1,28 @@
-from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy.orm import Session
-from backend import get_current_user, check_permission, CurrentUserContext
-from ..database import get_db
-from backend.database.models import Project, EmployeeProject
+from fastapi import APIRouter, Depends, HTTPException, Request
+from typing import List, Optional
+from sqlalchemy import delete, select
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
+from backend.auth.dependencies import get_current_user, check_permission, CurrentUserContext
+from ..database import get_db, get_read_db
+from ..database.pagination import PageParams, columns_for, paginate
+from backend.database import audit, dashboard_store, staffing
+from backend.database.models import Project, EmployeeProject, Employee, Person, Role
+from backend.models import Page, ProjectDeleted, ProjectMessage, ProjectOut, ProjectRoster, StaffingChange, StaffingResult
+from backend.database.query_budget import query_budget
+from backend.response_cache import response_cache
 
 router = APIRouter(prefix="/projects", tags=["Project Management"])
 
 # HR: Create a new project
-@router.post("/")
+@router.post("/", response_model=ProjectMessage)
+@query_budget(3)
 async def create_project(
     projectName: str,
     description: str,
     hrEmployeeId: int = None,  # Optional field
     current: CurrentUserContext = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
     check_permission(current, "create_project")
 
@@ -23,36 +32,42 @@ async def create_project(
         hrEmployeeId=hrEmployeeId
     )
     db.add(project)
-    db.commit()
-    db.refresh(project)
+    await db.commit()
+    await db.refresh(project)
+    await response_cache.invalidate("projects")
 
     return {"message": "Project created", "project": project}
 
 # Employee: View assigned projects
-@router.get("/me")
+@router.get("/me", response_model=List[ProjectOut])
+@query_budget(2)
 async def view_my_projects(
     current: CurrentUserContext = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_read_db)
 ):
-    if current.role != "employee":
-        raise HTTPException(status_code=403, detail="Not authorized")
+    check_permission(current, "view_assigned_projects")
 
-    assignments = db.query(EmployeeProject).filter(EmployeeProject.employeeId == current.user.personId).all()
-    return [db.query(Project).filter(Project.projectId == ap.projectId).first() for ap in assignments]
+    return (await db.execute(
+        select(*columns_for(Project, ProjectOut))
+        .join(EmployeeProject, EmployeeProject.projectId == Project.projectId)
+        .where(EmployeeProject.employeeId == current.user.personId)
+        .order_by(Project.projectId)
+    )).all()
 
 # HR: Update a project
-@router.put("/{project_id}")
+@router.put("/{project_id}", response_model=ProjectMessage)
+@query_budget(4)
 async def update_project(
     project_id: int,
     projectName: str = None,
     description: str = None,
     hrEmployeeId: int = None,
     current: CurrentUserContext = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
     check_permission(current, "edit_project")
 
-    project = db.query(Project).filter(Project.projectId == project_id).first()
+    project = await db.get(Project, project_id)
     if not project:
         raise HTTPException(status_code=404, detail="Project not found")
 
@@ -63,33 +78,156 @@ async def update_project(
     if hrEmployeeId is not None:
         project.hrEmployeeId = hrEmployeeId
 
-    db.commit()
-    db.refresh(project)
+    await db.commit()
+    await db.refresh(project)
+    await response_cache.invalidate("projects")
     return {"message": "Project updated", "project": project}
 
 # HR: Delete a project
-@router.delete("/{project_id}")
+@router.delete("/{project_id}", response_model=ProjectDeleted)
+@query_budget(5)
 async def delete_project(
     project_id: int,
     current: CurrentUserContext = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
     check_permission(current, "delete_project")
 
-    project = db.query(Project).filter(Project.projectId == project_id).first()
+    project = await db.get(Project, project_id)
     if not project:
         raise HTTPException(status_code=404, detail="Project not found")
 
-    db.delete(project)
-    db.commit()
+    try:
+        # Archived members are not in the headcount, so each row says whether it counted
+        employees = Employee.__table__
+        counted = (
+            select(employees.c.archivedAt.is_(None))
+            .where(employees.c.personId == EmployeeProject.employeeId)
+            .correlate(EmployeeProject)
+            .scalar_subquery()
+        )
+        removed = dict((await db.execute(
+            delete(EmployeeProject).where(EmployeeProject.projectId == project_id)
+            .returning(EmployeeProject.employeeId, counted)
+        )).all())
+        await dashboard_store.bump(db, {dashboard_store.project_headcount(project_id): -sum(1 for live in removed.values() if live)})
+        await db.execute(delete(Project).where(Project.projectId == project_id))
+        for employee_id in removed:
+            audit.record(db, "employee_projects", f"{employee_id}:{project_id}", "delete",
+                         {"employeeId": [employee_id, None], "projectId": [project_id, None]})
+        audit.record(db, *audit.entity_key(project), "delete", audit.snapshot(project))
+        await db.commit()
+    except IntegrityError:
+        await db.rollback()
+        raise HTTPException(status_code=409, detail="Project still has external requests")
+    await response_cache.invalidate("projects", "assignments")
     return {"message": "Project deleted", "project_id": project_id}
 
-@router.get("/projects")
+@router.get("/projects", response_model=Page[ProjectOut])
+@query_budget(2)
 async def get_all_projects(
+    request: Request,
+    hrEmployeeId: Optional[int] = None,
+    employeeId: Optional[int] = None,
+    page: PageParams = Depends(),
     current: CurrentUserContext = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_read_db)
 ):
-    if current.role not in ("external","hr"):
-        raise HTTPException(status_code=403, detail="Not authorized")
+    check_permission(current, "view_projects")
 
-    return db.query(Project).all()
\ No newline at end of file
+    async def load():
+        stmt = select(*columns_for(Project, ProjectOut))
+        if hrEmployeeId is not None:
+            stmt = stmt.where(Project.hrEmployeeId == hrEmployeeId)
+        if employeeId is not None:
+            stmt = stmt.where(Project.projectId.in_(
+                select(EmployeeProject.projectId).where(EmployeeProject.employeeId == employeeId)
+            ))
+        return Page[ProjectOut].model_validate(await paginate(db, stmt, Project.projectId, page))
+
+    # Filtering by member also depends on project assignments
+    tags = ["projects", "assignments"] if employeeId is not None else ["projects"]
+    return await response_cache.respond(request, tags, load)
+
+# === Staffing ===
+
+async def _restaff(db: AsyncSession, side: str, fixed_id: int, change: StaffingChange) -> dict:
+    assign, unassign = set(change.assign), set(change.unassign)
+    both = assign & unassign
+    if both:
+        raise HTTPException(status_code=400, detail=f"Both assigned and unassigned: {', '.join(map(str, sorted(both)))}")
+    unknown = await staffing.unknown_ids(db, side, assign)
+    if unknown:
+        kind = "employees" if side == staffing.PROJECT else "projects"
+        raise HTTPException(status_code=400, detail=f"Unknown {kind}: {', '.join(map(str, unknown))}")
+
+    try:
+        assigned, unassigned = await staffing.restaff(db, side, fixed_id, assign, unassign, change.replace)
+        await db.commit()
+    except IntegrityError:
+        await db.rollback()
+        raise HTTPException(status_code=409, detail="Assignments changed concurrently, please retry")
+    if assigned or unassigned:
+        await response_cache.invalidate("assignments")
+    return {"assigned": assigned, "unassigned": unassigned}
+
+# HR: Assign and unassign many employees on one project
+@router.post("/{project_id}/members", response_model=StaffingResult)
+@query_budget(7)
+async def staff_project(
+    project_id: int,
+    change: StaffingChange,
+    current: CurrentUserContext = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db)
+):
+    check_permission(current, "edit_project")
+
+    # Locked, so concurrent calls for one project compute their diffs in turn
+    if await db.scalar(select(Project.projectId).where(Project.projectId == project_id).with_for_update()) is None:
+        raise HTTPException(status_code=404, detail="Project not found")
+    return await _restaff(db, staffing.PROJECT, project_id, change)
+
+# HR: Assign and unassign one employee on many projects
+@router.post("/employees/{employee_id}/assignments", response_model=StaffingResult)
+@query_budget(7)
+async def staff_employee(
+    employee_id: int,
+    change: StaffingChange,
+    current: CurrentUserContext = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db)
+):
+    check_permission(current, "edit_project")
+
+    employees = Employee.__table__
+    if await db.scalar(
+        select(employees.c.personId).where(employees.c.personId == employee_id, employees.c.archivedAt.is_(None)).with_for_update()
+    ) is None:
+        raise HTTPException(status_code=404, detail="Employee not found")
+    return await _restaff(db, staffing.EMPLOYEE, employee_id, change)
+
+# HR: Who works on a project, with their roles
+@router.get("/{project_id}/members", response_model=ProjectRoster)
+@query_budget(2)
+async def get_project_roster(
+    project_id: int,
+    current: CurrentUserContext = Depends(get_current_user),
+    db: AsyncSession = Depends(get_read_db)
+):
+    check_permission(current, "view_all_employees")
+
+    # Outer joins keep the project row when it has no members, so one query
+    # tells an empty roster from a missing project
+    employees = Employee.__table__
+    rows = (await db.execute(
+        select(Project.projectId, Person.personId, Person.firstName, Person.lastName, Person.email, Role.roleId, Role.roleName)
+        .select_from(Project)
+        .outerjoin(EmployeeProject, EmployeeProject.projectId == Project.projectId)
+        .outerjoin(employees, (employees.c.personId == EmployeeProject.employeeId) & employees.c.archivedAt.is_(None))
+        .outerjoin(Person, Person.personId == employees.c.personId)
+        .outerjoin(Role, Role.roleId == employees.c.roleId)
+        .where(Project.projectId == project_id)
+        .order_by(Person.lastName, Person.firstName, Person.personId)
+    )).all()
+    if not rows:
+        raise HTTPException(status_code=404, detail="Project not found")
+    return {"project_id": project_id, "members": [row for row in rows if row.personId is not None]}
@@ -1,65 +1,161 @@
-from fastapi import APIRouter, Depends, HTTPException, Path
-from sqlalchemy.orm import Session
-from backend import get_current_user, check_permission, CurrentUserContext
-from ..database import get_db
-from backend.database.models import Role
+from fastapi import APIRouter, Depends, HTTPException, Path, Request
+from typing import List, Optional
+from sqlalchemy import delete, insert, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from backend.auth.dependencies import get_current_user, check_permission, CurrentUserContext
+from backend.auth.permissions import permission_matrix
+from ..database import audit, get_db, get_read_db
+from ..database.pagination import PageParams, columns_for, paginate
+from backend.database.models import Permission, Role, RolePermission
+from backend.models import Page, PermissionOut, RoleDeleted, RoleMessage, RoleOut, RolePermissionGrant, RolePermissions
+from backend.database.query_budget import query_budget
+from backend.response_cache import response_cache
 
 router = APIRouter(prefix="/roles", tags=["Role Management"])
 
-@router.get("/")
+@router.get("/", response_model=Page[RoleOut])
+@query_budget(2)
 async def get_all_roles(
+    request: Request,
+    roleName: Optional[str] = None,
+    page: PageParams = Depends(),
     current: CurrentUserContext = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_read_db)
 ):
     check_permission(current, "view_all_employees")  # Or "manage_roles"
-    return db.query(Role).all()
 
-@router.post("/")
+    async def load():
+        stmt = select(*columns_for(Role, RoleOut))
+        if roleName is not None:
+            stmt = stmt.where(Role.roleName == roleName)
+        return Page[RoleOut].model_validate(await paginate(db, stmt, Role.roleId, page))
+
+    return await response_cache.respond(request, ["roles"], load)
+
+@router.post("/", response_model=RoleMessage)
+@query_budget(3)
 async def create_role(
     roleName: str,
     current: CurrentUserContext = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
     check_permission(current, "create_employee")
 
     new_role = Role(roleName=roleName)
     db.add(new_role)
-    db.commit()
-    db.refresh(new_role)
+    await db.commit()
+    await db.refresh(new_role)
+    await response_cache.invalidate("roles")
     return {"message": "Role created", "role": new_role}
 
-@router.put("/{role_id}")
+@router.put("/{role_id}", response_model=RoleMessage)
+@query_budget(4)
 async def update_role(
     role_id: int = Path(..., description="ID of the role to update"),
     roleName: str = None,
     current: CurrentUserContext = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
     check_permission(current, "edit_employee")
 
-    role = db.query(Role).filter(Role.roleId == role_id).first()
+    role = await db.get(Role, role_id)
     if not role:
         raise HTTPException(status_code=404, detail="Role not found")
 
     if roleName is not None:
         role.roleName = roleName
 
-    db.commit()
-    db.refresh(role)
+    await db.commit()
+    await db.refresh(role)
+    await response_cache.invalidate("roles")
     return {"message": "Role updated", "role": role}
 
-@router.delete("/{role_id}")
+@router.delete("/{role_id}", response_model=RoleDeleted)
+@query_budget(4)
 async def delete_role(
     role_id: int = Path(..., description="ID of the role to delete"),
     current: CurrentUserContext = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
     check_permission(current, "delete_employee")
 
-    role = db.query(Role).filter(Role.roleId == role_id).first()
+    role = await db.get(Role, role_id)
     if not role:
         raise HTTPException(status_code=404, detail="Role not found")
 
-    db.delete(role)
-    db.commit()
+    await db.delete(role)
+    await db.commit()
+    await response_cache.invalidate("roles")
+    # Its role_permissions rows went with it (ON DELETE CASCADE)
+    await permission_matrix.invalidate()
     return {"message": "Role deleted", "role_id": role_id}
+
+# === Permission Grants ===
+
+# HR: Every permission that can be granted
+@router.get("/permissions", response_model=List[PermissionOut])
+@query_budget(2)
+async def get_permissions(
+    current: CurrentUserContext = Depends(get_current_user),
+    db: AsyncSession = Depends(get_read_db)
+):
+    check_permission(current, "manage_permissions")
+
+    return (await db.execute(select(*columns_for(Permission, PermissionOut)).order_by(Permission.name))).all()
+
+# HR: Permissions a role adds for its employees
+@router.get("/{role_id}/permissions", response_model=RolePermissions)
+@query_budget(2)
+async def get_role_permissions(
+    role_id: int = Path(..., description="ID of the role"),
+    current: CurrentUserContext = Depends(get_current_user),
+    db: AsyncSession = Depends(get_read_db)
+):
+    check_permission(current, "manage_permissions")
+
+    rows = (await db.execute(
+        select(Role.roleId, Permission.name)
+        .outerjoin(RolePermission, RolePermission.roleId == Role.roleId)
+        .outerjoin(Permission, Permission.permissionId == RolePermission.permissionId)
+        .where(Role.roleId == role_id)
+    )).all()
+    if not rows:
+        raise HTTPException(status_code=404, detail="Role not found")
+    return {"role_id": role_id, "permissions": sorted(name for _, name in rows if name is not None)}
+
+# HR: Replace the permissions a role grants, e.g. leave approval for team leads
+@router.put("/{role_id}/permissions", response_model=RolePermissions)
+@query_budget(6)
+async def set_role_permissions(
+    grant: RolePermissionGrant,
+    role_id: int = Path(..., description="ID of the role"),
+    current: CurrentUserContext = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db)
+):
+    check_permission(current, "manage_permissions")
+
+    if await db.get(Role, role_id) is None:
+        raise HTTPException(status_code=404, detail="Role not found")
+
+    wanted = set(grant.permissions)
+    ids = dict((await db.execute(select(Permission.name, Permission.permissionId).where(Permission.name.in_(wanted)))).all())
+    unknown = wanted - ids.keys()
+    if unknown:
+        raise HTTPException(status_code=400, detail=f"Unknown permissions: {', '.join(sorted(unknown))}")
+
+    current_grants = dict((await db.execute(
+        select(Permission.name, Permission.permissionId)
+        .join(RolePermission, RolePermission.permissionId == Permission.permissionId)
+        .where(RolePermission.roleId == role_id)
+    )).all())
+    revoked = [current_grants[name] for name in current_grants.keys() - wanted]
+    granted = [ids[name] for name in wanted - current_grants.keys()]
+    if revoked:
+        await db.execute(delete(RolePermission).where(RolePermission.roleId == role_id, RolePermission.permissionId.in_(revoked)))
+    if granted:
+        await db.execute(insert(RolePermission), [{"roleId": role_id, "permissionId": permission_id} for permission_id in granted])
+    if revoked or granted:
+        audit.record(db, "roles", role_id, "update", {"permissions": [sorted(current_grants), sorted(wanted)]})
+        await db.commit()
+        await permission_matrix.invalidate()
+    return {"role_id": role_id, "permissions": sorted(wanted)}
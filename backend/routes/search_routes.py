@@ -0,0 +1,51 @@
+from fastapi import APIRouter, Depends, HTTPException, Query
+from typing import Optional
+from sqlalchemy.ext.asyncio import AsyncSession
+from backend.auth.dependencies import get_current_user, CurrentUserContext
+from ..database import get_read_db
+from ..database import search
+from ..database.pagination import columns_for
+from backend.database.models import ExternalRequest, Project
+from backend.database.query_budget import query_budget
+from backend.models import ExternalRequestOut, ProjectOut, SearchResults
+
+router = APIRouter(prefix="/search", tags=["Search"])
+
+# Permission needed to see each kind of result
+SCOPE_PERMISSIONS = {
+    "people": ("view_all_employees",),
+    "projects": ("view_all_projects", "view_projects"),
+    "requests": ("view_all_external_requests",),
+}
+
+# Typeahead search over people, projects and external requests
+@router.get("/", response_model=SearchResults)
+@query_budget(4)
+async def search_everything(
+    q: str = Query(..., min_length=1, max_length=100, description="Words to match by prefix, e.g. 'jo sm'"),
+    scope: Optional[str] = Query(None, description="people, projects or requests; everything you may see by default"),
+    limit: int = Query(10, ge=1, le=50, description="Maximum results per kind"),
+    current: CurrentUserContext = Depends(get_current_user),
+    db: AsyncSession = Depends(get_read_db)
+):
+    if scope is not None and scope not in search.SCOPES:
+        raise HTTPException(status_code=400, detail=f"scope must be one of {', '.join(search.SCOPES)}")
+
+    allowed = [
+        name for name in ((scope,) if scope else search.SCOPES)
+        if any(current.can(permission) for permission in SCOPE_PERMISSIONS[name])
+    ]
+    if not allowed:
+        raise HTTPException(status_code=403, detail="Permission denied")
+
+    words = search.terms(q)
+    results = {}
+    if not words:
+        return results
+    if "people" in allowed:
+        results["people"] = await search.search_people(db, words, limit)
+    if "projects" in allowed:
+        results["projects"] = await search.search_projects(db, words, limit, columns_for(Project, ProjectOut))
+    if "requests" in allowed:
+        results["requests"] = await search.search_requests(db, words, limit, columns_for(ExternalRequest, ExternalRequestOut))
+    return results
@@ -0,0 +1,100 @@
+from fastapi import APIRouter, Depends, HTTPException
+from typing import Dict
+
+from backend.auth.dependencies import get_current_user, check_permission, CurrentUserContext
+from backend.auth.principal_cache import principal_cache
+from backend.auth.security import hashing_stats
+from backend.database import pool_stats
+from backend.database.audit import audit_log
+from backend.database.query_budget import query_budget
+from backend.jobs import enqueue, job_queue, load_job
+from backend.models import AuditLogStats, EnginePoolStats, HashingStats, JobQueued, JobQueueStats, JobStatus, PrincipalCacheStats, ResponseCacheStats
+from backend.response_cache import response_cache
+from config.settings import settings
+
+router = APIRouter(prefix="/system", tags=["System"])
+
+# HR: Password hashing pool metrics
+@router.get("/hashing", response_model=HashingStats)
+@query_budget(1)
+async def get_hashing_stats(
+    current: CurrentUserContext = Depends(get_current_user)
+):
+    check_permission(current, "view_system_stats")
+
+    return hashing_stats()
+
+# HR: Principal cache hit/miss counters
+@router.get("/principal-cache", response_model=PrincipalCacheStats)
+@query_budget(1)
+async def get_principal_cache_stats(
+    current: CurrentUserContext = Depends(get_current_user)
+):
+    check_permission(current, "view_system_stats")
+
+    return principal_cache.stats()
+
+# HR: Database connection pool utilization
+@router.get("/pool", response_model=Dict[str, EnginePoolStats])
+@query_budget(1)
+async def get_pool_stats(
+    current: CurrentUserContext = Depends(get_current_user)
+):
+    check_permission(current, "view_system_stats")
+
+    return pool_stats()
+
+# HR: Response cache hit/miss and revalidation counters
+@router.get("/response-cache", response_model=ResponseCacheStats)
+@query_budget(1)
+async def get_response_cache_stats(
+    current: CurrentUserContext = Depends(get_current_user)
+):
+    check_permission(current, "view_system_stats")
+
+    return response_cache.stats()
+
+# HR: Background job queue counters
+@router.get("/jobs", response_model=JobQueueStats)
+@query_budget(1)
+async def get_job_queue_stats(
+    current: CurrentUserContext = Depends(get_current_user)
+):
+    check_permission(current, "view_system_stats")
+
+    return job_queue.stats()
+
+# HR: Recompute the dashboard counters in the background
+@router.post("/jobs/dashboard-rebuild", response_model=JobQueued, status_code=202)
+@query_budget(1)
+async def queue_dashboard_rebuild(
+    current: CurrentUserContext = Depends(get_current_user)
+):
+    check_permission(current, "run_system_jobs")
+
+    return {"job_id": enqueue(None, "dashboard.rebuild"), "status": "queued"}
+
+# HR: State of one background job
+@router.get("/jobs/{job_id}", response_model=JobStatus)
+@query_budget(2)
+async def get_job_status(
+    job_id: str,
+    current: CurrentUserContext = Depends(get_current_user)
+):
+    check_permission(current, "view_system_stats")
+
+    # Recent jobs are in memory; older durable ones only in the jobs table
+    job = job_queue.get(job_id) or (await load_job(job_id) if settings.JOB_DURABLE else None)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Job not found")
+    return job
+
+# HR: Audit log buffer and batch write counters
+@router.get("/audit", response_model=AuditLogStats)
+@query_budget(1)
+async def get_audit_log_stats(
+    current: CurrentUserContext = Depends(get_current_user)
+):
+    check_permission(current, "view_system_stats")
+
+    return audit_log.stats()
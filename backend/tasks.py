@@ -0,0 +1,74 @@
+"""Handlers for the background jobs in backend/jobs.py."""
+import logging
+from datetime import datetime
+
+from sqlalchemy import select
+
+from .database import SessionLocal, dashboard_store
+from .database.models import Person
+from .employee_import import import_records
+from .employee_offboarding import purge_archived
+from .jobs import task
+
+notifications = logging.getLogger("backend.notifications")
+
+# === Messages ===
+
+def welcome(person) -> dict:
+    return {
+        "personId": person.personId,
+        "subject": "Welcome",
+        "body": f"Hello {person.firstName}, your account has been created.",
+    }
+
+def leave_decision_notice(request_id: int, employee_id: int, status: str) -> dict:
+    return {
+        "personId": employee_id,
+        "subject": f"Leave request {request_id} {status}",
+        "body": f"Your leave request {request_id} has been {status}.",
+    }
+
+def external_response_notice(request_id: int, user_id: int, response: str) -> dict:
+    return {
+        "personId": user_id,
+        "subject": f"Response to request {request_id}",
+        "body": response,
+    }
+
+# === Handlers ===
+
+@task("notify")
+async def notify(messages: list) -> dict:
+    """Delivers {personId, subject, body} messages.
+
+    No mail transport is configured, so each message is logged on the
+    backend.notifications logger; route that logger to deliver them.
+    """
+    async with SessionLocal() as db:
+        emails = dict((await db.execute(
+            select(Person.personId, Person.email).where(Person.personId.in_({message["personId"] for message in messages}))
+        )).all())
+
+    delivered = 0
+    for message in messages:
+        email = emails.get(message["personId"])
+        if email is None:
+            continue  # deleted since the job was queued
+        notifications.info("To %s: %s - %s", email, message["subject"], message["body"])
+        delivered += 1
+    return {"delivered": delivered}
+
+@task("dashboard.rebuild")
+async def rebuild_dashboard() -> dict:
+    async with SessionLocal() as db:
+        return {"counters": await dashboard_store.rebuild(db)}
+
+# Plain-text passwords in the payload: never written to the jobs table
+@task("employees.import", durable=False)
+async def import_employees(records: list, actor: str = None) -> dict:
+    async with SessionLocal(info={"audit_actor": actor}) as db:
+        return await import_records(db, records)
+
+@task("employees.purge")
+async def purge_employees(employee_ids: list = None, archived_before: str = None, actor: str = None) -> dict:
+    return await purge_archived(employee_ids, archived_before and datetime.fromisoformat(archived_before), actor)
@@ -0,0 +1,254 @@
+"""Synthetic HR data generator for the benchmark suite.
+
+Fills an empty database, migrated to head, with a company's worth of
+rows:
+- people split across HR staff, external users and employees, all with
+  one bcrypt password
+- roles and projects
+- one to three project assignments per employee
+- years of non-overlapping leave history per employee
+- external requests from every external user
+
+Then it rebuilds the dashboard counters. The same --seed and --anchor
+always produce the same rows, so two commits can be measured against
+identical data:
+
+    DATABASE_URL=sqlite+aiosqlite:////tmp/bench.db alembic upgrade head
+    DATABASE_URL=sqlite+aiosqlite:////tmp/bench.db python -m benchmarks.datagen --people 10000 --years 3
+
+Accounts are hr{i}@company.ba, emp{i}@company.com and ext{i}@partner.example,
+numbered from 0, all with --password.
+"""
+import argparse
+import asyncio
+import random
+import sys
+import time
+from dataclasses import dataclass
+from datetime import date, timedelta
+
+from sqlalchemy import func, insert, select, text
+
+from backend.auth.security import hash_password
+from backend.database import SessionLocal, dashboard_store, dispose_engines, get_engine
+from backend.database.models import (
+    Person, Employee, HREmployee, ExternalUser, Role, Project,
+    LeaveRequest, ExternalRequest, EmployeeProject,
+)
+
+HR_EMAIL = "hr{}@company.ba"
+EMPLOYEE_EMAIL = "emp{}@company.com"
+EXTERNAL_EMAIL = "ext{}@partner.example"
+DEFAULT_PASSWORD = "benchmark123"
+
+# Rows per INSERT statement
+BATCH_SIZE = 5000
+
+FIRST_NAMES = ["Amra", "Benjamin", "Lejla", "Emir", "Sara", "Adnan", "Ema", "Tarik", "Lana", "Haris",
+               "Maja", "Kenan", "Nina", "Dino", "Iva", "Mirza", "Ajla", "Luka", "Hana", "Vedran"]
+LAST_NAMES = ["Hodzic", "Kovacevic", "Begic", "Mehic", "Jukic", "Delic", "Popovic", "Hadzic", "Babic",
+              "Suljic", "Maric", "Omerovic", "Petrovic", "Alic", "Kadric", "Novak"]
+SKILLS = ["Python", "SQL", "FastAPI", "Kubernetes", "React", "Java", "Go", "Terraform", "Excel",
+          "Accounting", "Recruiting", "Payroll", "Design", "Testing", "Linux", "Networking"]
+TITLES = ["Engineer", "Analyst", "Designer", "Manager", "Accountant", "Recruiter", "Tester", "Architect"]
+DEPARTMENTS = ["HR", "People Operations", "Talent", "Payroll"]
+# requestType -> (weight, shortest, longest) in days
+LEAVE_TYPES = {"annual": (0.6, 1, 10), "sick": (0.3, 1, 5), "unpaid": (0.1, 1, 20)}
+
+@dataclass
+class Volume:
+    people: int = 10000
+    hr_share: float = 0.02
+    external_share: float = 0.10
+    roles: int = 25
+    projects: int = 300
+    years: int = 3
+    leaves_per_year: int = 6
+    external_requests_per_year: int = 12
+    seed: int = 42
+
+    @property
+    def hr_count(self) -> int:
+        return max(1, round(self.people * self.hr_share))
+
+    @property
+    def external_count(self) -> int:
+        return max(1, round(self.people * self.external_share))
+
+    @property
+    def employee_count(self) -> int:
+        return max(1, self.people - self.hr_count - self.external_count)
+
+async def _insert(conn, table, rows: list, returning=None) -> list:
+    """Batched executemany; with returning, the returned rows in parameter order."""
+    returned = []
+    for start in range(0, len(rows), BATCH_SIZE):
+        batch = rows[start:start + BATCH_SIZE]
+        if returning is None:
+            await conn.execute(insert(table), batch)
+        else:
+            stmt = insert(table).returning(returning, sort_by_parameter_order=True)
+            returned.extend((await conn.execute(stmt, batch)).scalars().all())
+    return returned
+
+def _name(rng: random.Random) -> dict:
+    return {"firstName": rng.choice(FIRST_NAMES), "lastName": rng.choice(LAST_NAMES)}
+
+def leave_history(rng: random.Random, employee_id: int, hired: date, anchor: date, volume: Volume, hr_ids: list) -> list:
+    """One employee's leave requests, back to back from hire (or the history start) to 60 days ahead."""
+    day = max(hired, anchor - timedelta(days=365 * volume.years))
+    horizon = anchor + timedelta(days=60)
+    mean_gap = max(2, 365 // max(1, volume.leaves_per_year))
+    types = list(LEAVE_TYPES)
+    weights = [LEAVE_TYPES[name][0] for name in types]
+
+    rows = []
+    while True:
+        day += timedelta(days=rng.randint(1, 2 * mean_gap))
+        request_type = rng.choices(types, weights)[0]
+        _, shortest, longest = LEAVE_TYPES[request_type]
+        end = day + timedelta(days=rng.randint(shortest, longest) - 1)
+        if end > horizon:
+            return rows
+        if end < anchor:
+            status = "approved" if rng.random() < 0.85 else "denied"
+        else:
+            status = "pending" if rng.random() < 0.6 else "approved"
+        rows.append({
+            "employeeId": employee_id,
+            "hrEmployeeId": None if status == "pending" else rng.choice(hr_ids),
+            "startDate": day,
+            "endDate": end,
+            "requestType": request_type,
+            "status": status,
+            "reason": f"{request_type} leave",
+        })
+        day = end
+
+async def generate(conn, volume: Volume, password_hash: str, anchor: date) -> dict:
+    rng = random.Random(volume.seed)
+    counts = {}
+
+    role_ids = await _insert(conn, Role.__table__, [
+        {"roleName": f"{TITLES[i % len(TITLES)]} {i // len(TITLES) + 1}"} for i in range(volume.roles)
+    ], returning=Role.__table__.c.roleId)
+
+    def person(email: str, kind: str) -> dict:
+        return {**_name(rng), "email": email, "password": password_hash, "type": kind}
+
+    hr_ids = await _insert(conn, Person.__table__, [
+        person(HR_EMAIL.format(i), "hr_employee") for i in range(volume.hr_count)
+    ], returning=Person.__table__.c.personId)
+    await _insert(conn, HREmployee.__table__, [
+        {"personId": person_id, "department": rng.choice(DEPARTMENTS)} for person_id in hr_ids
+    ])
+
+    external_ids = await _insert(conn, Person.__table__, [
+        person(EXTERNAL_EMAIL.format(i), "external_user") for i in range(volume.external_count)
+    ], returning=Person.__table__.c.personId)
+    await _insert(conn, ExternalUser.__table__, [
+        {"personId": person_id, "username": f"ext{i}"} for i, person_id in enumerate(external_ids)
+    ])
+
+    employee_ids = await _insert(conn, Person.__table__, [
+        person(EMPLOYEE_EMAIL.format(i), "employee") for i in range(volume.employee_count)
+    ], returning=Person.__table__.c.personId)
+    hired = {
+        person_id: anchor - timedelta(days=rng.randint(30, 365 * (volume.years + 5)))
+        for person_id in employee_ids
+    }
+    await _insert(conn, Employee.__table__, [
+        {
+            "personId": person_id,
+            "roleId": rng.choice(role_ids),
+            "hireDate": hired[person_id],
+            "qualifications": ", ".join(rng.sample(SKILLS, rng.randint(1, 4))),
+        }
+        for person_id in employee_ids
+    ])
+
+    project_owners = [rng.choice(hr_ids) if rng.random() < 0.9 else None for _ in range(volume.projects)]
+    project_ids = await _insert(conn, Project.__table__, [
+        {"projectName": f"Project {rng.choice(SKILLS)} {i}", "description": f"Synthetic project {i}", "hrEmployeeId": owner}
+        for i, owner in enumerate(project_owners)
+    ], returning=Project.__table__.c.projectId)
+    owner_of = dict(zip(project_ids, project_owners))
+
+    assignments = [
+        {"employeeId": person_id, "projectId": project_id}
+        for person_id in employee_ids
+        for project_id in rng.sample(project_ids, min(len(project_ids), rng.choices([1, 2, 3], [0.6, 0.3, 0.1])[0]))
+    ]
+    await _insert(conn, EmployeeProject.__table__, assignments)
+
+    leaves = [row for person_id in employee_ids for row in leave_history(rng, person_id, hired[person_id], anchor, volume, hr_ids)]
+    await _insert(conn, LeaveRequest.__table__, leaves)
+
+    # No timestamps on external requests: a user's latest ones are the open ones
+    external_requests = []
+    for person_id in external_ids:
+        total = rng.randint(0, 2 * volume.external_requests_per_year * volume.years)
+        for n in range(total):
+            project_id = rng.choice(project_ids)
+            pending = n >= total - max(1, total // 10)
+            external_requests.append({
+                "userId": person_id,
+                "projectId": project_id,
+                "hrEmployeeId": owner_of[project_id],
+                "description": f"Request {n} about project {project_id}",
+                "status": "pending" if pending else "responded",
+                "response": None if pending else "Handled",
+            })
+    await _insert(conn, ExternalRequest.__table__, external_requests)
+
+    counts.update({
+        "roles": len(role_ids),
+        "hr_employees": len(hr_ids),
+        "external_users": len(external_ids),
+        "employees": len(employee_ids),
+        "projects": len(project_ids),
+        "assignments": len(assignments),
+        "leave_requests": len(leaves),
+        "external_requests": len(external_requests),
+    })
+    return counts
+
+async def main(args) -> int:
+    volume = Volume(
+        people=args.people, hr_share=args.hr_share, external_share=args.external_share, roles=args.roles,
+        projects=args.projects, years=args.years, leaves_per_year=args.leaves_per_year,
+        external_requests_per_year=args.external_requests_per_year, seed=args.seed,
+    )
+    started = time.perf_counter()
+    async with get_engine().begin() as conn:
+        if await conn.scalar(select(func.count()).select_from(Person.__table__)):
+            print("The database already has people in it; generate into a freshly migrated one.", file=sys.stderr)
+            return 1
+        counts = await generate(conn, volume, hash_password(args.password), args.anchor)
+        await conn.execute(text("ANALYZE"))
+    # The rows bypass the routes, so derive the counters from them
+    async with SessionLocal() as db:
+        counts["dashboard_counters"] = await dashboard_store.rebuild(db)
+    await dispose_engines()
+
+    for name, count in counts.items():
+        print(f"{name:<20} {count:>10,}")
+    print(f"generated in {time.perf_counter() - started:.1f} s (seed {volume.seed}, anchor {args.anchor})")
+    return 0
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--people", type=int, default=Volume.people)
+    parser.add_argument("--hr-share", type=float, default=Volume.hr_share)
+    parser.add_argument("--external-share", type=float, default=Volume.external_share)
+    parser.add_argument("--roles", type=int, default=Volume.roles)
+    parser.add_argument("--projects", type=int, default=Volume.projects)
+    parser.add_argument("--years", type=int, default=Volume.years, help="Years of leave history")
+    parser.add_argument("--leaves-per-year", type=int, default=Volume.leaves_per_year)
+    parser.add_argument("--external-requests-per-year", type=int, default=Volume.external_requests_per_year,
+                        help="Average per external user")
+    parser.add_argument("--seed", type=int, default=Volume.seed)
+    parser.add_argument("--anchor", type=date.fromisoformat, default=date.today(),
+                        help="The 'today' the history leads up to (YYYY-MM-DD)")
+    parser.add_argument("--password", default=DEFAULT_PASSWORD)
+    sys.exit(asyncio.run(main(parser.parse_args())))
@@ -0,0 +1,98 @@
+"""Import-time and app construction budgets for worker and test startup.
+
+Each scenario runs in a fresh interpreter under -X importtime, several
+times. The fastest run counts, because noise only ever adds time. A
+scenario reports two figures:
+- import_ms: the time spent importing modules, summed from the importtime
+  lines its statement produced
+- total_ms: the statement's wall time, which includes building an app
+
+The script exits 1 when a total goes over its budget. No database is
+needed; the engines are not created before startup.
+
+    python -m benchmarks.import_time
+    python -m benchmarks.import_time --runs 10 --top 15 --only app
+    python -m benchmarks.import_time --budget-scale 2    # a slower machine
+"""
+import argparse
+import os
+import subprocess
+import sys
+
+# name -> (untimed setup, timed statement, budget in ms)
+SCENARIOS = {
+    # Anything that touches a module under backend/ pays for this first
+    "package": ("", "import backend", 25),
+    # alembic, datagen and other scripts that need the models but no web stack
+    "database": ("", "import backend.database.models", 800),
+    # A uvicorn worker before its lifespan starts
+    "app": ("", "import backend; backend.create_app()", 1600),
+    # Each further app built in one process, as a test fixture does
+    "app_again": ("import backend; backend.create_app()", "backend.create_app()", 150),
+}
+
+_MARK = "-- timed --"
+
+_RUNNER = """
+import sys, time
+{setup}
+sys.stderr.write({mark!r} + "\\n"); sys.stderr.flush()
+started = time.perf_counter()
+{stmt}
+print((time.perf_counter() - started) * 1000)
+"""
+
+def _parse(stderr: str) -> list:
+    """(self_us, cumulative_us, depth, module) for every import after the mark."""
+    lines = stderr.split(_MARK + "\n", 1)[-1].splitlines()
+    entries = []
+    for line in lines:
+        if not line.startswith("import time:") or "[us]" in line:
+            continue
+        own, cumulative, name = line[len("import time:"):].split("|", 2)
+        depth = (len(name) - len(name.lstrip()) - 1) // 2
+        entries.append((int(own), int(cumulative), depth, name.strip()))
+    return entries
+
+def measure(setup: str, stmt: str) -> dict:
+    code = _RUNNER.format(setup=setup, stmt=stmt, mark=_MARK)
+    env = {**os.environ, "DATABASE_URL": os.environ.get("DATABASE_URL", "sqlite+aiosqlite://")}
+    done = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code], capture_output=True, text=True, env=env, check=False,
+    )
+    if done.returncode:
+        raise RuntimeError(f"{stmt!r} failed:\n{done.stderr[-2000:]}")
+    entries = _parse(done.stderr)
+    return {
+        "total_ms": float(done.stdout.split()[-1]),
+        "import_ms": sum(cumulative for _, cumulative, depth, _ in entries if depth == 0) / 1000,
+        "modules": len(entries),
+        "entries": entries,
+    }
+
+def main(args) -> int:
+    over = 0
+    print(f"{'scenario':<12} {'total ms':>10} {'import ms':>10} {'modules':>8} {'budget ms':>10}")
+    for name, (setup, stmt, budget) in SCENARIOS.items():
+        if args.only and name not in args.only:
+            continue
+        best = min((measure(setup, stmt) for _ in range(args.runs)), key=lambda run: run["total_ms"])
+        budget *= args.budget_scale
+        exceeded = best["total_ms"] > budget
+        over += exceeded
+        print(
+            f"{name:<12} {best['total_ms']:>10.1f} {best['import_ms']:>10.1f} {best['modules']:>8} "
+            f"{budget:>10.0f}{'  OVER BUDGET' if exceeded else ''}"
+        )
+        if args.top:
+            for own, cumulative, _, module in sorted(best["entries"], reverse=True)[:args.top]:
+                print(f"    {own / 1000:>8.1f} ms self {cumulative / 1000:>8.1f} ms cumulative  {module}")
+    return 1 if over else 0
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--runs", type=int, default=5, help="Fresh interpreters per scenario; the fastest counts")
+    parser.add_argument("--only", nargs="+", choices=list(SCENARIOS), help="Scenario names to run")
+    parser.add_argument("--top", type=int, default=0, help="Also list this many modules with the most self time")
+    parser.add_argument("--budget-scale", type=float, default=1.0, help="Multiply every budget, for slower machines")
+    sys.exit(main(parser.parse_args()))
@@ -0,0 +1,75 @@
+"""Latency check for the leave calendar queries.
+
+Seeds the database pointed to by DATABASE_URL (via benchmarks.query_plans)
+with about 100k leave requests, then times overlap detection, a one-week
+absence query and a balance computation. Exits 1 if any p95 exceeds
+--max-ms. Run it against a scratch database migrated to head:
+
+    DATABASE_URL=sqlite+aiosqlite:////tmp/calendar.db alembic upgrade head
+    DATABASE_URL=sqlite+aiosqlite:////tmp/calendar.db python -m benchmarks.leave_calendar
+"""
+import argparse
+import asyncio
+import sys
+import time
+from datetime import date, timedelta
+
+from sqlalchemy import text
+
+from backend.database import SessionLocal, dispose_engines, get_engine
+from backend.database import dashboard_store, leave_calendar
+from backend.database.pagination import PageParams
+from benchmarks.load_test import _percentile
+from benchmarks.query_plans import seed
+
+async def timed(runs: int, fn) -> list:
+    timings = []
+    for i in range(runs):
+        started = time.perf_counter()
+        await fn(i)
+        timings.append(time.perf_counter() - started)
+    return timings
+
+async def main(args) -> int:
+    if args.seed:
+        async with get_engine().begin() as conn:
+            await seed(conn, args.employees, args.leaves)
+            await conn.execute(text("ANALYZE"))
+        # The seed bypasses the routes, so derive the counters from it
+        async with SessionLocal() as db:
+            await dashboard_store.rebuild(db)
+
+    today = date.today()
+    week = today - timedelta(days=30)
+    first_employee = 111  # ids assigned by query_plans.seed
+
+    failures = 0
+    page = PageParams(limit=50, after=None)
+    async with SessionLocal() as db:
+        checks = [
+            ("overlap on submit",
+             lambda i: leave_calendar.find_overlaps(db, first_employee + i, today, today + timedelta(days=4))),
+            ("absences in one week",
+             lambda i: leave_calendar.absences(db, week, week + timedelta(days=6), page=page)),
+            ("absences in one week, one project",
+             lambda i: leave_calendar.absences(db, week, week + timedelta(days=6), project_id=i % 200 + 1, page=page)),
+            ("yearly balance",
+             lambda i: leave_calendar.balance(db, first_employee + i, today.year)),
+        ]
+        for name, fn in checks:
+            timings = await timed(args.runs, fn)
+            p50, p95 = _percentile(timings, 50) * 1000, _percentile(timings, 95) * 1000
+            slow = p95 > args.max_ms
+            failures += slow
+            print(f"{'FAIL' if slow else 'ok  '} {name:<36} p50 {p50:>7.2f} ms  p95 {p95:>7.2f} ms")
+    await dispose_engines()
+    return 1 if failures else 0
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--no-seed", dest="seed", action="store_false", help="Use the existing data as-is")
+    parser.add_argument("--employees", type=int, default=8334)
+    parser.add_argument("--leaves", type=int, default=12, help="Leave requests per employee")
+    parser.add_argument("--runs", type=int, default=200)
+    parser.add_argument("--max-ms", type=float, default=10.0)
+    sys.exit(asyncio.run(main(parser.parse_args())))
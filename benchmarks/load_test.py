@@ -0,0 +1,100 @@
+"""Concurrent load benchmark for the HRIS API.
+
+Logs in once, then hammers a read endpoint with N concurrent clients for a
+fixed duration and reports requests/sec and latency percentiles per
+concurrency level. Run it against a live server before and after a change:
+
+    python -m benchmarks.load_test --url http://localhost:8000 \
+        --email hr@company.ba --password secret123 --path /hr/employees \
+        --concurrency 50 100 200 --duration 10
+"""
+import argparse
+import asyncio
+import json
+import statistics
+import time
+
+import httpx
+
+
+async def _login(client: httpx.AsyncClient, email: str, password: str) -> str:
+    response = await client.post("/login", data={"username": email, "password": password})
+    response.raise_for_status()
+    return response.json()["access_token"]
+
+
+async def _worker(client: httpx.AsyncClient, path: str, headers: dict, deadline: float, latencies: list, errors: list):
+    while time.perf_counter() < deadline:
+        started = time.perf_counter()
+        try:
+            response = await client.get(path, headers=headers)
+            if response.status_code >= 400:
+                errors.append(response.status_code)
+                continue
+        except httpx.HTTPError as exc:
+            errors.append(type(exc).__name__)
+            continue
+        latencies.append(time.perf_counter() - started)
+
+
+def _percentile(values: list, pct: float) -> float:
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))
+    return ordered[index]
+
+
+async def run_level(url: str, path: str, token: str, concurrency: int, duration: float) -> dict:
+    headers = {"Authorization": f"Bearer {token}"}
+    limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+    latencies, errors = [], []
+    async with httpx.AsyncClient(base_url=url, limits=limits, timeout=30) as client:
+        deadline = time.perf_counter() + duration
+        started = time.perf_counter()
+        await asyncio.gather(*(_worker(client, path, headers, deadline, latencies, errors) for _ in range(concurrency)))
+        elapsed = time.perf_counter() - started
+
+    return {
+        "concurrency": concurrency,
+        "requests": len(latencies),
+        "errors": len(errors),
+        "rps": round(len(latencies) / elapsed, 1),
+        "p50_ms": round(_percentile(latencies, 50) * 1000, 2),
+        "p95_ms": round(_percentile(latencies, 95) * 1000, 2),
+        "p99_ms": round(_percentile(latencies, 99) * 1000, 2),
+        "mean_ms": round(statistics.fmean(latencies) * 1000, 2) if latencies else 0.0,
+    }
+
+
+async def main(args) -> list:
+    async with httpx.AsyncClient(base_url=args.url, timeout=30) as client:
+        token = await _login(client, args.email, args.password)
+
+    results = []
+    for concurrency in args.concurrency:
+        result = await run_level(args.url, args.path, token, concurrency, args.duration)
+        results.append(result)
+        print(
+            f"{concurrency:>5} clients  {result['rps']:>9} req/s  "
+            f"p50 {result['p50_ms']:>8} ms  p95 {result['p95_ms']:>8} ms  "
+            f"p99 {result['p99_ms']:>8} ms  errors {result['errors']}"
+        )
+    return results
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--url", default="http://localhost:8000")
+    parser.add_argument("--email", required=True)
+    parser.add_argument("--password", required=True)
+    parser.add_argument("--path", default="/hr/employees")
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[50, 100, 200])
+    parser.add_argument("--duration", type=float, default=10.0)
+    parser.add_argument("--json", dest="json_path", help="Write the results to this file as JSON")
+    args = parser.parse_args()
+
+    results = asyncio.run(main(args))
+    if args.json_path:
+        with open(args.json_path, "w") as fh:
+            json.dump(results, fh, indent=2)
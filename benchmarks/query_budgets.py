@@ -0,0 +1,200 @@
+"""Query-budget check: every route, with QUERY_BUDGET_MODE=raise.
+
+Builds the app in process with budgets enforced and fills an empty
+database through the API. The data has a few rows of everything, so a
+per-row query pushes a list over its budget. Then it calls every route
+of the app at least once. Before each call the principal cache is
+cleared, so the token lookup is charged every time, as on a cold worker.
+The audit log's background flush is held back, so entries a route has
+to flush itself are still buffered, as under load.
+
+The check exits 1 if any of these happens:
+- a request runs more statements than its @query_budget
+- a request gets an unexpected status
+- a route has no call here (add one when you add a route)
+
+    export DATABASE_URL=sqlite+aiosqlite:////tmp/budgets.db
+    rm -f /tmp/budgets.db && alembic upgrade head
+    python -m benchmarks.query_budgets
+"""
+import argparse
+import dataclasses
+import sys
+import time
+from datetime import date, timedelta
+
+from fastapi.routing import APIRoute
+from fastapi.testclient import TestClient
+
+from backend import create_app
+from backend.auth.principal_cache import principal_cache
+from backend.database.audit import audit_log
+from backend.database.query_budget import QueryBudgetExceeded
+from config.settings import Settings
+
+PASSWORD = "budget-check"
+
+class Checker:
+    """Calls routes by path template and remembers which ones ran and what failed."""
+
+    def __init__(self, client: TestClient, verbose: bool):
+        self.client = client
+        self.verbose = verbose
+        self.called = set()
+        self.failures = []
+
+    def call(self, method: str, template: str, status: int = 200, headers: dict = None, path: dict = None, **kwargs):
+        principal_cache.clear()
+        self.called.add((method, template))
+        url = template.format(**(path or {}))
+        try:
+            response = self.client.request(method, url, headers=headers, **kwargs)
+        except QueryBudgetExceeded as exc:
+            self.failures.append(str(exc))
+            return None
+        if response.status_code != status:
+            self.failures.append(f"{method} {url} returned {response.status_code}, expected {status}: {response.text[:300]}")
+            return None
+        if self.verbose:
+            print(f"ok  {method:<6} {url}")
+        return response.json() if response.headers.get("content-type", "").startswith("application/json") else response
+
+    def login(self, email: str) -> dict:
+        token = self.call("POST", "/login", data={"username": email, "password": PASSWORD})["access_token"]
+        return {"Authorization": f"Bearer {token}"}
+
+    def wait(self, job_id: str, headers: dict):
+        for _ in range(200):
+            job = self.call("GET", "/system/jobs/{job_id}", headers=headers, path={"job_id": job_id})
+            if job is None or job["status"] in ("done", "failed"):
+                return job
+            time.sleep(0.05)
+        self.failures.append(f"job {job_id} did not finish")
+
+def exercise(check: Checker):
+    call = check.call
+    today = date.today()
+
+    # === People, roles and projects ===
+    call("POST", "/register", params={"firstName": "Hana", "lastName": "Hodzic", "email": "budget-hr@company.ba", "password": PASSWORD})
+    hr = check.login("budget-hr@company.ba")
+    role_ids = [call("POST", "/roles/", headers=hr, params={"roleName": f"Budget role {i}"})["role"]["roleId"] for i in range(3)]
+    call("PUT", "/roles/{role_id}", headers=hr, path={"role_id": role_ids[0]}, params={"roleName": "Budget engineer"})
+    call("GET", "/roles/", headers=hr)
+    call("GET", "/roles/permissions", headers=hr)
+    call("PUT", "/roles/{role_id}/permissions", headers=hr, path={"role_id": role_ids[1]},
+         json={"permissions": ["view_hr_dashboard", "view_all_employees"]})
+    call("GET", "/roles/{role_id}/permissions", headers=hr, path={"role_id": role_ids[1]})
+
+    employee_ids = [
+        call("POST", "/hr/employees", headers=hr, params={
+            "firstName": "Emir", "lastName": f"Budget{i}", "email": f"budget-emp{i}@company.com", "password": PASSWORD,
+            "roleId": role_ids[i % 2], "hireDate": "2020-01-01", "qualifications": "Python, SQL",
+        })["personId"]
+        for i in range(4)
+    ]
+    record = {"firstName": "Ema", "lastName": "Imported", "roleId": role_ids[0], "hireDate": "2021-01-01",
+              "qualifications": "Go", "password": PASSWORD}
+    call("POST", "/hr/employees/import", headers=hr, json=[{**record, "email": "budget-imp0@company.com"}])
+    job = call("POST", "/hr/employees/import-jobs", status=202, headers=hr, json=[{**record, "email": "budget-imp1@company.com"}])
+    check.wait(job["job_id"], hr)
+    call("PUT", "/hr/employees/{employee_id}", headers=hr, path={"employee_id": employee_ids[0]}, params={"qualifications": "Rust"})
+    call("GET", "/hr/employees", headers=hr)
+
+    project_ids = [
+        call("POST", "/projects/", headers=hr, params={"projectName": f"Budget project {i}", "description": "check"})["project"]["projectId"]
+        for i in range(4)
+    ]
+    call("PUT", "/projects/{project_id}", headers=hr, path={"project_id": project_ids[0]}, params={"description": "checked"})
+    call("GET", "/projects/projects", headers=hr)
+    call("POST", "/projects/{project_id}/members", headers=hr, path={"project_id": project_ids[0]}, json={"assign": employee_ids})
+    call("POST", "/projects/employees/{employee_id}/assignments", headers=hr, path={"employee_id": employee_ids[0]},
+         json={"assign": project_ids[1:3]})
+    call("GET", "/projects/{project_id}/members", headers=hr, path={"project_id": project_ids[0]})
+
+    # === Employee self-service and leave ===
+    employee = check.login("budget-emp0@company.com")
+    call("GET", "/employee/me", headers=employee)
+    call("GET", "/employee/dashboard", headers=employee)
+    call("GET", "/projects/me", headers=employee)
+    leave_ids = [
+        call("POST", "/leaves/", headers=employee, params={
+            "startDate": str(today + timedelta(days=10 * i + 1)), "endDate": str(today + timedelta(days=10 * i + 2)),
+            "requestType": "annual", "reason": "check",
+        })["request"]["requestId"]
+        for i in range(4)
+    ]
+    call("GET", "/leaves/me", headers=employee)
+    call("GET", "/leaves/balance", headers=employee)
+    call("POST", "/leaves/{request_id}/respond", headers=hr, path={"request_id": leave_ids[0]}, params={"status": "approved"})
+    call("POST", "/leaves/batch-respond", headers=hr,
+         json={"decisions": [{"requestId": request_id, "status": "denied"} for request_id in leave_ids[1:3]]})
+    call("GET", "/leaves/all", headers=hr)
+    call("GET", "/leaves/calendar", headers=hr, params={
+        "fromDate": str(today), "toDate": str(today + timedelta(days=60)), "includePending": True,
+    })
+
+    # === External users ===
+    call("POST", "/register", params={"firstName": "Luka", "lastName": "Partner", "email": "budget-ext@partner.example", "password": PASSWORD})
+    external = check.login("budget-ext@partner.example")
+    request_ids = [
+        call("POST", "/external/requests", headers=external, params={"projectId": project_ids[i % 2], "description": f"q{i}"})["request"]["requestId"]
+        for i in range(4)
+    ]
+    call("GET", "/external/requests/me", headers=external)
+    call("GET", "/external/dashboard", headers=external)
+    call("GET", "/hr/external-requests", headers=hr)
+    call("POST", "/hr/external-requests/{request_id}/respond", headers=hr, path={"request_id": request_ids[0]}, params={"response": "yes"})
+    call("POST", "/hr/external-requests/batch-respond", headers=hr,
+         json={"responses": [{"requestId": request_id, "response": "no"} for request_id in request_ids[1:3]]})
+
+    # === Reads across everything ===
+    call("GET", "/hr/dashboard", headers=hr)
+    call("GET", "/search/", headers=hr, params={"q": "budget"})
+    # Straight after the writes above, with their audit entries still buffered
+    call("GET", "/audit/{entity_type}/{entity_id}", headers=hr, path={"entity_type": "employees", "entity_id": employee_ids[0]})
+    for table in ("employees", "leave-requests", "external-requests", "projects"):
+        call("GET", f"/export/{table}", headers=hr)
+    for stats in ("hashing", "principal-cache", "pool", "response-cache", "jobs", "audit"):
+        call("GET", f"/system/{stats}", headers=hr)
+    job = call("POST", "/system/jobs/dashboard-rebuild", status=202, headers=hr)
+    check.wait(job["job_id"], hr)
+    call("GET", "/metrics")
+
+    # === Offboarding and deletes ===
+    call("DELETE", "/hr/employees/{employee_id}", status=204, headers=hr, path={"employee_id": employee_ids[1]})
+    call("POST", "/hr/employees/{employee_id}/restore", headers=hr, path={"employee_id": employee_ids[1]})
+    call("DELETE", "/hr/employees/{employee_id}", status=204, headers=hr, path={"employee_id": employee_ids[2]},
+         params={"purge": True})
+    call("DELETE", "/hr/employees/{employee_id}", status=204, headers=hr, path={"employee_id": employee_ids[3]})
+    job = call("POST", "/hr/employees/purge-jobs", status=202, headers=hr, json={"employeeIds": [employee_ids[3]]})
+    check.wait(job["job_id"], hr)
+    call("DELETE", "/projects/{project_id}", headers=hr, path={"project_id": project_ids[3]})
+    call("DELETE", "/roles/{role_id}", headers=hr, path={"role_id": role_ids[2]})
+
+def main(args) -> int:
+    app = create_app(dataclasses.replace(Settings(), QUERY_BUDGET_MODE="raise"))
+    # No timed flush, so routes meet the entries of earlier writes still buffered.
+    # audit_log is built at import, so AUDIT_FLUSH_MS given to create_app would not reach it.
+    audit_log.flush_interval = 3600
+    with TestClient(app) as client:
+        check = Checker(client, args.verbose)
+        try:
+            exercise(check)
+        except Exception as exc:
+            # A failed call returned nothing for the calls after it to use
+            check.failures.append(f"stopped early: {type(exc).__name__}: {exc}")
+
+    routes = {(method, route.path) for route in app.routes if isinstance(route, APIRoute) for method in route.methods}
+    uncovered = sorted(routes - check.called)
+    for message in check.failures:
+        print(f"FAIL  {message}")
+    for method, path in uncovered:
+        print(f"NOT CALLED  {method} {path}")
+    print(f"{len(check.called & routes)} of {len(routes)} routes called, {len(check.failures)} failures")
+    return 1 if check.failures or uncovered else 0
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--verbose", action="store_true", help="Print every passing call too")
+    sys.exit(main(parser.parse_args()))
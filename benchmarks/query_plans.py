@@ -0,0 +1,136 @@
+"""Query-plan regression check for the hot dashboard and list queries.
+
+Seeds the database pointed to by DATABASE_URL with synthetic rows, runs
+EXPLAIN on the statements the routes issue and fails (exit code 1) if any
+of them stops using its index. Run it against a scratch database migrated
+to head:
+
+    DATABASE_URL=sqlite+aiosqlite:////tmp/plans.db alembic upgrade head
+    DATABASE_URL=sqlite+aiosqlite:////tmp/plans.db python -m benchmarks.query_plans
+"""
+import argparse
+import asyncio
+import sys
+from datetime import date, timedelta
+
+from sqlalchemy import insert, select, text
+
+from backend.database import dispose_engines, get_engine
+from backend.database.models import (
+    Person, Employee, HREmployee, ExternalUser, Role, Project,
+    LeaveRequest, ExternalRequest, EmployeeProject,
+)
+from backend.database.pagination import columns_for
+from backend.models import EmployeeOut, ExternalRequestOut, LeaveRequestOut, ProjectOut
+
+# Page size the list routes fetch (default limit + 1)
+PAGE = 51
+
+def plan_checks() -> list:
+    """(name, statement as issued by the route, index that must appear in the plan)"""
+    leaves = select(*columns_for(LeaveRequest, LeaveRequestOut))
+    external = select(*columns_for(ExternalRequest, ExternalRequestOut))
+    return [
+        ("leaves by employee",
+         leaves.where(LeaveRequest.employeeId == 7).order_by(LeaveRequest.requestId).limit(PAGE),
+         "ix_leave_requests_employeeId_startDate"),
+        ("pending leaves",
+         leaves.where(LeaveRequest.status == "pending").order_by(LeaveRequest.requestId).limit(PAGE),
+         "ix_leave_requests_status_requestId"),
+        ("external requests by user",
+         external.where(ExternalRequest.userId == 3).order_by(ExternalRequest.requestId).limit(PAGE),
+         "ix_external_requests_userId"),
+        ("hr dashboard incoming requests",
+         external.where(ExternalRequest.hrEmployeeId == 1).order_by(ExternalRequest.requestId).limit(PAGE),
+         "ix_external_requests_hrEmployeeId_status"),
+        ("pending external requests",
+         external.where(ExternalRequest.status == "pending").order_by(ExternalRequest.requestId).limit(PAGE),
+         "ix_external_requests_status"),
+        ("hr dashboard assigned projects",
+         select(*columns_for(Project, ProjectOut)).where(Project.hrEmployeeId == 1).order_by(Project.projectId).limit(PAGE),
+         "ix_projects_hrEmployeeId"),
+        ("project members",
+         select(EmployeeProject.employeeId).where(EmployeeProject.projectId == 5),
+         "ix_employee_projects_projectId"),
+        ("employees by role",
+         select(*columns_for(Employee, EmployeeOut)).where(Employee.roleId == 2).order_by(Employee.personId).limit(PAGE),
+         "ix_employees_roleId"),
+    ]
+
+async def seed(conn, employees: int, leaves_per_employee: int):
+    today = date.today()
+    await conn.execute(insert(Role.__table__), [{"roleName": f"role-{i}"} for i in range(20)])
+
+    people = (
+        [{"firstName": "Hr", "lastName": str(i), "email": f"hr{i}@company.ba", "password": "x", "type": "hr_employee"} for i in range(10)]
+        + [{"firstName": "Ext", "lastName": str(i), "email": f"ext{i}@example.com", "password": "x", "type": "external_user"} for i in range(100)]
+        + [{"firstName": "Emp", "lastName": str(i), "email": f"emp{i}@company.com", "password": "x", "type": "employee"} for i in range(employees)]
+    )
+    await conn.execute(insert(Person.__table__), people)
+    hr_ids = list(range(1, 11))
+    ext_ids = list(range(11, 111))
+    emp_ids = list(range(111, 111 + employees))
+
+    await conn.execute(insert(HREmployee.__table__), [{"personId": i, "department": "HR"} for i in hr_ids])
+    await conn.execute(insert(ExternalUser.__table__), [{"personId": i, "username": f"ext{i}"} for i in ext_ids])
+    await conn.execute(insert(Employee.__table__), [
+        {"personId": i, "roleId": i % 20 + 1, "hireDate": today - timedelta(days=i % 3000), "qualifications": "q"} for i in emp_ids
+    ])
+    await conn.execute(insert(Project.__table__), [
+        {"projectName": f"project-{i}", "description": "d", "hrEmployeeId": hr_ids[i % len(hr_ids)]} for i in range(200)
+    ])
+    await conn.execute(insert(EmployeeProject.__table__), [{"employeeId": i, "projectId": i % 200 + 1} for i in emp_ids])
+    await conn.execute(insert(LeaveRequest.__table__), [
+        {
+            "employeeId": i,
+            "startDate": today - timedelta(days=30 * n + i % 30),
+            "endDate": today - timedelta(days=30 * n + i % 30 - 2),
+            "requestType": "annual",
+            "status": "pending" if n == 0 else "approved",
+            "reason": "r",
+        }
+        for i in emp_ids for n in range(leaves_per_employee)
+    ])
+    await conn.execute(insert(ExternalRequest.__table__), [
+        {
+            "userId": ext_ids[i % len(ext_ids)],
+            "projectId": i % 200 + 1,
+            "hrEmployeeId": hr_ids[i % len(hr_ids)] if i % 4 else None,
+            "description": "d",
+            "status": "pending" if i % 4 == 0 else "responded",
+        }
+        for i in range(employees)
+    ])
+
+async def explain(conn, stmt) -> str:
+    sql = str(stmt.compile(conn.sync_connection, compile_kwargs={"literal_binds": True}))
+    if conn.dialect.name == "sqlite":
+        rows = (await conn.execute(text(f"EXPLAIN QUERY PLAN {sql}"))).all()
+        return "\n".join(row[-1] for row in rows)
+    rows = (await conn.execute(text(f"EXPLAIN {sql}"))).all()
+    return "\n".join(row[0] for row in rows)
+
+async def main(args) -> int:
+    failures = 0
+    async with get_engine().begin() as conn:
+        if args.seed:
+            await seed(conn, args.employees, args.leaves)
+        await conn.execute(text("ANALYZE"))
+
+        for name, stmt, index in plan_checks():
+            plan = await explain(conn, stmt)
+            used = index.lower() in plan.lower()
+            failures += not used
+            print(f"{'ok  ' if used else 'FAIL'} {name}: expected {index}")
+            if not used or args.verbose:
+                print("     " + plan.replace("\n", "\n     "))
+    await dispose_engines()
+    return 1 if failures else 0
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--no-seed", dest="seed", action="store_false", help="Use the existing data as-is")
+    parser.add_argument("--employees", type=int, default=5000)
+    parser.add_argument("--leaves", type=int, default=12, help="Leave requests per employee")
+    parser.add_argument("--verbose", action="store_true")
+    sys.exit(asyncio.run(main(parser.parse_args())))
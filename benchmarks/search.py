@@ -0,0 +1,70 @@
+"""Typeahead latency check for /search.
+
+Seeds the database pointed to by DATABASE_URL (via benchmarks.query_plans)
+with about 100k people, then times prefix searches of growing length the
+way a search box issues them. Exits 1 if any p95 exceeds --max-ms. On
+SQLite the first search builds the in-process index; that build is
+reported separately and not counted. Run it against a scratch database
+migrated to head:
+
+    DATABASE_URL=sqlite+aiosqlite:////tmp/search.db alembic upgrade head
+    DATABASE_URL=sqlite+aiosqlite:////tmp/search.db python -m benchmarks.search
+"""
+import argparse
+import asyncio
+import sys
+import time
+
+from sqlalchemy import text
+
+from backend.database import SessionLocal, dispose_engines, get_engine
+from backend.database import search
+from backend.database.models import ExternalRequest, Project
+from backend.database.pagination import columns_for
+from backend.models import ExternalRequestOut, ProjectOut
+from benchmarks.leave_calendar import timed
+from benchmarks.load_test import _percentile
+from benchmarks.query_plans import seed
+
+# What a user types, one keystroke at a time; the seed names people
+# "Emp <n>" with emails emp<n>@company.com
+QUERIES = ["e", "em", "emp", "emp 4", "emp 42", "emp4217", "project 1", "company emp 99"]
+
+async def main(args) -> int:
+    if args.seed:
+        async with get_engine().begin() as conn:
+            await seed(conn, args.people - 110, 1)
+            await conn.execute(text("ANALYZE"))
+
+    failures = 0
+    async with SessionLocal() as db:
+        started = time.perf_counter()
+        await search.search_people(db, ["warmup"], 1)
+        if db.get_bind().dialect.name != "postgresql":
+            print(f"in-process index built in {(time.perf_counter() - started) * 1000:.0f} ms")
+
+        checks = [
+            ("people", lambda words: search.search_people(db, words, args.limit)),
+            ("projects", lambda words: search.search_projects(db, words, args.limit, columns_for(Project, ProjectOut))),
+            ("requests", lambda words: search.search_requests(
+                db, words, args.limit, columns_for(ExternalRequest, ExternalRequestOut))),
+        ]
+        for name, fn in checks:
+            for query in QUERIES:
+                words = search.terms(query)
+                timings = await timed(args.runs, lambda i: fn(words))
+                p50, p95 = _percentile(timings, 50) * 1000, _percentile(timings, 95) * 1000
+                slow = p95 > args.max_ms
+                failures += slow
+                print(f"{'FAIL' if slow else 'ok  '} {name:<9} {query!r:<18} p50 {p50:>7.2f} ms  p95 {p95:>7.2f} ms")
+    await dispose_engines()
+    return 1 if failures else 0
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--no-seed", dest="seed", action="store_false", help="Use the existing data as-is")
+    parser.add_argument("--people", type=int, default=100000)
+    parser.add_argument("--limit", type=int, default=10)
+    parser.add_argument("--runs", type=int, default=100)
+    parser.add_argument("--max-ms", type=float, default=20.0)
+    sys.exit(asyncio.run(main(parser.parse_args())))
@@ -0,0 +1,289 @@
+"""Reproducible endpoint benchmark suite with JSON baselines.
+
+Drives the real routes on a database filled by benchmarks.datagen. It
+runs in process through httpx's ASGI transport by default, or against a
+live server with --url. Each scenario runs with --concurrency clients
+for --duration seconds, one scenario at a time. The suite reports
+throughput and p50/p95/p99 per endpoint and can write them as a JSON
+baseline. The approval scenarios consume pending requests, so regenerate
+the data before every run you want to compare:
+
+    export DATABASE_URL=sqlite+aiosqlite:////tmp/bench.db
+    rm -f /tmp/bench.db && alembic upgrade head
+    python -m benchmarks.datagen --people 10000 --anchor 2026-10-17
+    python -m benchmarks.suite --anchor 2026-10-17 --write-concurrency 1 \
+        --json after.json --baseline benchmarks/baselines/sqlite-10k.json
+
+    python -m benchmarks.suite --diff before.json after.json   # compare two saved runs
+
+With --baseline or --diff it exits 1 if any endpoint's p95 got more than
+--max-regression percent worse.
+"""
+import argparse
+import asyncio
+import itertools
+import json
+import platform
+import statistics
+import subprocess
+import sys
+import time
+from dataclasses import dataclass
+from datetime import date, datetime, timedelta
+from typing import Awaitable, Callable, Optional
+
+import httpx
+from sqlalchemy import func, select
+
+from benchmarks.datagen import DEFAULT_PASSWORD, EMPLOYEE_EMAIL, EXTERNAL_EMAIL, HR_EMAIL
+from benchmarks.load_test import _percentile
+
+# === Scenarios ===
+
+class Context:
+    """Tokens and request-id pools shared by the scenarios of one run."""
+
+    def __init__(self, tokens: dict, password: str):
+        self.tokens = tokens
+        self.password = password
+        self.pending_leaves = []
+        self.pending_external = []
+
+    def auth(self, role: str) -> dict:
+        return {"Authorization": f"Bearer {self.tokens[role]}"}
+
+# Returns the response, or None once the scenario has nothing left to do
+Call = Callable[[httpx.AsyncClient, Context, int], Awaitable[Optional[httpx.Response]]]
+
+@dataclass
+class Scenario:
+    name: str
+    call: Call
+    writes: bool = False
+
+def _get(role: str, path: str, **params) -> Call:
+    async def call(client, ctx, i):
+        return await client.get(path, params=params, headers=ctx.auth(role))
+    return call
+
+async def _login(client, ctx, i):
+    return await client.post("/login", data={"username": EMPLOYEE_EMAIL.format(i % 50), "password": ctx.password})
+
+async def _approve_leave(client, ctx, i):
+    if not ctx.pending_leaves:
+        return None
+    return await client.post(f"/leaves/{ctx.pending_leaves.pop()}/respond", params={"status": "approved"}, headers=ctx.auth("hr"))
+
+async def _batch_approve_leaves(client, ctx, i):
+    batch = [ctx.pending_leaves.pop() for _ in range(min(50, len(ctx.pending_leaves)))]
+    if not batch:
+        return None
+    decisions = [{"requestId": request_id, "status": "approved"} for request_id in batch]
+    return await client.post("/leaves/batch-respond", json={"decisions": decisions}, headers=ctx.auth("hr"))
+
+async def _respond_external(client, ctx, i):
+    if not ctx.pending_external:
+        return None
+    return await client.post(
+        f"/hr/external-requests/{ctx.pending_external.pop()}/respond", params={"response": "Done"}, headers=ctx.auth("hr")
+    )
+
+def scenarios(anchor: date) -> list:
+    week = {"fromDate": anchor.isoformat(), "toDate": (anchor + timedelta(days=6)).isoformat()}
+    return [
+        Scenario("login", _login),
+        Scenario("hr_dashboard", _get("hr", "/hr/dashboard")),
+        Scenario("employee_dashboard", _get("employee", "/employee/dashboard")),
+        Scenario("external_dashboard", _get("external", "/external/dashboard")),
+        Scenario("list_employees", _get("hr", "/hr/employees", limit=50)),
+        Scenario("list_pending_leaves", _get("hr", "/leaves/all", status="pending", limit=50)),
+        Scenario("list_external_requests", _get("hr", "/hr/external-requests", status="pending", limit=50)),
+        Scenario("my_leaves", _get("employee", "/leaves/me")),
+        Scenario("leave_calendar_week", _get("hr", "/leaves/calendar", **week)),
+        Scenario("leave_balance", _get("employee", "/leaves/balance")),
+        Scenario("search", _get("hr", "/search/", q="amra ho")),
+        Scenario("approve_leave", _approve_leave, writes=True),
+        Scenario("batch_approve_leaves_50", _batch_approve_leaves, writes=True),
+        Scenario("respond_external_request", _respond_external, writes=True),
+    ]
+
+# === Runner ===
+
+async def _worker(client, ctx, scenario: Scenario, counter, deadline: float, latencies: list, errors: list):
+    while time.perf_counter() < deadline:
+        started = time.perf_counter()
+        try:
+            response = await scenario.call(client, ctx, next(counter))
+        except httpx.HTTPError as exc:
+            errors.append(type(exc).__name__)
+            continue
+        if response is None:
+            return
+        if response.status_code >= 400:
+            errors.append(response.status_code)
+            continue
+        latencies.append(time.perf_counter() - started)
+
+async def run_scenario(client, ctx, scenario: Scenario, concurrency: int, duration: float) -> dict:
+    latencies, errors = [], []
+    counter = itertools.count()
+    started = time.perf_counter()
+    deadline = started + duration
+    await asyncio.gather(*(
+        _worker(client, ctx, scenario, counter, deadline, latencies, errors) for _ in range(concurrency)
+    ))
+    elapsed = time.perf_counter() - started
+    return {
+        "requests": len(latencies),
+        "errors": len(errors),
+        "rps": round(len(latencies) / elapsed, 1),
+        "p50_ms": round(_percentile(latencies, 50) * 1000, 2),
+        "p95_ms": round(_percentile(latencies, 95) * 1000, 2),
+        "p99_ms": round(_percentile(latencies, 99) * 1000, 2),
+        "mean_ms": round(statistics.fmean(latencies) * 1000, 2) if latencies else 0.0,
+    }
+
+async def _token(client, email: str, password: str) -> str:
+    response = await client.post("/login", data={"username": email, "password": password})
+    response.raise_for_status()
+    return response.json()["access_token"]
+
+async def _pending_ids(client, ctx, path: str, limit: int) -> list:
+    """Up to limit pending request ids, read through the list endpoint."""
+    ids, after = [], None
+    while len(ids) < limit:
+        params = {"status": "pending", "limit": 500, **({"after": after} if after else {})}
+        page = (await client.get(path, params=params, headers=ctx.auth("hr"))).json()
+        ids.extend(item["requestId"] for item in page["items"])
+        after = page["next_cursor"]
+        if after is None:
+            break
+    return ids[:limit]
+
+async def _data_counts() -> dict:
+    from backend.database import get_engine
+    from backend.database.models import EmployeeProject, ExternalRequest, LeaveRequest, Person, Project
+    async with get_engine().connect() as conn:
+        return {
+            table.__tablename__: await conn.scalar(select(func.count()).select_from(table))
+            for table in (Person, Project, EmployeeProject, LeaveRequest, ExternalRequest)
+        }
+
+def _git_commit() -> Optional[str]:
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+async def run(args) -> dict:
+    selected = [scenario for scenario in scenarios(args.anchor) if not args.only or scenario.name in args.only]
+
+    if args.url:
+        client = httpx.AsyncClient(base_url=args.url, timeout=60)
+        lifespan = None
+        target = args.url
+    else:
+        from backend import create_app
+        from backend.database import get_engine
+        app = create_app()
+        lifespan = app.router.lifespan_context(app)
+        await lifespan.__aenter__()
+        # A handler's exception becomes a 500 counted as an error, as behind a server
+        transport = httpx.ASGITransport(app=app, raise_app_exceptions=False)
+        client = httpx.AsyncClient(transport=transport, base_url="http://bench", timeout=60)
+        target = f"in-process ({get_engine().dialect.name})"
+
+    results = {}
+    try:
+        data = None if args.url else await _data_counts()
+        ctx = Context({
+            "hr": await _token(client, HR_EMAIL.format(0), args.password),
+            "employee": await _token(client, EMPLOYEE_EMAIL.format(0), args.password),
+            "external": await _token(client, EXTERNAL_EMAIL.format(0), args.password),
+        }, args.password)
+        if any(scenario.writes for scenario in selected):
+            ctx.pending_leaves = await _pending_ids(client, ctx, "/leaves/all", args.max_writes)
+            ctx.pending_external = await _pending_ids(client, ctx, "/hr/external-requests", args.max_writes)
+
+        for scenario in selected:
+            concurrency = args.write_concurrency if scenario.writes and args.write_concurrency else args.concurrency
+            result = await run_scenario(client, ctx, scenario, concurrency, args.duration)
+            results[scenario.name] = result
+            print(
+                f"{scenario.name:<26} {result['rps']:>9} req/s  p50 {result['p50_ms']:>8} ms  "
+                f"p95 {result['p95_ms']:>8} ms  p99 {result['p99_ms']:>8} ms  errors {result['errors']}"
+            )
+    finally:
+        await client.aclose()
+        if lifespan is not None:
+            await lifespan.__aexit__(None, None, None)
+
+    return {
+        "meta": {
+            "commit": _git_commit(),
+            "recorded_at": datetime.utcnow().isoformat(timespec="seconds"),
+            "target": target,
+            "python": platform.python_version(),
+            "concurrency": args.concurrency,
+            "write_concurrency": args.write_concurrency or args.concurrency,
+            "duration_s": args.duration,
+            "anchor": args.anchor.isoformat(),
+            "data": data,
+        },
+        "endpoints": results,
+    }
+
+# === Baselines ===
+
+def compare(old: dict, new: dict, max_regression: float) -> int:
+    """Prints per-endpoint changes; returns how many p95s regressed beyond max_regression percent."""
+    regressions = 0
+    print(f"{'endpoint':<26} {'rps':>20} {'p95 ms':>24}")
+    for name, after in new["endpoints"].items():
+        before = old["endpoints"].get(name)
+        if before is None:
+            print(f"{name:<26} {'(new)':>20}")
+            continue
+        rps_change = (after["rps"] - before["rps"]) / before["rps"] * 100 if before["rps"] else 0.0
+        p95_change = (after["p95_ms"] - before["p95_ms"]) / before["p95_ms"] * 100 if before["p95_ms"] else 0.0
+        regressed = p95_change > max_regression
+        regressions += regressed
+        print(
+            f"{name:<26} {before['rps']:>8} -> {after['rps']:>8} {rps_change:>+6.1f}%"
+            f" {before['p95_ms']:>8} -> {after['p95_ms']:>8} {p95_change:>+6.1f}%{'  REGRESSED' if regressed else ''}"
+        )
+    return regressions
+
+def _load(path: str) -> dict:
+    with open(path) as fh:
+        return json.load(fh)
+
+def main(args) -> int:
+    if args.diff:
+        return 1 if compare(_load(args.diff[0]), _load(args.diff[1]), args.max_regression) else 0
+
+    report = asyncio.run(run(args))
+    if args.json_path:
+        with open(args.json_path, "w") as fh:
+            json.dump(report, fh, indent=2, sort_keys=True)
+            fh.write("\n")
+    if args.baseline:
+        return 1 if compare(_load(args.baseline), report, args.max_regression) else 0
+    return 0
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--url", help="Benchmark a running server instead of the app in process")
+    parser.add_argument("--password", default=DEFAULT_PASSWORD, help="The password given to benchmarks.datagen")
+    parser.add_argument("--anchor", type=date.fromisoformat, default=date.today(), help="The datagen --anchor")
+    parser.add_argument("--concurrency", type=int, default=20)
+    parser.add_argument("--write-concurrency", type=int,
+                        help="Clients for the approval scenarios; use 1 on SQLite, which allows one writer at a time")
+    parser.add_argument("--duration", type=float, default=5.0, help="Seconds per scenario")
+    parser.add_argument("--only", nargs="+", help="Scenario names to run")
+    parser.add_argument("--max-writes", type=int, default=5000, help="Pending requests the approval scenarios may use")
+    parser.add_argument("--json", dest="json_path", help="Write the results to this file")
+    parser.add_argument("--baseline", help="Compare the results with this earlier --json file")
+    parser.add_argument("--diff", nargs=2, metavar=("OLD", "NEW"), help="Only compare two --json files")
+    parser.add_argument("--max-regression", type=float, default=25.0, help="Allowed p95 slowdown, in percent")
+    sys.exit(main(parser.parse_args()))